@@ -0,0 +1,241 @@
+"""
+Compact action protocol benchmark
+
+Compares the JSON operation format with the compact action protocol
+(OPERATE_COMPACT_ACTIONS=1) on the same operations:
+- output tokens per response, and the decode time they cost at a given
+  generation rate
+- system prompt tokens
+- local parse time
+
+Responses are the built-in samples, or every response recorded in a
+response store (OPERATE_RESPONSE_CACHE=record) with --store. Tokens are
+counted with tiktoken when it is installed, otherwise estimated from the
+text length.
+
+With --live the same step is also sent to an OpenAI model with both prompts
+and the measured completion tokens and latencies are reported:
+
+    python compact_actions_benchmark.py [--store cache/responses.sqlite]
+    python compact_actions_benchmark.py --live gpt-4o --frame screenshot.png --live-repeats 5
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add the operate module to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+
+from operate.models.history import CHARS_PER_TOKEN
+from operate.models.prompts import get_system_prompt, get_user_first_message_prompt
+from operate.models.schema import parse_operations_response
+from operate.utils.misc import format_compact_operations, parse_operations
+
+SAMPLE_RESPONSES = [
+    [
+        {"thought": "Searching the operating system to find Google Chrome because it appears I am currently in terminal", "operation": "press", "keys": ["ctrl", "space"]},
+        {"thought": "Now I need to write 'Google Chrome' as a next step", "operation": "write", "content": "Google Chrome"},
+        {"thought": "Finally I'll press enter to open Google Chrome assuming it is available", "operation": "press", "keys": ["enter"]},
+    ],
+    [
+        {"thought": "I'll focus on the address bar in the browser. I can see the browser is open so this should be safe to try", "operation": "press", "keys": ["ctrl", "t"]},
+        {"thought": "Now that the address bar is in focus I can type the URL", "operation": "write", "content": "https://docs.new/"},
+        {"thought": "I'll need to press enter to go the URL now", "operation": "press", "keys": ["enter"]},
+    ],
+    [
+        {"thought": "I can see the search field with the placeholder text 'search'. I click that field to search", "operation": "click", "text": "search"},
+        {"thought": "Now that the field is active I can write the name of the person I'd like to search for", "operation": "write", "content": "John Doe"},
+        {"thought": "Finally I'll submit the search form with enter", "operation": "press", "keys": ["enter"]},
+    ],
+    [
+        {"thought": "The compose window is open, I'll click the recipients field", "operation": "click", "text": "Recipients"},
+        {"thought": "Write the recipient's address", "operation": "write", "content": "jane@example.com"},
+    ],
+    [
+        {"thought": "The email was sent and the confirmation is visible", "operation": "done", "summary": "Sent the email to jane@example.com"},
+    ],
+]
+
+
+def token_counter():
+    """Token count function and the name of the method it uses"""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    except Exception:
+        return (lambda text: max(1, len(text) // CHARS_PER_TOKEN)), f"estimate ({CHARS_PER_TOKEN} chars per token)"
+
+
+def load_responses(store):
+    """JSON responses of the built-in samples or of a response store"""
+    if store is None:
+        return [json.dumps(operations) for operations in SAMPLE_RESPONSES]
+    with sqlite3.connect(store) as connection:
+        rows = connection.execute("SELECT response FROM responses ORDER BY recorded_at").fetchall()
+    responses = []
+    for (response,) in rows:
+        try:
+            parse_operations_response(response)
+        except ValueError:
+            # recorded with the compact protocol or not an operation response
+            continue
+        responses.append(response)
+    return responses
+
+
+def best_time(function, argument, repeats):
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def system_prompts(model):
+    """System prompt of `model` in the JSON format and in the compact protocol"""
+    previous = os.environ.get("OPERATE_COMPACT_ACTIONS")
+    try:
+        prompts = {}
+        for name, value in (("json", "0"), ("compact", "1")):
+            os.environ["OPERATE_COMPACT_ACTIONS"] = value
+            prompts[name] = (get_system_prompt(model, "Send an email to jane@example.com"), get_user_first_message_prompt())
+        return prompts
+    finally:
+        if previous is None:
+            os.environ.pop("OPERATE_COMPACT_ACTIONS", None)
+        else:
+            os.environ["OPERATE_COMPACT_ACTIONS"] = previous
+
+
+def run_live(model, frame_path, repeats):
+    """Send the same first step with both prompts and measure completion tokens and latency"""
+    from operate.config import Config
+    from operate.utils.frame import Frame
+
+    client = Config().initialize_openai()
+    frame = Frame.from_file(frame_path)
+    results = {}
+    for name, (system, user) in system_prompts("gpt-4-with-ocr").items():
+        messages = [
+            {"role": "system", "content": system},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user},
+                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{frame.png_base64}"}},
+                ],
+            },
+        ]
+        latencies, completion_tokens = [], []
+        for _ in range(repeats):
+            start_time = time.time()
+            response = client.chat.completions.create(model=model, messages=messages)
+            latencies.append(time.time() - start_time)
+            completion_tokens.append(response.usage.completion_tokens)
+        results[name] = {
+            'mean_latency': float(np.mean(latencies)),
+            'p50_latency': float(np.percentile(latencies, 50)),
+            'mean_completion_tokens': float(np.mean(completion_tokens)),
+        }
+        print(
+            f"{name:>8}: {results[name]['mean_latency']:.2f}s mean latency, "
+            f"{results[name]['mean_completion_tokens']:.0f} completion tokens"
+        )
+    return results
+
+
+def run_benchmark(store, decode_rate, repeats, live=None, frame=None, live_repeats=3):
+    responses = load_responses(store)
+    if not responses:
+        print(f"No operation responses found in {store}")
+        return None
+    count_tokens, token_method = token_counter()
+
+    print(f"\n=== COMPACT ACTION BENCHMARK: {len(responses)} responses, tokens by {token_method} ===")
+    print("-" * 60)
+
+    rows = []
+    for response in responses:
+        operations = parse_operations_response(response)
+        compact = format_compact_operations(operations)
+        rows.append({
+            'operations': len(operations),
+            'json_tokens': count_tokens(response),
+            'compact_tokens': count_tokens(compact),
+            'json_parse_time': best_time(parse_operations_response, response, repeats),
+            'compact_parse_time': best_time(lambda text: parse_operations(text, compact=True), compact, repeats),
+        })
+
+    json_tokens = float(np.mean([row['json_tokens'] for row in rows]))
+    compact_tokens = float(np.mean([row['compact_tokens'] for row in rows]))
+    prompts = system_prompts("gpt-4-with-ocr")
+    summary = {
+        'mean_json_tokens': json_tokens,
+        'mean_compact_tokens': compact_tokens,
+        'token_reduction': 1 - compact_tokens / json_tokens,
+        'decode_rate': decode_rate,
+        'json_decode_time': json_tokens / decode_rate,
+        'compact_decode_time': compact_tokens / decode_rate,
+        'json_parse_time': float(np.mean([row['json_parse_time'] for row in rows])),
+        'compact_parse_time': float(np.mean([row['compact_parse_time'] for row in rows])),
+        'json_system_prompt_tokens': count_tokens(prompts['json'][0]),
+        'compact_system_prompt_tokens': count_tokens(prompts['compact'][0]),
+    }
+
+    print(f"Output tokens:  json {json_tokens:.1f}, compact {compact_tokens:.1f} ({summary['token_reduction'] * 100:.0f}% fewer)")
+    print(
+        f"Decode time at {decode_rate:.0f} tok/s: json {summary['json_decode_time']:.2f}s, "
+        f"compact {summary['compact_decode_time']:.2f}s"
+    )
+    print(
+        f"System prompt:  json {summary['json_system_prompt_tokens']} tokens, "
+        f"compact {summary['compact_system_prompt_tokens']} tokens"
+    )
+    print(
+        f"Parse time:     json {summary['json_parse_time'] * 1e6:.1f}us, "
+        f"compact {summary['compact_parse_time'] * 1e6:.1f}us"
+    )
+
+    live_results = None
+    if live:
+        print("-" * 60)
+        live_results = run_live(live, frame, live_repeats)
+    print("-" * 60)
+
+    report = {
+        'source': store or 'built-in samples',
+        'token_method': token_method,
+        'responses': rows,
+        'summary': summary,
+        'live': live_results,
+        'timestamp': datetime.now().isoformat(),
+    }
+    filename = "compact_actions_benchmark.json"
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to: {filename}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the JSON operation format with the compact action protocol")
+    parser.add_argument("--store", help="Response store recorded with OPERATE_RESPONSE_CACHE=record")
+    parser.add_argument("--decode-rate", type=float, default=50.0, help="Generation rate in tokens per second")
+    parser.add_argument("--repeats", type=int, default=100, help="Repeats per parse time measurement")
+    parser.add_argument("--live", metavar="MODEL", help="Also send a step to this OpenAI model with both prompts")
+    parser.add_argument("--frame", help="Screenshot for --live")
+    parser.add_argument("--live-repeats", type=int, default=3, help="Requests per format with --live")
+    args = parser.parse_args()
+    if args.live and not args.frame:
+        parser.error("--live needs --frame")
+    run_benchmark(args.store, args.decode_rate, args.repeats, args.live, args.frame, args.live_repeats)
@@ -0,0 +1,107 @@
+"""
+Overlap suppression microbenchmark
+
+Compares the previous all-pairs `is_overlapping` scan in `select_labels` with
+the `BoxGrid` spatial index on synthetic detection sets, and checks that both keep
+exactly the same boxes.
+
+    python label_overlap_benchmark.py [--sizes 10 100 1000 5000] [--repeats 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+# Add the operate module to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+
+from operate.utils.label import BoxGrid, is_overlapping
+
+SCREEN_SIZE = (3840, 2160)
+
+
+def synthetic_boxes(count, seed=0):
+    """Detections shaped like UI elements: mostly small icons/buttons, some wide rows"""
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            width, height = rng.uniform(16, 120), rng.uniform(16, 60)
+        else:
+            width, height = rng.uniform(200, 900), rng.uniform(24, 80)
+        x1 = rng.uniform(0, SCREEN_SIZE[0] - width)
+        y1 = rng.uniform(0, SCREEN_SIZE[1] - height)
+        boxes.append((x1, y1, x1 + width, y1 + height))
+    return boxes
+
+
+def suppress_naive(boxes):
+    drawn_boxes = []
+    for box in boxes:
+        if not any(is_overlapping(box, drawn) for drawn in drawn_boxes):
+            drawn_boxes.append(box)
+    return drawn_boxes
+
+
+def suppress_grid(boxes):
+    grid = BoxGrid.for_boxes(boxes)
+    for box in boxes:
+        if not grid.overlaps(box):
+            grid.add(box)
+    return grid.boxes
+
+
+def best_time(function, boxes, repeats):
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        kept = function(boxes)
+        times.append(time.perf_counter() - start_time)
+    return min(times), kept
+
+
+def run_benchmark(sizes, repeats):
+    print("\n=== OVERLAP SUPPRESSION BENCHMARK ===")
+    print(f"{'boxes':>7} {'kept':>6} {'naive ms':>10} {'grid ms':>10} {'speedup':>8}")
+    print("-" * 46)
+
+    rows = []
+    for count in sizes:
+        boxes = synthetic_boxes(count)
+        naive_time, naive_kept = best_time(suppress_naive, boxes, repeats)
+        grid_time, grid_kept = best_time(suppress_grid, boxes, repeats)
+        if naive_kept != grid_kept:
+            raise AssertionError(f"grid index kept different boxes for {count} detections")
+
+        rows.append({
+            'boxes': count,
+            'kept': len(grid_kept),
+            'naive_seconds': naive_time,
+            'grid_seconds': grid_time,
+            'speedup': naive_time / grid_time if grid_time else float("inf"),
+        })
+        print(f"{count:>7} {len(grid_kept):>6} {naive_time * 1000:>10.2f} {grid_time * 1000:>10.2f} {rows[-1]['speedup']:>7.1f}x")
+
+    results = {
+        'screen_size': list(SCREEN_SIZE),
+        'repeats': repeats,
+        'results': rows,
+        'timestamp': datetime.now().isoformat(),
+    }
+    filename = "label_overlap_benchmark.json"
+    with open(filename, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {filename}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark overlap suppression in select_labels")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 50, 100, 500, 1000, 2000, 5000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.sizes, args.repeats)
@@ -0,0 +1,137 @@
+"""
+OCR profile benchmark
+
+Reads a set of recorded frames with every OCR profile and compares each
+profile against the "accurate" profile:
+- time per frame
+- recall: share of accurate-profile text elements the profile also found
+- center error: pixel distance between matched element centers, which is
+  what click coordinates are computed from
+
+Record frames by running with OPERATE_SAVE_SCREENSHOTS=1 and copying
+`screenshots/screenshot.png` after interesting steps, or point the script at
+any directory of screen captures:
+
+    python ocr_profile_benchmark.py path/to/frames [--profiles accurate fast]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add the operate module to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+
+from operate.utils.frame import Frame
+from operate.utils.ocr import TextIndex
+from operate.utils.ocr_manager import OCR_PROFILES, get_ocr_reader
+
+
+def load_frames(directory):
+    paths = []
+    for pattern in ("*.png", "*.jpg", "*.jpeg"):
+        paths.extend(glob.glob(os.path.join(directory, pattern)))
+    return [(os.path.basename(path), Frame.from_file(path)) for path in sorted(paths)]
+
+
+def compare(reference, candidate):
+    """Match candidate elements to reference elements by normalized text"""
+    reference_index = TextIndex(reference)
+    candidate_index = TextIndex(candidate)
+    matched = 0
+    errors = []
+    for index, text in enumerate(reference_index.texts):
+        if not text:
+            continue
+        found = candidate_index.best_match(text, min_score=0.9)
+        if found is None:
+            continue
+        matched += 1
+        errors.append(
+            float(np.linalg.norm(reference_index.centers[index] - candidate_index.centers[found]))
+        )
+    total = sum(1 for text in reference_index.texts if text)
+    return {
+        'recall': matched / total if total else 1.0,
+        'mean_center_error_px': float(np.mean(errors)) if errors else 0.0,
+        'max_center_error_px': float(np.max(errors)) if errors else 0.0,
+    }
+
+
+def run_benchmark(directory, profiles, repeats):
+    frames = load_frames(directory)
+    if not frames:
+        print(f"No frames found in {directory}")
+        return None
+
+    print(f"\n=== OCR PROFILE BENCHMARK: {len(frames)} frames, profiles {profiles} ===")
+    print("-" * 60)
+
+    readers = {name: get_ocr_reader(["en"], "benchmark", profile=name) for name in profiles}
+    # warm up every profile once so model loading isn't timed
+    for reader in readers.values():
+        reader.readtext(frames[0][1].array)
+
+    results = {name: {'times': [], 'frames': {}} for name in profiles}
+    for frame_name, frame in frames:
+        for name, reader in readers.items():
+            for _ in range(repeats):
+                start_time = time.time()
+                output = reader.readtext(frame.array)
+                results[name]['times'].append(time.time() - start_time)
+            results[name]['frames'][frame_name] = output
+
+    reference = "accurate" if "accurate" in profiles else profiles[0]
+    summary = {}
+    for name in profiles:
+        times = results[name]['times']
+        comparisons = [
+            compare(results[reference]['frames'][frame_name], results[name]['frames'][frame_name])
+            for frame_name, _ in frames
+        ]
+        summary[name] = {
+            'mean_time': float(np.mean(times)),
+            'p95_time': float(np.percentile(times, 95)),
+            'speedup': float(np.mean(results[reference]['times']) / np.mean(times)),
+            'recall': float(np.mean([c['recall'] for c in comparisons])),
+            'mean_center_error_px': float(np.mean([c['mean_center_error_px'] for c in comparisons])),
+            'max_center_error_px': float(np.max([c['max_center_error_px'] for c in comparisons])),
+        }
+        s = summary[name]
+        print(
+            f"{name:>10}: {s['mean_time']:.2f}s/frame (p95 {s['p95_time']:.2f}s, "
+            f"{s['speedup']:.2f}x), recall {s['recall'] * 100:.1f}%, "
+            f"center error {s['mean_center_error_px']:.1f}px (max {s['max_center_error_px']:.1f}px)"
+        )
+
+    print("-" * 60)
+    print(f"Reference profile: {reference}")
+
+    report = {
+        'frames': [frame_name for frame_name, _ in frames],
+        'frame_size': list(frames[0][1].size),
+        'repeats': repeats,
+        'reference_profile': reference,
+        'profiles': summary,
+        'timestamp': datetime.now().isoformat(),
+    }
+    filename = "ocr_profile_benchmark.json"
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to: {filename}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare OCR profiles on recorded frames")
+    parser.add_argument("frames", nargs="?", default="screenshots", help="Directory of recorded frames")
+    parser.add_argument("--profiles", nargs="+", default=sorted(OCR_PROFILES), choices=sorted(OCR_PROFILES))
+    parser.add_argument("--repeats", type=int, default=1, help="Timed reads per frame and profile")
+    args = parser.parse_args()
+    run_benchmark(args.frames, args.profiles, args.repeats)
@@ -40,6 +40,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from operate.config import client_registry
+
 try:
     from operate.utils.task_classifier import classify_task, TaskType
 except ImportError:
@@ -50,6 +52,15 @@ except ImportError:
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def shared_async_http_client():
+    """Async httpx client on the running loop's shared transport (None outside an event loop)"""
+    try:
+        return client_registry.async_http_client()
+    except RuntimeError:
+        return None
+
+
 @dataclass
 class BrowserAction:
     """Represents a browser action taken by the agent"""
@@ -114,7 +125,10 @@ class BrowserAgent:
                 self.current_llm = ChatOpenAI(
                     model=openai_model,
                     api_key=api_key,
-                    temperature=0
+                    temperature=0,
+                    # browser_use calls ainvoke: share the async keep-alive
+                    # connections of the session's event loop with the API call paths
+                    http_async_client=shared_async_http_client()
                 )
                 logger.info(f"Initialized OpenAI LLM: {openai_model}")
                 
@@ -156,7 +170,8 @@ class BrowserAgent:
                 self.current_llm = ChatOpenAI(
                     model="gpt-4o",
                     api_key=api_key,
-                    temperature=0
+                    temperature=0,
+                    http_async_client=shared_async_http_client()
                 )
                 
         except Exception as e:
@@ -1,14 +1,298 @@
+import asyncio
+import hashlib
+import importlib.util
 import os
 import sys
+import threading
 
 import google.generativeai as genai
+import httpx
 from dotenv import load_dotenv
-from ollama import Client
-from openai import OpenAI
+from ollama import AsyncClient, Client
+from openai import AsyncOpenAI, OpenAI
 import anthropic
 from prompt_toolkit.shortcuts import input_dialog
 
 
+# Shared HTTP connection pool settings for the model API clients
+HTTP_MAX_CONNECTIONS = int(os.getenv("OPERATE_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("OPERATE_HTTP_KEEPALIVE_SECONDS", "120"))
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+QWEN_BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
+
+
+class ConnectionCounter:
+    """
+    Counts requests and newly opened connections across transports
+
+    New connections are seen through httpcore's `trace` request extension.
+    Every request that didn't open a new connection reused a pooled one.
+    """
+
+    # trace events of a connection being opened (not reused from the pool)
+    CONNECT_EVENTS = ("connect_tcp.complete", "connect_unix_socket.complete")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_event(self, name):
+        if name.endswith(self.CONNECT_EVENTS):
+            with self._lock:
+                self.connections_opened += 1
+
+    def trace(self, request):
+        """`trace` extension for `request`, chained to one the caller already set"""
+        previous = request.extensions.get("trace")
+
+        def trace(name, info):
+            self.record_event(name)
+            if previous is not None:
+                previous(name, info)
+
+        return trace
+
+    def async_trace(self, request):
+        """Async variant of `trace`"""
+        previous = request.extensions.get("trace")
+
+        async def trace(name, info):
+            self.record_event(name)
+            if previous is not None:
+                await previous(name, info)
+
+        return trace
+
+
+class SharedTransport(httpx.BaseTransport):
+    """
+    Non-owning view of the registry's keep-alive transport handed to clients
+
+    Closing a client closes its transport; here that is a no-op, so one
+    client can't shut the connection pool of all the others. The registry
+    closes the real transport itself (`ClientRegistry.reset`).
+    """
+
+    def __init__(self, transport, counter):
+        self._transport = transport
+        self._counter = counter
+
+    def handle_request(self, request):
+        self._counter.record_request()
+        request.extensions["trace"] = self._counter.trace(request)
+        return self._transport.handle_request(request)
+
+    def close(self):
+        pass
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async variant of `SharedTransport`"""
+
+    def __init__(self, transport, counter):
+        self._transport = transport
+        self._counter = counter
+
+    async def handle_async_request(self, request):
+        self._counter.record_request()
+        request.extensions["trace"] = self._counter.async_trace(request)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class ClientRegistry:
+    """
+    Process-wide cache of model API clients
+
+    Clients are built once per (provider, base URL, API key) instead of on every
+    step, and all of them send their requests through one keep-alive transport
+    (HTTP/2 when the `h2` package is installed), so a step reuses an open
+    TCP/TLS connection instead of setting up a new one. Clients get a
+    non-owning view of the transport, so closing one client doesn't close
+    the pool the others use; `reset` closes it.
+
+    Async clients and their transport are bound to the event loop they were
+    created on (connections can't move between loops), so they are cached
+    per running loop and dropped once that loop is closed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._transport = None
+        self._loop_state = {}
+        self._counter = ConnectionCounter()
+        self._stats = {"clients_created": 0, "client_cache_hits": 0}
+
+    @staticmethod
+    def _limits():
+        return httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    @property
+    def http2(self):
+        return importlib.util.find_spec("h2") is not None
+
+    def transport(self):
+        """A non-owning view of the shared keep-alive transport"""
+        with self._lock:
+            if self._transport is None:
+                self._transport = httpx.HTTPTransport(http2=self.http2, limits=self._limits())
+            return SharedTransport(self._transport, self._counter)
+
+    def http_client(self, **kwargs):
+        """An httpx client using the shared transport"""
+        kwargs.setdefault("timeout", HTTP_TIMEOUT)
+        kwargs.setdefault("follow_redirects", True)
+        return httpx.Client(transport=self.transport(), **kwargs)
+
+    def _loop_entry(self):
+        """Transport and clients of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed in [other for other in self._loop_state if other.is_closed()]:
+                del self._loop_state[closed]
+            entry = self._loop_state.get(loop)
+            if entry is None:
+                entry = self._loop_state[loop] = {
+                    "transport": httpx.AsyncHTTPTransport(http2=self.http2, limits=self._limits()),
+                    "clients": {},
+                }
+            return entry
+
+    def async_transport(self):
+        """A non-owning view of the keep-alive transport of the running event loop"""
+        return SharedAsyncTransport(self._loop_entry()["transport"], self._counter)
+
+    def async_http_client(self, **kwargs):
+        """An httpx async client using the running loop's transport"""
+        kwargs.setdefault("timeout", HTTP_TIMEOUT)
+        kwargs.setdefault("follow_redirects", True)
+        return httpx.AsyncClient(transport=self.async_transport(), **kwargs)
+
+    def _cached(self, clients, key, factory):
+        with self._lock:
+            client = clients.get(key)
+            if client is not None:
+                self._stats["client_cache_hits"] += 1
+                return client
+        client = factory()
+        with self._lock:
+            client = clients.setdefault(key, client)
+            self._stats["clients_created"] += 1
+        return client
+
+    @staticmethod
+    def _key(provider, base_url, api_key):
+        key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        return provider, base_url, key_hash
+
+    def get(self, provider, base_url, api_key, factory):
+        """
+        Get a cached client, building it with `factory()` on first use
+
+        Args:
+            provider: Provider name, e.g. "openai"
+            base_url: API base URL (part of the cache key)
+            api_key: API key (only its hash is kept in the cache key)
+            factory: Callable returning a new client
+        """
+        return self._cached(self._clients, self._key(provider, base_url, api_key), factory)
+
+    def get_async(self, provider, base_url, api_key, factory):
+        """Like `get`, for async clients of the running event loop"""
+        return self._cached(
+            self._loop_entry()["clients"], self._key(provider, base_url, api_key), factory
+        )
+
+    def openai(self, api_key, base_url=None):
+        return self.get(
+            "openai",
+            base_url,
+            api_key,
+            lambda: OpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client()),
+        )
+
+    def anthropic(self, api_key):
+        return self.get(
+            "anthropic",
+            None,
+            api_key,
+            lambda: anthropic.Anthropic(api_key=api_key, http_client=self.http_client()),
+        )
+
+    def ollama(self, host):
+        # ollama passes extra arguments on to its own httpx client
+        return self.get(
+            "ollama", host, None, lambda: Client(host=host, transport=self.transport())
+        )
+
+    def async_openai(self, api_key, base_url=None):
+        return self.get_async(
+            "openai",
+            base_url,
+            api_key,
+            # retries are handled by operate.models.retry
+            lambda: AsyncOpenAI(
+                api_key=api_key, base_url=base_url, http_client=self.async_http_client(), max_retries=0
+            ),
+        )
+
+    def async_anthropic(self, api_key):
+        return self.get_async(
+            "anthropic",
+            None,
+            api_key,
+            lambda: anthropic.AsyncAnthropic(
+                api_key=api_key, http_client=self.async_http_client(), max_retries=0
+            ),
+        )
+
+    def async_ollama(self, host):
+        return self.get_async(
+            "ollama", host, None, lambda: AsyncClient(host=host, transport=self.async_transport())
+        )
+
+    def get_stats(self):
+        """Client cache and connection reuse statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["clients"] = sorted(f"{provider}:{base_url or 'default'}" for provider, base_url, _ in self._clients)
+            stats["event_loops"] = sum(not loop.is_closed() for loop in self._loop_state)
+        stats["http2"] = self.http2
+        requests = self._counter.requests
+        opened = self._counter.connections_opened
+        stats["requests"] = requests
+        stats["connections_opened"] = opened
+        stats["connections_reused"] = max(0, requests - opened)
+        stats["connection_reuse_rate"] = (requests - opened) / requests if requests else 0.0
+        return stats
+
+    def reset(self):
+        """Drop all cached clients and close the shared transport"""
+        with self._lock:
+            self._clients.clear()
+            self._loop_state.clear()
+            transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+
+# Global instance
+client_registry = ClientRegistry()
+
+
 class Config:
     """
     Configuration class for managing settings.
@@ -18,6 +302,7 @@ class Config:
         openai_api_key (str): API key for OpenAI.
         google_api_key (str): API key for Google.
         ollama_host (str): url to ollama running remotely.
+        timing_profile (str): Name of the screen settle timing profile.
     """
 
     _instance = None
@@ -46,51 +331,56 @@ class Config:
         self.qwen_api_key = (
             None  # instance variables are backups in case saving to a `.env` fails
         )
+        # Screen settle timing profile, see `operate.utils.settle.TIMING_PROFILES`
+        self.timing_profile = os.getenv("OPERATE_TIMING_PROFILE", "balanced")
 
-    def initialize_openai(self):
-        if self.verbose:
-            print("[Config][initialize_openai]")
-
+    def _openai_api_key(self):
         if self.openai_api_key:
             if self.verbose:
                 print("[Config][initialize_openai] using cached openai_api_key")
-            api_key = self.openai_api_key
-        else:
-            if self.verbose:
-                print(
-                    "[Config][initialize_openai] no cached openai_api_key, try to get from env."
-                )
-            api_key = os.getenv("OPENAI_API_KEY")
+            return self.openai_api_key
+        if self.verbose:
+            print(
+                "[Config][initialize_openai] no cached openai_api_key, try to get from env."
+            )
+        return os.getenv("OPENAI_API_KEY") or self._replay_api_key()
 
-        client = OpenAI(
-            api_key=api_key,
+    def initialize_openai(self):
+        if self.verbose:
+            print("[Config][initialize_openai]")
+        return client_registry.openai(
+            self._openai_api_key(), os.getenv("OPENAI_API_BASE_URL")
         )
-        client.api_key = api_key
-        client.base_url = os.getenv("OPENAI_API_BASE_URL", client.base_url)
-        return client
 
-    def initialize_qwen(self):
+    def initialize_openai_async(self):
+        """`AsyncOpenAI` client for the running event loop"""
         if self.verbose:
-            print("[Config][initialize_qwen]")
+            print("[Config][initialize_openai_async]")
+        return client_registry.async_openai(
+            self._openai_api_key(), os.getenv("OPENAI_API_BASE_URL")
+        )
 
+    def _qwen_api_key(self):
         if self.qwen_api_key:
             if self.verbose:
                 print("[Config][initialize_qwen] using cached qwen_api_key")
-            api_key = self.qwen_api_key
-        else:
-            if self.verbose:
-                print(
-                    "[Config][initialize_qwen] no cached qwen_api_key, try to get from env."
-                )
-            api_key = os.getenv("QWEN_API_KEY")
+            return self.qwen_api_key
+        if self.verbose:
+            print(
+                "[Config][initialize_qwen] no cached qwen_api_key, try to get from env."
+            )
+        return os.getenv("QWEN_API_KEY") or self._replay_api_key()
 
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
-        )
-        client.api_key = api_key
-        client.base_url = "https://dashscope.aliyuncs.com/compatible-mode/v1"
-        return client
+    def initialize_qwen(self):
+        if self.verbose:
+            print("[Config][initialize_qwen]")
+        return client_registry.openai(self._qwen_api_key(), QWEN_BASE_URL)
+
+    def initialize_qwen_async(self):
+        """Async Qwen (OpenAI compatible) client for the running event loop"""
+        if self.verbose:
+            print("[Config][initialize_qwen_async]")
+        return client_registry.async_openai(self._qwen_api_key(), QWEN_BASE_URL)
 
     def initialize_google(self):
         if self.google_api_key:
@@ -108,7 +398,7 @@ class Config:
 
         return model
 
-    def initialize_ollama(self):
+    def _resolve_ollama_host(self):
         if self.ollama_host:
             if self.verbose:
                 print("[Config][initialize_ollama] using cached ollama host")
@@ -118,15 +408,35 @@ class Config:
                     "[Config][initialize_ollama] no cached ollama host. Assuming ollama running locally."
                 )
             self.ollama_host = os.getenv("OLLAMA_HOST", None)
-        model = Client(host=self.ollama_host)
-        return model
+        return self.ollama_host
 
-    def initialize_anthropic(self):
+    def initialize_ollama(self):
+        return client_registry.ollama(self._resolve_ollama_host())
+
+    def initialize_ollama_async(self):
+        """Ollama `AsyncClient` for the running event loop"""
+        return client_registry.async_ollama(self._resolve_ollama_host())
+
+    def _anthropic_api_key(self):
         if self.anthropic_api_key:
-            api_key = self.anthropic_api_key
-        else:
-            api_key = os.getenv("ANTHROPIC_API_KEY")
-        return anthropic.Anthropic(api_key=api_key)
+            return self.anthropic_api_key
+        return os.getenv("ANTHROPIC_API_KEY") or self._replay_api_key()
+
+    def initialize_anthropic(self):
+        return client_registry.anthropic(self._anthropic_api_key())
+
+    def initialize_anthropic_async(self):
+        """`AsyncAnthropic` client for the running event loop"""
+        return client_registry.async_anthropic(self._anthropic_api_key())
+
+    @staticmethod
+    def replaying():
+        """Whether model responses are replayed from the response cache (no requests are sent)"""
+        return os.getenv("OPERATE_RESPONSE_CACHE") == "replay"
+
+    def _replay_api_key(self):
+        # clients can't be built without a key, but a replayed session never uses it
+        return "replay" if self.replaying() else None
 
     def validation(self, model, voice_mode):
         """
@@ -157,7 +467,7 @@ class Config:
             print("[Config] key_name", key_name)
             print("[Config] key_description", key_description)
             print("[Config] key_exists", key_exists)
-        if is_required and not key_exists:
+        if is_required and not key_exists and not self.replaying():
             self.prompt_and_save_api_key(key_name, key_description)
 
     def prompt_and_save_api_key(self, key_name, key_description):
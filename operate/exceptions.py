@@ -12,4 +12,38 @@ class ModelNotRecognizedException(Exception):
         super().__init__(self.message)
 
     def __str__(self):
-        return f"{self.message} : {self.model} "
\ No newline at end of file
+        return f"{self.message} : {self.model} "
+
+
+class ModelRequestFailedException(Exception):
+    """Exception raised when a model request can't be completed.
+
+    Attributes:
+        model -- the model or provider that failed
+        message -- explanation of the error
+    """
+
+    def __init__(self, model, message="Model request failed"):
+        self.model = model
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message} : {self.model} "
+
+
+class ResponseNotRecordedException(Exception):
+    """Exception raised in replay mode for a request that was not recorded.
+
+    Attributes:
+        model -- the model the request was for
+        message -- explanation of the error
+    """
+
+    def __init__(self, model, message="Response not recorded"):
+        self.model = model
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message} : {self.model} "
@@ -67,6 +67,13 @@ def main_entry():
         required=False,
     )
 
+    parser.add_argument(
+        "--timing-profile",
+        help="Screen settle timing between actions (legacy = fixed 1s delays)",
+        choices=["legacy", "balanced", "fast"],
+        required=False,
+    )
+
     try:
         args = parser.parse_args()
         main(
@@ -77,7 +84,8 @@ def main_entry():
             browser_agent=args.browser_agent,
             no_browser_agent=args.no_browser_agent,
             browser_threshold=args.browser_threshold,
-            chrome_profile_dir=args.chrome_profile
+            chrome_profile_dir=args.chrome_profile,
+            timing_profile=args.timing_profile,
         )
     except KeyboardInterrupt:
         print(f"\n{ANSI_BRIGHT_MAGENTA}Exiting...")
@@ -1,43 +1,187 @@
-import base64
-import io
+import asyncio
 import json
-import os
 import time
 import traceback
 
 import easyocr
 import ollama
-import pkg_resources
-from PIL import Image
-from ultralytics import YOLO
 
 from operate.config import Config
-from operate.exceptions import ModelNotRecognizedException
+from operate.exceptions import ModelNotRecognizedException, ModelRequestFailedException
+from operate.models.hedging import hedger
+from operate.models.image_encoder import encode_image_async
+from operate.models.history import compact_history, copy_history
 from operate.models.prompts import (
+    compact_actions_enabled,
+    get_output_reminder,
     get_system_prompt,
     get_user_first_message_prompt,
+    get_user_no_change_prompt,
     get_user_prompt,
 )
+from operate.models.response_cache import response_cache
+from operate.models.retry import call_with_retry, retry_engine
+from operate.models.schema import (
+    anthropic_operations_tool,
+    openai_response_format,
+    operation_error,
+    parse_operations_response,
+    structured_output_enabled,
+    validate_operations,
+)
+from operate.models.streaming import (
+    anthropic_text_stream,
+    openai_text_stream,
+    stream_operations,
+    streaming_enabled,
+)
 from operate.utils.label import (
-    add_labels,
+    draw_label_image,
     get_click_position_in_percent,
     get_label_coordinates,
 )
-from operate.utils.ocr import get_text_coordinates, get_text_element
-from operate.utils.ocr_manager import get_ocr_reader
-from operate.utils.screenshot import capture_screen_with_cursor, compress_screenshot
+from operate.utils.misc import format_compact_operations, parse_operations
+from operate.utils.ocr_manager import prefetch_text
+from operate.utils.screen_parse import parse_screen_async
+from operate.utils.screenshot import capture_frame_async, frame_change_detector
+from operate.utils.settle import wait_for_screen_settle_async
 from operate.utils.style import ANSI_BRIGHT_MAGENTA, ANSI_GREEN, ANSI_RED, ANSI_RESET
 
 # Load configuration
 config = Config()
 
 
-async def get_next_action(model, messages, objective, session_id):
+async def get_next_action(model, messages, objective, session_id, on_operation=None):
+    """
+    Ask the model for the next operations, falling back along the configured chain
+
+    Each model of the chain (see `operate.models.retry`) is tried at most once.
+    With hedging (see `operate.models.hedging`) the first model is raced
+    against its alternate. Every attempt works on a copy of `messages`; only
+    the copy of the attempt whose response is used replaces the history, so
+    a failed attempt doesn't leave a second screenshot behind. If that copy
+    is in the other provider's message format, only the step it added is
+    converted back and appended.
+
+    Args:
+        model: Model name
+        messages: Conversation so far, extended in place
+        objective: User objective
+        session_id: Session id of the previous step
+        on_operation: Optional coroutine awaited with each operation as soon as
+            it is parsed from a streamed response (gpt-4, gpt-4-with-ocr,
+            gpt-4.1-with-ocr and claude-3). The returned list still contains
+            every operation, including those already handed over.
+
+    Returns:
+        tuple: (operations, session_id)
+
+    Raises:
+        ModelNotRecognizedException: If the model is unknown
+        ModelRequestFailedException: If every model of the chain failed
+    """
+    if not streaming_enabled():
+        on_operation = None
     if config.verbose:
         print("[Self-Operating Computer][get_next_action]")
         print("[Self-Operating Computer][get_next_action] model", model)
+
+    # every attempt works on its own copy of the history and of the change
+    # detector state; only the attempt whose response is used is kept
+    attempts = {}
+    claimed = {"by": None}
+
+    async def attempt(candidate, claim=None):
+        state = attempts[candidate] = {
+            "messages": convert_messages(messages, model, candidate),
+            "converted": message_format(model) != message_format(candidate),
+            "handed_over": [],
+            "record": None,
+        }
+        # messages the call path adds are the step to bring back into the primary history
+        state["initial"] = {id(message) for message in state["messages"]}
+        if candidate != model:
+            confirm_system_prompt(state["messages"], objective, candidate)
+
+        async def hand_over(operation):
+            if claim is not None and not claim():
+                raise RuntimeError(f"{candidate} lost the hedged request")
+            # checked before it runs, like a whole response is by `validate_operations`
+            error = operation_error(operation)
+            if error:
+                raise ValueError(f"{candidate} streamed an invalid operation: {error}")
+            claimed["by"] = candidate
+            state["handed_over"].append(operation)
+            await on_operation(operation)
+
+        forward = hand_over if on_operation is not None else None
+        with frame_change_detector.attempt() as record:
+            state["record"] = record
+            operations, session = await call_model(candidate, state["messages"], objective, forward)
+        return candidate, validate_operations(operations), session
+
+    def keep(candidate):
+        """Adopt the history and screen of `candidate`'s attempt"""
+        state = attempts[candidate]
+        if state["converted"]:
+            # the copy is in another provider's format: append the step it added
+            # (screenshot message and reply), converted back to the primary's format
+            added = [message for message in state["messages"][1:] if id(message) not in state["initial"]]
+            messages.extend(convert_messages([messages[0]] + added, candidate, model)[1:])
+        else:
+            messages[:] = state["messages"]
+        frame_change_detector.commit(state["record"])
+
+    chain = retry_engine.fallback_chain(model)
+    alternate = hedger.alternate_for(model)
+    start_time = time.time()
+    last_error = None
+    for candidate in chain:
+        try:
+            if candidate != model:
+                print(
+                    f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] Trying {candidate} instead {ANSI_RESET}"
+                )
+            if candidate == model and alternate is not None:
+                used, operations, session = await hedger.run(
+                    model,
+                    lambda claim: attempt(model, claim),
+                    alternate,
+                    lambda claim: attempt(alternate, claim),
+                )
+            else:
+                used, operations, session = await attempt(candidate)
+        except ModelNotRecognizedException:
+            raise
+        except Exception as e:
+            last_error = e
+            if claimed["by"] is not None:
+                # operations already ran, the next step has to look at the new screen
+                handed_over = attempts[claimed["by"]]["handed_over"]
+                print(
+                    f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RED}[Error] Response stopped after {len(handed_over)} operations: {e} {ANSI_RESET}"
+                )
+                keep(claimed["by"])
+                messages.append({"role": "assistant", "content": assistant_content(handed_over)})
+                retry_engine.record_step(model, claimed["by"])
+                return list(handed_over), None
+            continue
+
+        keep(used)
+        retry_engine.record_step(model, used)
+        hedger.record_latency(time.time() - start_time, hedged=alternate is not None)
+        return operations, session
+
+    retry_engine.record_step(model, None)
+    raise ModelRequestFailedException(
+        model, f"No model of {chain} returned a usable response ({last_error})"
+    )
+
+
+async def call_model(model, messages, objective, on_operation=None):
+    """Dispatch one request to the model's call path"""
     if model == "gpt-4":
-        return call_gpt_4o(messages), None
+        return await call_gpt_4o(messages, on_operation), None
     if model == "qwen-vl":
         operation = await call_qwen_vl_with_ocr(messages, objective, model)
         return operation, None
@@ -45,10 +189,10 @@ async def get_next_action(model, messages, objective, session_id):
         operation = await call_gpt_4o_labeled(messages, objective, model)
         return operation, None
     if model == "gpt-4-with-ocr":
-        operation = await call_gpt_4o_with_ocr(messages, objective, model)
+        operation = await call_gpt_4o_with_ocr(messages, objective, model, on_operation)
         return operation, None
     if model == "gpt-4.1-with-ocr":
-        operation = await call_gpt_4_1_with_ocr(messages, objective, model)
+        operation = await call_gpt_4_1_with_ocr(messages, objective, model, on_operation)
         return operation, None
     if model == "o1-with-ocr":
         operation = await call_o1_with_ocr(messages, objective, model)
@@ -56,32 +200,89 @@ async def get_next_action(model, messages, objective, session_id):
     if model == "agent-1":
         return "coming soon"
     if model == "gemini-pro-vision":
-        return call_gemini_pro_vision(messages, objective), None
+        return await call_gemini_pro_vision(messages, objective), None
     if model == "llava":
-        operation = call_ollama_llava(messages)
+        operation = await call_ollama_llava(messages)
         return operation, None
     if model == "claude-3":
-        operation = await call_claude_3_with_ocr(messages, objective, model)
+        operation = await call_claude_3_with_ocr(messages, objective, model, on_operation)
         return operation, None
     raise ModelNotRecognizedException(model)
 
 
-def call_gpt_4o(messages):
+def structured_request(provider, click):
+    """
+    Request arguments enforcing the operation schema (empty if structured output is off)
+
+    Args:
+        provider: "openai" or "anthropic"
+        click: Click target the call path's prompt asks for (see `operate.models.schema.CLICK_TARGETS`)
+    """
+    if not structured_output_enabled() or compact_actions_enabled():
+        return {}
+    if provider == "anthropic":
+        return anthropic_operations_tool(click)
+    return {"response_format": openai_response_format(click)}
+
+
+def parse_response(content):
+    """Operations of a response, in the format the prompts asked for"""
+    if compact_actions_enabled():
+        return parse_operations(content, compact=True)
+    return parse_operations_response(content)
+
+
+def assistant_content(operations):
+    """History entry for the operations the model answered with"""
+    if compact_actions_enabled():
+        return format_compact_operations(operations)
+    return json.dumps(operations)
+
+
+async def openai_completion(client, frame, provider="openai", **request):
+    """Text of a chat completion, through the response cache and the retry engine"""
+
+    async def fetch():
+        response = await call_with_retry(provider, lambda: client.chat.completions.create(**request))
+        return response.choices[0].message.content
+
+    return await response_cache.fetch(request["model"], request["messages"], frame, fetch)
+
+
+async def anthropic_completion(client, frame, **request):
+    """Text of an Anthropic message, through the response cache and the retry engine"""
+
+    async def fetch():
+        response = await call_with_retry("anthropic", lambda: client.messages.create(**request))
+        for block in response.content:
+            # a forced tool call carries the operations as its input
+            if block.type == "tool_use":
+                return json.dumps(block.input)
+        return "".join(block.text for block in response.content if block.type == "text")
+
+    key_messages = [{"role": "system", "content": request.get("system")}] + list(request["messages"])
+    return await response_cache.fetch(request["model"], key_messages, frame, fetch)
+
+
+async def ollama_chat(client, frame, **request):
+    """Text of an Ollama chat response, through the response cache and the retry engine"""
+
+    async def fetch():
+        response = await call_with_retry("ollama", lambda: client.chat(**request))
+        return response["message"]["content"]
+
+    return await response_cache.fetch(request["model"], request["messages"], frame, fetch)
+
+
+async def call_gpt_4o(messages, on_operation=None):
     if config.verbose:
         print("[call_gpt_4_v]")
-    time.sleep(1)
-    client = config.initialize_openai()
+    await wait_for_screen_settle_async()
+    client = config.initialize_openai_async()
+    content = None
     try:
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
-
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+        frame = await capture_frame_async()
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
@@ -94,36 +295,61 @@ def call_gpt_4o(messages):
                 user_prompt,
             )
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": user_prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                },
-            ],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "openai")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
+                    },
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        if on_operation is not None:
+            content_str, content = await stream_operations(
+                openai_text_stream(
+                    client,
+                    frame,
+                    model="gpt-4o",
+                    messages=messages,
+                    presence_penalty=1,
+                    frequency_penalty=1,
+                    **structured_request("openai", "coordinates"),
+                ),
+                on_operation,
+                label="call_gpt_4_v",
+                wrapped=structured_output_enabled(),
+                compact=compact_actions_enabled(),
+            )
+            messages.append({"role": "assistant", "content": content_str})
+            return content
+
+        content = await openai_completion(
+            client,
+            frame,
             model="gpt-4o",
             messages=messages,
             presence_penalty=1,
             frequency_penalty=1,
+            **structured_request("openai", "coordinates"),
         )
 
-        content = response.choices[0].message.content
-
-        content = clean_json(content)
-
-        assistant_message = {"role": "assistant", "content": content}
         if config.verbose:
             print(
                 "[call_gpt_4_v] content",
                 content,
             )
-        content = json.loads(content)
+        content = parse_response(content)
+        assistant_message = {"role": "assistant", "content": assistant_content(content)}
 
         messages.append(assistant_message)
 
@@ -131,7 +357,7 @@ def call_gpt_4o(messages):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[Operate] That did not work. Trying again {ANSI_RESET}",
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[Operate] That did not work {ANSI_RESET}",
             e,
         )
         print(
@@ -140,7 +366,7 @@ def call_gpt_4o(messages):
         )
         if config.verbose:
             traceback.print_exc()
-        return call_gpt_4o(messages)
+        raise
 
 
 async def call_qwen_vl_with_ocr(messages, objective, model):
@@ -149,56 +375,52 @@ async def call_qwen_vl_with_ocr(messages, objective, model):
 
     # Construct the path to the file within the package
     try:
-        time.sleep(1)
-        client = config.initialize_qwen()
+        await wait_for_screen_settle_async()
+        client = config.initialize_qwen_async()
 
         confirm_system_prompt(messages, objective, model)
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
         # Call the function to capture the screen with the cursor
-        raw_screenshot_filename = os.path.join(screenshots_dir, "raw_screenshot.png")
-        capture_screen_with_cursor(raw_screenshot_filename)
-
-        # Compress screenshot image to make size be smaller
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.jpeg")
-        compress_screenshot(raw_screenshot_filename, screenshot_filename)
-
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+        frame = await capture_frame_async()
+        # start OCR now so it runs while the model request is in flight
+        prefetch_text(frame, ["en"], model_name="qwen-vl")
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
         else:
             user_prompt = get_user_prompt()
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text",
-                 "text": f"{user_prompt}**REMEMBER** Only output json format, do not append any other text."},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                },
-            ],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "qwen")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text",
+                     "text": f"{user_prompt}{get_output_reminder()}"},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
+                    },
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        content = await openai_completion(
+            client,
+            frame,
+            provider="qwen",
             model="qwen2.5-vl-72b-instruct",
             messages=messages,
         )
 
-        content = response.choices[0].message.content
-
-        content = clean_json(content)
+        content = parse_response(content)
 
         # used later for the messages
-        content_str = content
-
-        content = json.loads(content)
+        content_str = assistant_content(content)
 
         processed_content = []
 
@@ -210,18 +432,10 @@ async def call_qwen_vl_with_ocr(messages, objective, model):
                         "[call_qwen_vl_with_ocr][click] text_to_click",
                         text_to_click,
                     )
-                # Get optimized EasyOCR Reader
-                reader = get_ocr_reader(["en"], model_name="qwen-vl")
-
-                # Read the screenshot
-                result = reader.readtext(screenshot_filename)
-
-                text_element_index = get_text_element(
-                    result, text_to_click, screenshot_filename
-                )
-                coordinates = get_text_coordinates(
-                    result, text_element_index, screenshot_filename
-                )
+                # Resolve the click from the frame's parse (OCR is cached per frame)
+                screen = await parse_screen_async(frame, model_name="qwen-vl")
+                text_element = screen.find_text(text_to_click)
+                coordinates = screen.click_position(text_element)
 
                 # add `coordinates`` to `content`
                 operation["x"] = coordinates["x"]
@@ -229,8 +443,8 @@ async def call_qwen_vl_with_ocr(messages, objective, model):
 
                 if config.verbose:
                     print(
-                        "[call_qwen_vl_with_ocr][click] text_element_index",
-                        text_element_index,
+                        "[call_qwen_vl_with_ocr][click] text_element",
+                        text_element.id,
                     )
                     print(
                         "[call_qwen_vl_with_ocr][click] coordinates",
@@ -253,14 +467,14 @@ async def call_qwen_vl_with_ocr(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return gpt_4_fallback(messages, objective, model)
+        raise
 
-def call_gemini_pro_vision(messages, objective):
+async def call_gemini_pro_vision(messages, objective):
     """
     Get the next action for Self-Operating Computer using Gemini Pro Vision
     """
@@ -268,32 +482,38 @@ def call_gemini_pro_vision(messages, objective):
         print(
             "[Self Operating Computer][call_gemini_pro_vision]",
         )
-    # sleep for a second
-    time.sleep(1)
+    # wait for the screen to settle after the previous actions
+    await wait_for_screen_settle_async()
     try:
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
-        # sleep for a second
-        time.sleep(1)
+        frame = await capture_frame_async()
         prompt = get_system_prompt("gemini-pro-vision", objective)
+        screenshot = await encode_image_async(frame, "google")
 
         model = config.initialize_google()
         if config.verbose:
             print("[call_gemini_pro_vision] model", model)
 
-        response = model.generate_content([prompt, Image.open(screenshot_filename)])
+        # the Gemini SDK is synchronous, keep it off the event loop
+        async def generate():
+            response = await call_with_retry(
+                "google",
+                lambda: asyncio.to_thread(
+                    model.generate_content,
+                    [prompt, {"mime_type": screenshot.media_type, "data": screenshot.data}],
+                ),
+            )
+            if config.verbose:
+                print("[call_gemini_pro_vision] response", response)
+            return response.text
 
-        content = response.text[1:]
+        content = await response_cache.fetch(
+            "gemini-pro-vision", [{"role": "user", "content": prompt}], frame, generate
+        )
         if config.verbose:
-            print("[call_gemini_pro_vision] response", response)
             print("[call_gemini_pro_vision] content", content)
 
-        content = json.loads(content)
+        content = parse_response(content)
         if config.verbose:
             print(
                 "[get_next_action][call_gemini_pro_vision] content",
@@ -304,110 +524,88 @@ def call_gemini_pro_vision(messages, objective):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[Operate] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[Operate] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return call_gpt_4o(messages)
+        raise
 
 
-async def call_gpt_4o_with_ocr(messages, objective, model):
+async def call_gpt_4o_with_ocr(messages, objective, model, on_operation=None):
     if config.verbose:
         print("[call_gpt_4o_with_ocr]")
 
     # Construct the path to the file within the package
     try:
-        time.sleep(1)
-        client = config.initialize_openai()
+        await wait_for_screen_settle_async()
+        client = config.initialize_openai_async()
 
         confirm_system_prompt(messages, objective, model)
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
-
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+        frame = await capture_frame_async()
+        # start OCR now so it runs while the model request is in flight
+        prefetch_text(frame, ["en"], model_name="gpt-4o")
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
         else:
             user_prompt = get_user_prompt()
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": user_prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                },
-            ],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "openai")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
+                    },
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        if on_operation is not None:
+            content_str, processed_content = await stream_operations(
+                openai_text_stream(
+                    client, frame, model="gpt-4o", messages=messages, **structured_request("openai", "text")
+                ),
+                on_operation,
+                resolve=lambda operation: resolve_text_click(
+                    frame, operation, "gpt-4o", "call_gpt_4o_with_ocr"
+                ),
+                label="call_gpt_4o_with_ocr",
+                wrapped=structured_output_enabled(),
+                compact=compact_actions_enabled(),
+            )
+            messages.append({"role": "assistant", "content": content_str})
+            return processed_content
+
+        content = await openai_completion(
+            client,
+            frame,
             model="gpt-4o",
             messages=messages,
+            **structured_request("openai", "text"),
         )
 
-        content = response.choices[0].message.content
-
-        content = clean_json(content)
+        content = parse_response(content)
 
         # used later for the messages
-        content_str = content
-
-        content = json.loads(content)
+        content_str = assistant_content(content)
 
         processed_content = []
 
         for operation in content:
-            if operation.get("operation") == "click":
-                text_to_click = operation.get("text")
-                if config.verbose:
-                    print(
-                        "[call_gpt_4o_with_ocr][click] text_to_click",
-                        text_to_click,
-                    )
-                # Get optimized EasyOCR Reader
-                reader = get_ocr_reader(["en"], model_name="gpt-4o")
-
-                # Read the screenshot
-                result = reader.readtext(screenshot_filename)
-
-                text_element_index = get_text_element(
-                    result, text_to_click, screenshot_filename
-                )
-                coordinates = get_text_coordinates(
-                    result, text_element_index, screenshot_filename
-                )
-
-                # add `coordinates`` to `content`
-                operation["x"] = coordinates["x"]
-                operation["y"] = coordinates["y"]
-
-                if config.verbose:
-                    print(
-                        "[call_gpt_4o_with_ocr][click] text_element_index",
-                        text_element_index,
-                    )
-                    print(
-                        "[call_gpt_4o_with_ocr][click] coordinates",
-                        coordinates,
-                    )
-                    print(
-                        "[call_gpt_4o_with_ocr][click] final operation",
-                        operation,
-                    )
-                processed_content.append(operation)
-
-            else:
-                processed_content.append(operation)
+            processed_content.append(
+                await resolve_text_click(frame, operation, "gpt-4o", "call_gpt_4o_with_ocr")
+            )
 
         # wait to append the assistant message so that if the `processed_content` step fails we don't append a message and mess up message history
         assistant_message = {"role": "assistant", "content": content_str}
@@ -417,104 +615,85 @@ async def call_gpt_4o_with_ocr(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return gpt_4_fallback(messages, objective, model)
+        raise
 
 
-async def call_gpt_4_1_with_ocr(messages, objective, model):
+async def call_gpt_4_1_with_ocr(messages, objective, model, on_operation=None):
     if config.verbose:
         print("[call_gpt_4_1_with_ocr]")
 
     try:
-        time.sleep(1)
-        client = config.initialize_openai()
+        await wait_for_screen_settle_async()
+        client = config.initialize_openai_async()
 
         confirm_system_prompt(messages, objective, model)
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
-        capture_screen_with_cursor(screenshot_filename)
-
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+        frame = await capture_frame_async()
+        # start OCR now so it runs while the model request is in flight
+        prefetch_text(frame, ["en"], model_name="gpt-4.1")
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
         else:
             user_prompt = get_user_prompt()
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": user_prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                },
-            ],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "openai")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
+                    },
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        if on_operation is not None:
+            content_str, processed_content = await stream_operations(
+                openai_text_stream(
+                    client, frame, model="gpt-4.1", messages=messages, **structured_request("openai", "text")
+                ),
+                on_operation,
+                resolve=lambda operation: resolve_text_click(
+                    frame, operation, "gpt-4.1", "call_gpt_4_1_with_ocr"
+                ),
+                label="call_gpt_4_1_with_ocr",
+                wrapped=structured_output_enabled(),
+                compact=compact_actions_enabled(),
+            )
+            messages.append({"role": "assistant", "content": content_str})
+            return processed_content
+
+        content = await openai_completion(
+            client,
+            frame,
             model="gpt-4.1",
             messages=messages,
+            **structured_request("openai", "text"),
         )
 
-        content = response.choices[0].message.content
+        content = parse_response(content)
 
-        content = clean_json(content)
-
-        content_str = content
-
-        content = json.loads(content)
+        content_str = assistant_content(content)
 
         processed_content = []
 
         for operation in content:
-            if operation.get("operation") == "click":
-                text_to_click = operation.get("text")
-                if config.verbose:
-                    print(
-                        "[call_gpt_4_1_with_ocr][click] text_to_click",
-                        text_to_click,
-                    )
-                reader = get_ocr_reader(["en"], model_name="gpt-4.1")
-
-                result = reader.readtext(screenshot_filename)
-
-                text_element_index = get_text_element(
-                    result, text_to_click, screenshot_filename
-                )
-                coordinates = get_text_coordinates(
-                    result, text_element_index, screenshot_filename
-                )
-
-                operation["x"] = coordinates["x"]
-                operation["y"] = coordinates["y"]
-
-                if config.verbose:
-                    print(
-                        "[call_gpt_4_1_with_ocr][click] text_element_index",
-                        text_element_index,
-                    )
-                    print(
-                        "[call_gpt_4_1_with_ocr][click] coordinates",
-                        coordinates,
-                    )
-                    print(
-                        "[call_gpt_4_1_with_ocr][click] final operation",
-                        operation,
-                    )
-                processed_content.append(operation)
-
-            else:
-                processed_content.append(operation)
+            processed_content.append(
+                await resolve_text_click(frame, operation, "gpt-4.1", "call_gpt_4_1_with_ocr")
+            )
 
         assistant_message = {"role": "assistant", "content": content_str}
         messages.append(assistant_message)
@@ -523,12 +702,12 @@ async def call_gpt_4_1_with_ocr(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return gpt_4_fallback(messages, objective, model)
+        raise
 
 
 async def call_o1_with_ocr(messages, objective, model):
@@ -537,51 +716,51 @@ async def call_o1_with_ocr(messages, objective, model):
 
     # Construct the path to the file within the package
     try:
-        time.sleep(1)
-        client = config.initialize_openai()
+        await wait_for_screen_settle_async()
+        client = config.initialize_openai_async()
 
         confirm_system_prompt(messages, objective, model)
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
-
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+        frame = await capture_frame_async()
+        # start OCR now so it runs while the model request is in flight
+        prefetch_text(frame, ["en"], model_name="o1")
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
         else:
             user_prompt = get_user_prompt()
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": user_prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"},
-                },
-            ],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "openai")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
+                    },
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        content = await openai_completion(
+            client,
+            frame,
             model="o1",
             messages=messages,
+            **structured_request("openai", "text"),
         )
 
-        content = response.choices[0].message.content
-
-        content = clean_json(content)
+        content = parse_response(content)
 
         # used later for the messages
-        content_str = content
-
-        content = json.loads(content)
+        content_str = assistant_content(content)
 
         processed_content = []
 
@@ -593,18 +772,10 @@ async def call_o1_with_ocr(messages, objective, model):
                         "[call_o1_with_ocr][click] text_to_click",
                         text_to_click,
                     )
-                # Get optimized EasyOCR Reader
-                reader = get_ocr_reader(["en"], model_name="o1")
-
-                # Read the screenshot
-                result = reader.readtext(screenshot_filename)
-
-                text_element_index = get_text_element(
-                    result, text_to_click, screenshot_filename
-                )
-                coordinates = get_text_coordinates(
-                    result, text_element_index, screenshot_filename
-                )
+                # Resolve the click from the frame's parse (OCR is cached per frame)
+                screen = await parse_screen_async(frame, model_name="o1")
+                text_element = screen.find_text(text_to_click)
+                coordinates = screen.click_position(text_element)
 
                 # add `coordinates`` to `content`
                 operation["x"] = coordinates["x"]
@@ -612,8 +783,8 @@ async def call_o1_with_ocr(messages, objective, model):
 
                 if config.verbose:
                     print(
-                        "[call_o1_with_ocr][click] text_element_index",
-                        text_element_index,
+                        "[call_o1_with_ocr][click] text_element",
+                        text_element.id,
                     )
                     print(
                         "[call_o1_with_ocr][click] coordinates",
@@ -636,35 +807,29 @@ async def call_o1_with_ocr(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return gpt_4_fallback(messages, objective, model)
+        raise
 
 
 async def call_gpt_4o_labeled(messages, objective, model):
-    time.sleep(1)
+    await wait_for_screen_settle_async()
 
     try:
-        client = config.initialize_openai()
+        client = config.initialize_openai_async()
 
         confirm_system_prompt(messages, objective, model)
-        file_path = pkg_resources.resource_filename("operate.models.weights", "best.pt")
-        yolo_model = YOLO(file_path)  # Load your trained model
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
+        frame = await capture_frame_async()
 
-        with open(screenshot_filename, "rb") as img_file:
-            img_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-
-        img_base64_labeled, label_coordinates = add_labels(img_base64, yolo_model)
+        # Detections come from the frame's parse, YOLO runs at most once per frame
+        screen = await parse_screen_async(frame, text=False, objects=True)
+        labeled_image = await asyncio.to_thread(
+            draw_label_image, frame, screen.label_coordinates, screen.detections
+        )
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
@@ -677,36 +842,40 @@ async def call_gpt_4o_labeled(messages, objective, model):
                 user_prompt,
             )
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": user_prompt},
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{img_base64_labeled}"
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(labeled_image, "openai")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": screenshot.data_url},
                     },
-                },
-            ],
-        }
+                ],
+            }
         messages.append(vision_message)
 
-        response = client.chat.completions.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        content = await openai_completion(
+            client,
+            frame,
             model="gpt-4o",
             messages=messages,
             presence_penalty=1,
             frequency_penalty=1,
+            **structured_request("openai", "label"),
         )
 
-        content = response.choices[0].message.content
-
-        content = clean_json(content)
+        content = parse_response(content)
 
-        assistant_message = {"role": "assistant", "content": content}
+        assistant_message = {"role": "assistant", "content": assistant_content(content)}
 
         messages.append(assistant_message)
-
-        content = json.loads(content)
         if config.verbose:
             print(
                 "[call_gpt_4_vision_preview_labeled] content",
@@ -728,16 +897,13 @@ async def call_gpt_4o_labeled(messages, objective, model):
                         label,
                     )
 
-                coordinates = get_label_coordinates(label, label_coordinates)
+                coordinates = get_label_coordinates(label, screen.label_coordinates)
                 if config.verbose:
                     print(
                         "[Self Operating Computer][call_gpt_4_vision_preview_labeled] coordinates",
                         coordinates,
                     )
-                image = Image.open(
-                    io.BytesIO(base64.b64decode(img_base64))
-                )  # Load the image to get its size
-                image_size = image.size  # Get the size of the image (width, height)
+                image_size = frame.size  # Get the size of the image (width, height)
                 click_position_percent = get_click_position_in_percent(
                     coordinates, image_size
                 )
@@ -747,10 +913,7 @@ async def call_gpt_4o_labeled(messages, objective, model):
                         click_position_percent,
                     )
                 if not click_position_percent:
-                    print(
-                        f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RED}[Error] Failed to get click position in percent. Trying another method {ANSI_RESET}"
-                    )
-                    return call_gpt_4o(messages)
+                    raise ValueError(f"Failed to get click position in percent for label {label}")
 
                 x_percent = f"{click_position_percent[0]:.2f}"
                 y_percent = f"{click_position_percent[1]:.2f}"
@@ -780,27 +943,23 @@ async def call_gpt_4o_labeled(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-        return call_gpt_4o(messages)
+        raise
 
 
-def call_ollama_llava(messages):
+async def call_ollama_llava(messages):
     if config.verbose:
         print("[call_ollama_llava]")
-    time.sleep(1)
+    await wait_for_screen_settle_async()
+    content = None
     try:
-        model = config.initialize_ollama()
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
+        model = config.initialize_ollama_async()
         # Call the function to capture the screen with the cursor
-        capture_screen_with_cursor(screenshot_filename)
+        frame = await capture_frame_async()
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
@@ -813,14 +972,26 @@ def call_ollama_llava(messages):
                 user_prompt,
             )
 
-        vision_message = {
-            "role": "user",
-            "content": user_prompt,
-            "images": [screenshot_filename],
-        }
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = {
+                "role": "user",
+                "content": get_user_no_change_prompt(),
+            }
+        else:
+            screenshot = await encode_image_async(frame, "ollama")
+            vision_message = {
+                "role": "user",
+                "content": user_prompt,
+                "images": [screenshot.data],
+            }
         messages.append(vision_message)
 
-        response = model.chat(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        content = await ollama_chat(
+            model,
+            frame,
             model="llava",
             messages=messages,
         )
@@ -830,17 +1001,13 @@ def call_ollama_llava(messages):
         # eventually timeout.
         messages[-1]["images"] = None
 
-        content = response["message"]["content"].strip()
-
-        content = clean_json(content)
-
-        assistant_message = {"role": "assistant", "content": content}
         if config.verbose:
             print(
                 "[call_ollama_llava] content",
                 content,
             )
-        content = json.loads(content)
+        content = parse_response(content)
+        assistant_message = {"role": "assistant", "content": assistant_content(content)}
 
         messages.append(assistant_message)
 
@@ -851,10 +1018,11 @@ def call_ollama_llava(messages):
             f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RED}[Operate] Couldn't connect to Ollama. With Ollama installed, run `ollama pull llava` then `ollama serve`{ANSI_RESET}",
             e,
         )
+        raise
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[llava] That did not work. Trying again {ANSI_RESET}",
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[llava] That did not work {ANSI_RESET}",
             e,
         )
         print(
@@ -863,110 +1031,89 @@ def call_ollama_llava(messages):
         )
         if config.verbose:
             traceback.print_exc()
-        return call_ollama_llava(messages)
+        raise
 
 
-async def call_claude_3_with_ocr(messages, objective, model):
+async def call_claude_3_with_ocr(messages, objective, model, on_operation=None):
     if config.verbose:
         print("[call_claude_3_with_ocr]")
 
     try:
-        time.sleep(1)
-        client = config.initialize_anthropic()
+        await wait_for_screen_settle_async()
+        client = config.initialize_anthropic_async()
 
         confirm_system_prompt(messages, objective, model)
-        screenshots_dir = "screenshots"
-        if not os.path.exists(screenshots_dir):
-            os.makedirs(screenshots_dir)
-
-        screenshot_filename = os.path.join(screenshots_dir, "screenshot.png")
-        capture_screen_with_cursor(screenshot_filename)
-
-        # downsize screenshot due to 5MB size limit
-        with open(screenshot_filename, "rb") as img_file:
-            img = Image.open(img_file)
-
-            # Convert RGBA to RGB
-            if img.mode == "RGBA":
-                img = img.convert("RGB")
-
-            # Calculate the new dimensions while maintaining the aspect ratio
-            original_width, original_height = img.size
-            aspect_ratio = original_width / original_height
-            new_width = 2560  # Adjust this value to achieve the desired file size
-            new_height = int(new_width / aspect_ratio)
-            if config.verbose:
-                print("[call_claude_3_with_ocr] resizing claude")
-
-            # Resize the image
-            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Save the resized and converted image to a BytesIO object for JPEG format
-            img_buffer = io.BytesIO()
-            img_resized.save(
-                img_buffer, format="JPEG", quality=85
-            )  # Adjust the quality parameter as needed
-            img_buffer.seek(0)
-
-            # Encode the resized image as base64
-            img_data = base64.b64encode(img_buffer.getvalue()).decode("utf-8")
+        frame = await capture_frame_async()
+        # start OCR now so it runs while the model request is in flight
+        prefetch_text(frame, ["en"], model_name="claude-3")
 
         if len(messages) == 1:
             user_prompt = get_user_first_message_prompt()
         else:
             user_prompt = get_user_prompt()
 
-        vision_message = {
-            "role": "user",
-            "content": [
-                {
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": "image/jpeg",
-                        "data": img_data,
+        if frame_change_detector.is_repeat(frame) and len(messages) > 1:
+            vision_message = get_no_change_message()
+        else:
+            screenshot = await encode_image_async(frame, "anthropic")
+            vision_message = {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": screenshot.media_type,
+                            "data": screenshot.base64,
+                        },
                     },
-                },
-                {
-                    "type": "text",
-                    "text": user_prompt
-                    + "**REMEMBER** Only output json format, do not append any other text.",
-                },
-            ],
-        }
+                    {
+                        "type": "text",
+                        "text": user_prompt
+                        + get_output_reminder(),
+                    },
+                ],
+            }
         messages.append(vision_message)
 
         # anthropic api expect system prompt as an separate argument
-        response = client.messages.create(
+        # cap the screenshots and size of the history sent with the request
+        compact_history(messages)
+
+        if on_operation is not None:
+            content_str, processed_content = await stream_operations(
+                anthropic_text_stream(
+                    client,
+                    frame,
+                    model="claude-3-opus-20240229",
+                    max_tokens=3000,
+                    system=messages[0]["content"],
+                    messages=messages[1:],
+                    **structured_request("anthropic", "text"),
+                ),
+                on_operation,
+                resolve=lambda operation: resolve_text_click(
+                    frame, operation, "claude-3", "call_claude_3_ocr"
+                ),
+                label="call_claude_3_with_ocr",
+                wrapped=structured_output_enabled(),
+                compact=compact_actions_enabled(),
+            )
+            messages.append({"role": "assistant", "content": content_str})
+            return processed_content
+
+        content = await anthropic_completion(
+            client,
+            frame,
             model="claude-3-opus-20240229",
             max_tokens=3000,
             system=messages[0]["content"],
             messages=messages[1:],
+            **structured_request("anthropic", "text"),
         )
-
-        content = response.content[0].text
-        content = clean_json(content)
-        content_str = content
-        try:
-            content = json.loads(content)
-        # rework for json mode output
-        except json.JSONDecodeError as e:
-            if config.verbose:
-                print(
-                    f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RED}[Error] JSONDecodeError: {e} {ANSI_RESET}"
-                )
-            response = client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=3000,
-                system=f"This json string is not valid, when using with json.loads(content) \
-                it throws the following error: {e}, return correct json string. \
-                **REMEMBER** Only output json format, do not append any other text.",
-                messages=[{"role": "user", "content": content}],
-            )
-            content = response.content[0].text
-            content = clean_json(content)
-            content_str = content
-            content = json.loads(content)
+        # malformed JSON is repaired locally instead of with a second request
+        content = parse_response(content)
+        content_str = assistant_content(content)
 
         if config.verbose:
             print(
@@ -975,48 +1122,9 @@ async def call_claude_3_with_ocr(messages, objective, model):
         processed_content = []
 
         for operation in content:
-            if operation.get("operation") == "click":
-                text_to_click = operation.get("text")
-                if config.verbose:
-                    print(
-                        "[call_claude_3_ocr][click] text_to_click",
-                        text_to_click,
-                    )
-                # Get optimized EasyOCR Reader
-                reader = get_ocr_reader(["en"], model_name="claude-3")
-
-                # Read the screenshot
-                result = reader.readtext(screenshot_filename)
-
-                # limit the text to extract has a higher success rate
-                text_element_index = get_text_element(
-                    result, text_to_click[:3], screenshot_filename
-                )
-                coordinates = get_text_coordinates(
-                    result, text_element_index, screenshot_filename
-                )
-
-                # add `coordinates`` to `content`
-                operation["x"] = coordinates["x"]
-                operation["y"] = coordinates["y"]
-
-                if config.verbose:
-                    print(
-                        "[call_claude_3_ocr][click] text_element_index",
-                        text_element_index,
-                    )
-                    print(
-                        "[call_claude_3_ocr][click] coordinates",
-                        coordinates,
-                    )
-                    print(
-                        "[call_claude_3_ocr][click] final operation",
-                        operation,
-                    )
-                processed_content.append(operation)
-
-            else:
-                processed_content.append(operation)
+            processed_content.append(
+                await resolve_text_click(frame, operation, "claude-3", "call_claude_3_ocr")
+            )
 
         assistant_message = {"role": "assistant", "content": content_str}
         messages.append(assistant_message)
@@ -1025,40 +1133,63 @@ async def call_claude_3_with_ocr(messages, objective, model):
 
     except Exception as e:
         print(
-            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work. Trying another method {ANSI_RESET}"
+            f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{model}] That did not work {ANSI_RESET}"
         )
         if config.verbose:
             print("[Self-Operating Computer][Operate] error", e)
             traceback.print_exc()
-            print("message before convertion ", messages)
-
-        # Convert the messages to the GPT-4 format
-        gpt4_messages = [messages[0]]  # Include the system message
-        for message in messages[1:]:
-            if message["role"] == "user":
-                # Update the image type format from "source" to "url"
-                updated_content = []
-                for item in message["content"]:
-                    if isinstance(item, dict) and "type" in item:
-                        if item["type"] == "image":
-                            updated_content.append(
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{item['source']['data']}"
-                                    },
-                                }
-                            )
-                        else:
-                            updated_content.append(item)
-
-                gpt4_messages.append({"role": "user", "content": updated_content})
-            elif message["role"] == "assistant":
-                gpt4_messages.append(
-                    {"role": "assistant", "content": message["content"]}
-                )
+        raise
+
+
+async def resolve_text_click(frame, operation, model_name, label):
+    """
+    Add the click position of an OCR `click` operation
+
+    The position comes from the frame's parse, so OCR runs at most once per
+    frame no matter how many clicks (or streamed operations) need it.
 
-        return gpt_4_fallback(gpt4_messages, objective, model)
+    Args:
+        frame: Frame the model saw
+        operation: Operation from the model, completed in place
+        model_name: Model name for OCR tracking
+        label: Prefix for verbose output
+
+    Returns:
+        dict: The operation
+
+    Raises:
+        Exception: If the text to click is not found
+    """
+    if operation.get("operation") != "click":
+        return operation
+
+    text_to_click = operation.get("text")
+    if config.verbose:
+        print(f"[{label}][click] text_to_click", text_to_click)
+    screen = await parse_screen_async(frame, model_name=model_name)
+    text_element = screen.find_text(text_to_click)
+    coordinates = screen.click_position(text_element)
+
+    # add `coordinates`` to `content`
+    operation["x"] = coordinates["x"]
+    operation["y"] = coordinates["y"]
+
+    if config.verbose:
+        print(f"[{label}][click] text_element", text_element.id)
+        print(f"[{label}][click] coordinates", coordinates)
+        print(f"[{label}][click] final operation", operation)
+    return operation
+
+
+def get_no_change_message():
+    """
+    User message sent instead of a screenshot when the screen is identical to
+    the one the model saw on the previous step (the request itself is still sent)
+    """
+    return {
+        "role": "user",
+        "content": [{"type": "text", "text": get_user_no_change_prompt()}],
+    }
 
 
 def get_last_assistant_message(messages):
@@ -1075,20 +1206,86 @@ def get_last_assistant_message(messages):
     return None  # Return None if no assistant message is found
 
 
-def gpt_4_fallback(messages, objective, model):
-    if config.verbose:
-        print("[gpt_4_fallback]")
-    system_prompt = get_system_prompt("gpt-4o", objective)
-    new_system_message = {"role": "system", "content": system_prompt}
-    # remove and replace the first message in `messages` with `new_system_message`
+def convert_to_openai_messages(messages):
+    """
+    Copy of an Anthropic format conversation in the OpenAI chat format, used
+    when a Claude step falls back to an OpenAI model
+    """
+    gpt4_messages = [messages[0]]  # Include the system message
+    for message in messages[1:]:
+        if message["role"] == "user":
+            content = message["content"]
+            if isinstance(content, str):
+                gpt4_messages.append({"role": "user", "content": content})
+                continue
+            # Update the image type format from "source" to "url"
+            updated_content = []
+            for item in content:
+                if isinstance(item, dict) and "type" in item:
+                    if item["type"] == "image":
+                        updated_content.append(
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:{item['source']['media_type']};base64,{item['source']['data']}"
+                                },
+                            }
+                        )
+                    else:
+                        updated_content.append(item)
+
+            gpt4_messages.append({"role": "user", "content": updated_content})
+        elif message["role"] == "assistant":
+            gpt4_messages.append(
+                {"role": "assistant", "content": message["content"]}
+            )
+    return gpt4_messages
 
-    messages[0] = new_system_message
 
-    if config.verbose:
-        print("[gpt_4_fallback][updated]")
-        print("[gpt_4_fallback][updated] len(messages)", len(messages))
+def convert_to_anthropic_messages(messages):
+    """
+    Copy of an OpenAI chat format conversation in the Anthropic format, used
+    when an OpenAI step falls back to (or is hedged with) Claude
+    """
+    claude_messages = [messages[0]]
+    for message in messages[1:]:
+        content = message["content"]
+        if message["role"] != "user" or isinstance(content, str):
+            claude_messages.append({"role": message["role"], "content": content})
+            continue
+        updated_content = []
+        for item in content:
+            if isinstance(item, dict) and item.get("type") == "image_url":
+                header, data = item["image_url"]["url"].split(",", 1)
+                updated_content.append(
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": header[len("data:"):].split(";")[0],
+                            "data": data,
+                        },
+                    }
+                )
+            else:
+                updated_content.append(item)
+        claude_messages.append({"role": "user", "content": updated_content})
+    return claude_messages
+
+
+def message_format(model):
+    """Message format a model's call path expects ("anthropic" or "openai")"""
+    return "anthropic" if model == "claude-3" else "openai"
 
-    return call_gpt_4o(messages)
+
+def convert_messages(messages, model, candidate):
+    """Copy of `model`'s conversation in the format `candidate` expects (sharing no message dicts)"""
+    source, target = message_format(model), message_format(candidate)
+    if source == target:
+        return copy_history(messages)
+    if target == "openai":
+        return copy_history(convert_to_openai_messages(messages))
+    return copy_history(convert_to_anthropic_messages(messages))
 
 
 def confirm_system_prompt(messages, objective, model):
@@ -1113,28 +1310,3 @@ def confirm_system_prompt(messages, objective, model):
                 print("[confirm_system_prompt][message] role", m["role"])
                 print("[confirm_system_prompt][message] content", m["content"])
                 print("------------------[end message]------------------")
-
-
-def clean_json(content):
-    if config.verbose:
-        print("\n\n[clean_json] content before cleaning", content)
-    if content.startswith("```json"):
-        content = content[
-            len("```json") :
-        ].strip()  # Remove starting ```json and trim whitespace
-    elif content.startswith("```"):
-        content = content[
-            len("```") :
-        ].strip()  # Remove starting ``` and trim whitespace
-    if content.endswith("```"):
-        content = content[
-            : -len("```")
-        ].strip()  # Remove ending ``` and trim whitespace
-
-    # Normalize line breaks and remove any unwanted characters
-    content = "\n".join(line.strip() for line in content.splitlines())
-
-    if config.verbose:
-        print("\n\n[clean_json] content after cleaning", content)
-
-    return content
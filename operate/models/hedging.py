@@ -0,0 +1,239 @@
+"""
+Hedged model requests
+
+A few slow responses (20-40s) dominate the wall-clock time of a session.
+With hedging enabled, `get_next_action` sends the same step to an alternate
+model once the primary one has not answered within `after` seconds. The first
+valid response wins and the other request is cancelled.
+
+With streaming, "answering" means handing over the first operation: the
+request that does so claims the step and the other one is cancelled right
+away, so operations are never executed from both.
+
+Step latencies are recorded with and without hedging so the effect on p50
+and p99 can be compared (`get_hedge_stats`).
+
+Configuration:
+- OPERATE_HEDGE: set to 1 to enable hedging
+- OPERATE_HEDGE_AFTER: seconds before the alternate request is sent (default 8)
+- OPERATE_HEDGE_ALTERNATES: comma separated model=alternate pairs
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from operate.config import Config
+from operate.utils.style import ANSI_BRIGHT_MAGENTA, ANSI_GREEN, ANSI_RESET
+
+# Load configuration
+config = Config()
+
+DEFAULT_HEDGE_AFTER = float(os.getenv("OPERATE_HEDGE_AFTER", "8"))
+DEFAULT_ALTERNATES = os.getenv(
+    "OPERATE_HEDGE_ALTERNATES",
+    "gpt-4-with-ocr=gpt-4.1-with-ocr,gpt-4.1-with-ocr=gpt-4-with-ocr,claude-3=gpt-4-with-ocr",
+)
+LATENCY_SAMPLES = 1000
+
+# start(claim) returns the attempt's coroutine; claim() reports whether the
+# attempt may hand over operations (the first caller wins the step)
+AttemptFactory = Callable[[Callable[[], bool]], Awaitable[Any]]
+
+
+def hedging_enabled() -> bool:
+    """Whether hedged requests are sent (OPERATE_HEDGE)"""
+    return os.getenv("OPERATE_HEDGE", "0") == "1"
+
+
+def parse_alternates(value: str) -> Dict[str, str]:
+    alternates = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            model, alternate = (part.strip() for part in pair.split("=", 1))
+            if model and alternate and model != alternate:
+                alternates[model] = alternate
+    return alternates
+
+
+def percentile(samples, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of `samples` (None if empty)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Attributes:
+        after: Seconds without an answer before the alternate request is sent
+        alternates: Alternate model for each primary model
+    """
+
+    after: float = DEFAULT_HEDGE_AFTER
+    alternates: Dict[str, str] = field(default_factory=lambda: parse_alternates(DEFAULT_ALTERNATES))
+
+
+class Hedger:
+    """
+    Races a primary request against a delayed alternate one
+
+    Args:
+        policy: Hedge policy, defaults to the configured one
+    """
+
+    def __init__(self, policy: HedgePolicy = None):
+        self.policy = policy or HedgePolicy()
+        self._lock = threading.Lock()
+        self._latencies = {"hedged": deque(maxlen=LATENCY_SAMPLES), "unhedged": deque(maxlen=LATENCY_SAMPLES)}
+        self._stats = {"races": 0, "hedges_sent": 0, "primary_wins": 0, "alternate_wins": 0, "cancelled": 0}
+
+    def alternate_for(self, model: str) -> Optional[str]:
+        """Alternate model for `model`, or None if hedging is off or none is configured"""
+        if not hedging_enabled():
+            return None
+        return self.policy.alternates.get(model)
+
+    async def run(
+        self,
+        primary: str,
+        start_primary: AttemptFactory,
+        alternate: str,
+        start_alternate: AttemptFactory,
+        after: float = None,
+    ) -> Any:
+        """
+        Run the primary attempt, hedged by the alternate one after `after` seconds
+
+        An attempt fails if it raises (e.g. a response not matching the
+        operation schema); the other one keeps running.
+
+        Args:
+            primary: Primary model name
+            start_primary: Factory for the primary attempt
+            alternate: Alternate model name
+            start_alternate: Factory for the alternate attempt
+            after: Hedge delay, defaults to the policy's
+
+        Returns:
+            The winning attempt's result
+
+        Raises:
+            Exception: The primary's error if it fails before the hedge is sent,
+                otherwise the last error once both attempts failed
+        """
+        after = self.policy.after if after is None else after
+        names: Dict[asyncio.Future, str] = {}
+        claimed = {"by": None}
+
+        def claim_for(name):
+            def claim():
+                if claimed["by"] is None:
+                    claimed["by"] = name
+                    for task, other in names.items():
+                        if other != name and not task.done():
+                            task.cancel()
+                            with self._lock:
+                                self._stats["cancelled"] += 1
+                return claimed["by"] == name
+            return claim
+
+        with self._lock:
+            self._stats["races"] += 1
+        start_time = time.time()
+        primary_task = asyncio.ensure_future(start_primary(claim_for(primary)))
+        names[primary_task] = primary
+        pending = {primary_task}
+        hedge_sent = False
+        last_error = None
+
+        try:
+            while pending:
+                timeout = None
+                if not hedge_sent and claimed["by"] is None:
+                    timeout = max(0.0, start_time + after - time.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    hedge_sent = True
+                    with self._lock:
+                        self._stats["hedges_sent"] += 1
+                    print(
+                        f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_BRIGHT_MAGENTA}[{primary}] No answer after {after:.1f}s, also asking {alternate} {ANSI_RESET}"
+                    )
+                    alternate_task = asyncio.ensure_future(start_alternate(claim_for(alternate)))
+                    names[alternate_task] = alternate
+                    pending.add(alternate_task)
+                    continue
+
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        if config.verbose:
+                            print(f"[Hedger] {names[task]} failed: {last_error}")
+                        if names[task] == claimed["by"]:
+                            # operations from this attempt already ran, don't switch
+                            raise last_error
+                        continue
+
+                    winner = names[task]
+                    with self._lock:
+                        self._stats["primary_wins" if winner == primary else "alternate_wins"] += 1
+                    if config.verbose:
+                        print(f"[Hedger] {winner} answered after {time.time() - start_time:.2f}s")
+                    return task.result()
+
+                if not hedge_sent and not pending:
+                    # the primary failed before the hedge was due, leave it to the fallback chain
+                    raise last_error
+            raise last_error or RuntimeError("Every hedged request was cancelled")
+        finally:
+            for task in names:
+                if not task.done():
+                    task.cancel()
+                    with self._lock:
+                        self._stats["cancelled"] += 1
+            # let cancelled attempts unwind before their messages are discarded
+            await asyncio.gather(*names, return_exceptions=True)
+
+    def record_latency(self, seconds: float, hedged: bool):
+        """Record the latency of one step"""
+        with self._lock:
+            self._latencies["hedged" if hedged else "unhedged"].append(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedge counters and step latency p50 / p99 with and without hedging"""
+        with self._lock:
+            stats = dict(self._stats)
+            for series, samples in self._latencies.items():
+                stats[series] = {
+                    "steps": len(samples),
+                    "p50": percentile(samples, 0.50),
+                    "p99": percentile(samples, 0.99),
+                }
+        return stats
+
+    def reset(self):
+        with self._lock:
+            for samples in self._latencies.values():
+                samples.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+# Global instance
+hedger = Hedger()
+
+
+def get_hedge_stats() -> Dict[str, Any]:
+    """Get hedging and step latency statistics"""
+    return hedger.get_stats()
@@ -0,0 +1,270 @@
+"""
+Message history compaction
+
+Every step appends a screenshot to `messages`, so without compaction step N
+re-uploads N screenshots. Before each request the history is compacted:
+
+- only the newest `max_images` screenshots are kept; older ones are replaced
+  by a one-line text note of the actions the model took after seeing them
+  and whether the screen changed afterwards
+- if the estimated request size is still above `token_budget`, the oldest
+  steps are dropped entirely and folded into a "summary of earlier steps"
+  note at the start of the history
+
+The system message, the newest step and the newest screenshot are never
+removed. Turns are only
+dropped whole (user message plus the model's reply), so the history keeps
+alternating user / assistant as the Anthropic API requires.
+
+Configuration:
+- OPERATE_HISTORY_IMAGES: screenshots kept in the history (default 2)
+- OPERATE_HISTORY_TOKEN_BUDGET: estimated tokens per request (default 48000, 0 disables)
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List
+
+from operate.config import Config
+from operate.models.image_encoder import estimate_part_tokens
+from operate.models.prompts import get_user_no_change_prompt
+
+# Load configuration
+config = Config()
+
+DEFAULT_MAX_IMAGES = int(os.getenv("OPERATE_HISTORY_IMAGES", "2"))
+DEFAULT_TOKEN_BUDGET = int(os.getenv("OPERATE_HISTORY_TOKEN_BUDGET", "48000"))
+
+# Rough size of a screenshot whose encoding can't be read (e.g. Ollama image bytes)
+IMAGE_TOKEN_ESTIMATE = 1500
+CHARS_PER_TOKEN = 4
+
+OMITTED_IMAGE_PREFIX = "[Earlier screenshot omitted]"
+SUMMARY_PREFIX = "Summary of earlier steps:"
+
+
+@dataclass(frozen=True)
+class HistoryPolicy:
+    """
+    Attributes:
+        max_images: Screenshots kept, newest first (at least 1)
+        token_budget: Estimated request tokens to stay under (0 disables the budget)
+    """
+
+    max_images: int = DEFAULT_MAX_IMAGES
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+
+
+def _is_image_part(part) -> bool:
+    return isinstance(part, dict) and part.get("type") in ("image_url", "image")
+
+
+def _image_count(message: Dict) -> int:
+    count = len(message.get("images") or [])
+    content = message.get("content")
+    if isinstance(content, list):
+        count += sum(1 for part in content if _is_image_part(part))
+    return count
+
+
+def _image_tokens(message: Dict) -> int:
+    """Vision tokens of a message's screenshots, from their encoded size where possible"""
+    total = len(message.get("images") or []) * IMAGE_TOKEN_ESTIMATE
+    content = message.get("content")
+    if isinstance(content, list):
+        for part in content:
+            if _is_image_part(part):
+                tokens = estimate_part_tokens(part)
+                total += IMAGE_TOKEN_ESTIMATE if tokens is None else tokens
+    return total
+
+
+def _text_of(message: Dict) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "") for part in content if isinstance(part, dict) and part.get("type") == "text"
+        )
+    return ""
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """Rough token count of a message list (text by length, images by a fixed estimate)"""
+    total = 0
+    for message in messages:
+        total += len(_text_of(message)) // CHARS_PER_TOKEN + 4
+        total += _image_tokens(message)
+    return total
+
+
+def summarize_actions(content) -> str:
+    """One line describing the operations in an assistant reply"""
+    try:
+        operations = json.loads(content) if isinstance(content, str) else content
+    except (TypeError, ValueError):
+        return str(content)[:200]
+    if isinstance(operations, dict):
+        operations = [operations]
+    if not isinstance(operations, list):
+        return str(content)[:200]
+
+    actions = []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            continue
+        name = operation.get("operation", "?")
+        if name == "click":
+            target = operation.get("text") or operation.get("label")
+            if target is None and "x" in operation:
+                target = f"{operation.get('x')}, {operation.get('y')}"
+            actions.append(f"click {target!r}" if isinstance(target, str) else f"click ({target})")
+        elif name == "write":
+            actions.append(f"write {operation.get('content', '')!r}")
+        elif name == "press":
+            actions.append(f"press {'+'.join(map(str, operation.get('keys', [])))}")
+        elif name == "done":
+            actions.append("done")
+        else:
+            actions.append(name)
+    return "; ".join(actions) or "no action"
+
+
+def _turns(messages: List[Dict]) -> List[List[int]]:
+    """Group message indexes after the system message into turns starting with a user message"""
+    turns = []
+    for index in range(1, len(messages)):
+        if messages[index].get("role") == "user" or not turns:
+            turns.append([index])
+        else:
+            turns[-1].append(index)
+    return turns
+
+
+def _describe_turn(messages: List[Dict], turn: List[int], next_user: Dict = None) -> str:
+    replies = [messages[index] for index in turn if messages[index].get("role") == "assistant"]
+    actions = "; ".join(summarize_actions(reply.get("content")) for reply in replies) or "no reply"
+    description = f"you did: {actions}"
+    if next_user is not None:
+        unchanged = _text_of(next_user).strip() == get_user_no_change_prompt().strip()
+        description += " (the screen did not change)" if unchanged else " (the screen changed)"
+    return description
+
+
+def _strip_images(message: Dict, note: str):
+    """Replace the screenshot(s) of a user message with a text note"""
+    if message.get("images"):
+        message["images"] = None
+    content = message.get("content")
+    if isinstance(content, list):
+        message["content"] = [
+            {"type": "text", "text": f"{OMITTED_IMAGE_PREFIX} {note}"} if _is_image_part(part) else part
+            for part in content
+        ]
+    elif isinstance(content, str):
+        message["content"] = f"{OMITTED_IMAGE_PREFIX} {note}\n{content}"
+
+
+def _pop_summary(message: Dict) -> List[str]:
+    """Remove a summary added by `_prepend_summary`, returning its lines"""
+    content = message.get("content")
+    if isinstance(content, str):
+        if not content.startswith(SUMMARY_PREFIX):
+            return []
+        lines = content.split("\n")
+        summary = [line for line in lines[1:] if line.startswith("- ")]
+        message["content"] = "\n".join(lines[1 + len(summary):])
+        return summary
+    if content and isinstance(content[0], dict) and content[0].get("text", "").startswith(SUMMARY_PREFIX):
+        message["content"] = content[1:]
+        return content[0]["text"].split("\n")[1:]
+    return []
+
+
+def _prepend_summary(message: Dict, lines: List[str]):
+    """Add (or extend) the summary of dropped steps at the start of a user message"""
+    lines = _pop_summary(message) + lines
+    text = SUMMARY_PREFIX + "\n" + "\n".join(lines)
+    content = message.get("content")
+    if isinstance(content, str):
+        message["content"] = text + "\n" + content
+    else:
+        message["content"] = [{"type": "text", "text": text}] + list(content or [])
+
+
+def copy_history(messages: List[Dict]) -> List[Dict]:
+    """
+    Copy of a history that can be extended and compacted without touching `messages`
+
+    `compact_history` rewrites the message dicts it compacts, so concurrent
+    (hedged) or successive (fallback) attempts each need their own dicts.
+    """
+    copied = []
+    for message in messages:
+        message = dict(message)
+        if isinstance(message.get("content"), list):
+            message["content"] = [dict(part) if isinstance(part, dict) else part for part in message["content"]]
+        if message.get("images"):
+            message["images"] = list(message["images"])
+        copied.append(message)
+    return copied
+
+
+def compact_history(messages: List[Dict], policy: HistoryPolicy = None) -> Dict[str, int]:
+    """
+    Compact `messages` in place according to `policy`
+
+    Args:
+        messages: Conversation, `messages[0]` being the system message
+        policy: History policy, defaults to the configured one
+
+    Returns:
+        dict: Images stripped, turns dropped and the estimated tokens before / after
+    """
+    policy = policy or HistoryPolicy()
+    report = {"images_stripped": 0, "turns_dropped": 0, "tokens_before": estimate_tokens(messages)}
+    turns = _turns(messages)
+
+    # 1. keep only the newest screenshots
+    seen_images = 0
+    for position in range(len(turns) - 1, -1, -1):
+        user = messages[turns[position][0]]
+        images = _image_count(user)
+        if not images:
+            continue
+        if seen_images >= max(1, policy.max_images):
+            next_user = messages[turns[position + 1][0]] if position + 1 < len(turns) else None
+            _strip_images(user, "After it " + _describe_turn(messages, turns[position], next_user) + ".")
+            report["images_stripped"] += images
+        seen_images += images
+
+    # 2. fold the oldest steps into a summary while over the token budget
+    if policy.token_budget > 0:
+        # a "no change" step refers back to the newest screenshot, never drop it
+        with_images = [messages[turn[0]] for turn in turns if _image_count(messages[turn[0]])]
+        newest_image = with_images[-1] if with_images else None
+        dropped_lines = []
+        while (
+            len(turns) > 1
+            and messages[turns[0][0]] is not newest_image
+            and estimate_tokens(messages) > policy.token_budget
+        ):
+            oldest = turns.pop(0)
+            next_user = messages[turns[0][0]]
+            # an earlier summary lives in the message being dropped, carry it over
+            dropped_lines.extend(_pop_summary(messages[oldest[0]]))
+            dropped_lines.append(f"- {_describe_turn(messages, oldest, next_user)}")
+            for index in reversed(oldest):
+                del messages[index]
+            # indexes after the removed turn moved down
+            turns = [[index - len(oldest) for index in turn] for turn in turns]
+            report["turns_dropped"] += 1
+        if dropped_lines:
+            _prepend_summary(messages[turns[0][0]], dropped_lines)
+
+    report["tokens_after"] = estimate_tokens(messages)
+    if config.verbose and (report["images_stripped"] or report["turns_dropped"]):
+        print("[compact_history]", report)
+    return report
@@ -0,0 +1,415 @@
+"""
+Provider-aware screenshot encoding
+
+Every provider downsizes screenshots to its own limits and bills vision
+tokens by its own rule, so pixels beyond what it keeps only cost upload and
+encoding time. `encode_image` prepares a screenshot for one provider:
+
+- resolution: the largest size the provider keeps (never upscaled), reduced
+  further until the token and byte budgets are met
+- format: palette PNG for flat, text-heavy screens (crisp text in a small
+  file), otherwise JPEG (or WebP) at the highest quality step that fits the
+  byte budget
+- resampling: `Image.reduce` for the integer part of the downscale, then
+  BILINEAR for the rest
+
+Token rules (`PROFILES`):
+- openai: fit in 2048x2048, shortest side at most 768, 85 + 170 per 512px tile
+- anthropic: long edge at most 1568 and about 1.15 megapixels, w * h / 750
+- qwen: sides floored to 28px patches, one token per patch, at most 1280 patches
+- google: 258 tokens per 768x768 tile
+- ollama: llava any-resolution, 576 tokens per 336px view (a base view plus
+  up to 4 tiles)
+
+Encodings are cached per frame (as long as the frame is alive), so the
+hedged and fallback requests of a step reuse them.
+
+Configuration:
+- OPERATE_IMAGE_MAX_BYTES: encoded size per screenshot (default 1000000)
+- OPERATE_IMAGE_MAX_TOKENS: vision tokens per screenshot (default 0, the
+  provider's own limit)
+- OPERATE_IMAGE_FORMAT: auto, jpeg, webp or png (default auto). png is a
+  palette PNG for flat screens and a full color PNG otherwise; when that
+  doesn't fit the byte budget JPEG is used as with auto
+- OPERATE_IMAGE_QUALITY: highest JPEG / WebP quality tried (default 85)
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import math
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from PIL import Image
+
+from operate.config import Config
+from operate.utils.frame import Frame
+
+# Load configuration
+config = Config()
+
+DEFAULT_MAX_BYTES = int(os.getenv("OPERATE_IMAGE_MAX_BYTES", "1000000"))
+DEFAULT_MAX_TOKENS = int(os.getenv("OPERATE_IMAGE_MAX_TOKENS", "0"))
+DEFAULT_FORMAT = os.getenv("OPERATE_IMAGE_FORMAT", "auto").lower()
+DEFAULT_QUALITY = int(os.getenv("OPERATE_IMAGE_QUALITY", "85"))
+
+IMAGE_FORMATS = ("auto", "jpeg", "webp", "png")
+QUALITY_STEPS = (85, 75, 65, 50)
+MEDIA_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+# flat screens: the 256 most frequent colors of a sample cover this share of it
+PALETTE_COVERAGE = 0.9
+PALETTE_SAMPLE = 320
+# each budget step shrinks both sides by this factor
+BUDGET_STEP = 0.85
+MIN_LONG_SIDE = 512
+# token estimates of message images, by digest of their base64 data
+TOKEN_CACHE_SIZE = 32
+
+
+def _tiles(width: int, height: int, tile: int) -> int:
+    return math.ceil(width / tile) * math.ceil(height / tile)
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """
+    What a provider does with an image
+
+    Attributes:
+        tokens: Vision tokens billed for an image of (width, height), once
+            it fits the limits below
+        max_long_side: Longest side the provider keeps (0: no limit)
+        max_short_side: Shortest side the provider keeps (0: no limit)
+        max_pixels: Pixel count the provider keeps (0: no limit)
+        patch: Sides are floored to a multiple of this
+        max_bytes: Hard size limit of one image
+        formats: Formats the provider accepts
+    """
+
+    tokens: Callable[[int, int], int]
+    max_long_side: int = 0
+    max_short_side: int = 0
+    max_pixels: int = 0
+    patch: int = 1
+    max_bytes: int = 20_000_000
+    formats: Tuple[str, ...] = ("JPEG", "WEBP", "PNG")
+
+    def fit(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Size the provider would scale `size` down to (never up)"""
+        width, height = size
+        scale = 1.0
+        if self.max_long_side:
+            scale = min(scale, self.max_long_side / max(width, height))
+        if self.max_short_side:
+            scale = min(scale, self.max_short_side / min(width, height))
+        if self.max_pixels:
+            scale = min(scale, math.sqrt(self.max_pixels / (width * height)))
+        width, height = max(1, int(width * scale)), max(1, int(height * scale))
+        if self.patch > 1:
+            width = max(self.patch, width // self.patch * self.patch)
+            height = max(self.patch, height // self.patch * self.patch)
+        return width, height
+
+
+PROFILES: Dict[str, ImageProfile] = {
+    "openai": ImageProfile(
+        tokens=lambda width, height: 85 + 170 * _tiles(width, height, 512),
+        max_long_side=2048,
+        max_short_side=768,
+    ),
+    "anthropic": ImageProfile(
+        tokens=lambda width, height: math.ceil(width * height / 750),
+        max_long_side=1568,
+        max_pixels=1_150_000,
+        # 5MB once base64 encoded
+        max_bytes=3_750_000,
+    ),
+    "qwen": ImageProfile(
+        tokens=lambda width, height: (width // 28) * (height // 28),
+        max_pixels=1280 * 28 * 28,
+        patch=28,
+        max_bytes=10_000_000,
+    ),
+    "google": ImageProfile(
+        tokens=lambda width, height: 258 * _tiles(width, height, 768),
+        max_long_side=3072,
+    ),
+    "ollama": ImageProfile(
+        tokens=lambda width, height: 576 * (1 + min(4, _tiles(width, height, 672))),
+        max_long_side=1344,
+        formats=("JPEG", "PNG"),
+    ),
+}
+
+
+def image_tokens(size: Tuple[int, int], provider: str) -> int:
+    """Vision tokens `provider` bills for an image of `size`"""
+    profile = PROFILES[provider]
+    return profile.tokens(*profile.fit(size))
+
+
+@dataclass
+class EncodedImage:
+    """
+    A screenshot encoded for one provider
+
+    Attributes:
+        data: Encoded image
+        media_type: MIME type of `data`
+        size: (width, height) sent
+        source_size: (width, height) of the screenshot
+        tokens: Vision tokens the provider bills for it
+        encode_time: Seconds spent resizing and encoding
+    """
+
+    data: bytes
+    media_type: str
+    size: Tuple[int, int]
+    source_size: Tuple[int, int]
+    tokens: int
+    encode_time: float = field(default=0.0, compare=False)
+
+    @cached_property
+    def base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.media_type};base64,{self.base64}"
+
+
+def resize(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    """Fast downscale: `reduce` by the integer factor, BILINEAR for the rest"""
+    if image.size == size:
+        return image
+    return image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def is_flat(image: Image.Image) -> bool:
+    """Whether a screen is mostly flat color (UI and text), so a 256 color palette keeps it intact"""
+    scale = PALETTE_SAMPLE / max(image.size)
+    sample = image
+    if scale < 1:
+        sample = image.resize(
+            (max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.Resampling.NEAREST
+        )
+    pixels = sample.width * sample.height
+    colors = sample.getcolors(maxcolors=pixels)
+    if colors is None:
+        return False
+    top = sorted((count for count, _ in colors), reverse=True)[:256]
+    return sum(top) >= PALETTE_COVERAGE * pixels
+
+
+def _encode(image: Image.Image, image_format: str, quality: int = None, palette: bool = True) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "PNG" and palette:
+        image.quantize(256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE).save(buffer, format="PNG")
+    elif image_format == "PNG":
+        image.save(buffer, format="PNG")
+    elif image_format == "WEBP":
+        image.save(buffer, format="WEBP", quality=quality, method=2)
+    else:
+        image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class ImageEncoder:
+    """Encodes screenshots within a provider's limits and the configured budgets"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        image_format: str = DEFAULT_FORMAT,
+        quality: int = DEFAULT_QUALITY,
+    ):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format '{image_format}', expected one of {IMAGE_FORMATS}")
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.image_format = image_format
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._cache: "weakref.WeakKeyDictionary[Frame, Dict[tuple, EncodedImage]]" = weakref.WeakKeyDictionary()
+        self._stats = {
+            "encoded": 0,
+            "cache_hits": 0,
+            "bytes": 0,
+            "tokens": 0,
+            "encode_time": 0.0,
+            "formats": {},
+        }
+
+    def _candidates(self, profile: ImageProfile, flat: bool):
+        """(format, quality) pairs to try, best first"""
+        if self.image_format == "png" or (self.image_format == "auto" and flat):
+            yield "PNG", None
+        lossy = "WEBP" if self.image_format == "webp" and "WEBP" in profile.formats else "JPEG"
+        for quality in QUALITY_STEPS:
+            if quality <= self.quality:
+                yield lossy, quality
+        if self.quality < QUALITY_STEPS[-1]:
+            yield lossy, self.quality
+
+    def target_size(self, size: Tuple[int, int], profile: ImageProfile, max_tokens: int) -> Tuple[int, int]:
+        """Largest size the provider keeps that stays within `max_tokens`"""
+        width, height = profile.fit(size)
+        while max_tokens and profile.tokens(width, height) > max_tokens and max(width, height) > MIN_LONG_SIDE:
+            width, height = profile.fit((int(width * BUDGET_STEP), int(height * BUDGET_STEP)))
+        return width, height
+
+    def encode(
+        self,
+        image: Union[Frame, Image.Image],
+        provider: str,
+        max_bytes: int = None,
+        max_tokens: int = None,
+    ) -> EncodedImage:
+        """
+        Encode a screenshot for `provider`
+
+        Args:
+            image: Frame (its encodings are cached) or PIL image (e.g. a labeled copy)
+            provider: Key of `PROFILES`
+            max_bytes: Byte budget, defaults to the configured one
+            max_tokens: Vision token budget, defaults to the configured one (0: provider limit)
+
+        Returns:
+            EncodedImage: The smallest resize of the best format that meets the budgets
+                (at `MIN_LONG_SIDE` the budget may be exceeded rather than shrink further)
+        """
+        profile = PROFILES[provider]
+        max_bytes = min(self.max_bytes if max_bytes is None else max_bytes, profile.max_bytes)
+        max_tokens = self.max_tokens if max_tokens is None else max_tokens
+        key = (provider, max_bytes, max_tokens, self.image_format, self.quality)
+
+        frame = image if isinstance(image, Frame) else None
+        if frame is not None:
+            with self._lock:
+                cached = self._cache.get(frame, {}).get(key)
+                if cached is not None:
+                    self._stats["cache_hits"] += 1
+                    return cached
+            image = frame.image
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        start_time = time.time()
+        size = self.target_size(image.size, profile, max_tokens)
+        flat = self.image_format in ("auto", "png") and is_flat(image)
+        while True:
+            resized = resize(image, size)
+            for image_format, quality in self._candidates(profile, flat):
+                data = _encode(resized, image_format, quality, palette=flat)
+                if len(data) <= max_bytes:
+                    break
+            if len(data) <= max_bytes or max(size) <= MIN_LONG_SIDE:
+                break
+            size = profile.fit((int(size[0] * BUDGET_STEP), int(size[1] * BUDGET_STEP)))
+
+        encoded = EncodedImage(
+            data=data,
+            media_type=MEDIA_TYPES[image_format],
+            size=resized.size,
+            source_size=image.size,
+            tokens=profile.tokens(*resized.size),
+            encode_time=time.time() - start_time,
+        )
+        with self._lock:
+            self._stats["encoded"] += 1
+            self._stats["bytes"] += len(encoded.data)
+            self._stats["tokens"] += encoded.tokens
+            self._stats["encode_time"] += encoded.encode_time
+            self._stats["formats"][image_format] = self._stats["formats"].get(image_format, 0) + 1
+            if frame is not None:
+                self._cache.setdefault(frame, {})[key] = encoded
+        if config.verbose:
+            print(
+                f"[ImageEncoder] {provider}: {image.size[0]}x{image.size[1]} -> {encoded.size[0]}x{encoded.size[1]} "
+                f"{image_format}{'' if quality is None else f' q{quality}'}, {len(encoded.data) / 1024:.0f}KB, "
+                f"~{encoded.tokens} tokens in {encoded.encode_time * 1000:.0f}ms"
+            )
+        return encoded
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["formats"] = dict(self._stats["formats"])
+        if stats["encoded"]:
+            stats["mean_bytes"] = stats["bytes"] / stats["encoded"]
+            stats["mean_tokens"] = stats["tokens"] / stats["encoded"]
+            stats["mean_encode_time"] = stats["encode_time"] / stats["encoded"]
+        return stats
+
+
+# Global instance
+image_encoder = ImageEncoder()
+
+
+def encode_image(image, provider: str, max_bytes: int = None, max_tokens: int = None) -> EncodedImage:
+    """Encode a screenshot for `provider` with the global encoder"""
+    return image_encoder.encode(image, provider, max_bytes, max_tokens)
+
+
+async def encode_image_async(image, provider: str, max_bytes: int = None, max_tokens: int = None) -> EncodedImage:
+    """`encode_image` off the event loop"""
+    return await asyncio.to_thread(image_encoder.encode, image, provider, max_bytes, max_tokens)
+
+
+def estimate_part_tokens(part: Dict) -> Optional[int]:
+    """
+    Vision tokens of an image part of a message, from its encoded size
+
+    Only the image header is read. `image_url` parts are estimated with the
+    OpenAI rule and `image` parts with the Anthropic one.
+
+    Returns:
+        int: Estimated tokens, or None if the part can't be read
+    """
+    try:
+        if part.get("type") == "image_url":
+            return _encoded_tokens("openai", part["image_url"]["url"].split(",", 1)[1])
+        if part.get("type") == "image":
+            return _encoded_tokens("anthropic", part["source"]["data"])
+    except (KeyError, IndexError, AttributeError):
+        pass
+    return None
+
+
+_token_cache: "OrderedDict[Tuple[str, bytes], Optional[int]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _encoded_tokens(provider: str, data: str) -> Optional[int]:
+    # compaction estimates the same few screenshots on every request; the
+    # cache is keyed by digest so it doesn't keep the screenshots alive
+    key = (provider, hashlib.blake2b(data.encode("ascii", "replace"), digest_size=16).digest())
+    with _token_cache_lock:
+        if key in _token_cache:
+            _token_cache.move_to_end(key)
+            return _token_cache[key]
+    try:
+        with Image.open(io.BytesIO(base64.b64decode(data))) as image:
+            tokens = image_tokens(image.size, provider)
+    except Exception:
+        tokens = None
+    with _token_cache_lock:
+        _token_cache[key] = tokens
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return tokens
+
+
+def get_image_encoder_stats() -> Dict[str, Any]:
+    """Get image encoding statistics"""
+    return image_encoder.get_stats()
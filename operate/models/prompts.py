@@ -1,3 +1,5 @@
+import json
+import os
 import platform
 from operate.config import Config
 
@@ -195,6 +197,63 @@ A few important notes:
 Objective: {objective} 
 """
 
+# Compact action protocol (OPERATE_COMPACT_ACTIONS=1): one short line per
+# action and at most one rationale per response instead of a JSON object with
+# a `thought` for every operation. Responses are parsed with
+# `operate.utils.misc.parse_operations(response, compact=True)`.
+SYSTEM_PROMPT_COMPACT = """
+You are operating a {operating_system} computer, using the same operating system as a human.
+
+From looking at the screen, the objective, and your previous actions, take the next best series of actions.
+
+Answer with one action per line and nothing else:
+
+WHY one short sentence on your plan (optional, first line only)
+CLICK {click_syntax}
+TYPE "text to write"
+PRESS key [key ...]
+DONE "summary of what was completed"
+
+Example 1: Searches for Google Chrome on the OS and opens it
+WHY The terminal is focused, search the OS for Chrome
+PRESS {os_search_keys}
+TYPE "Google Chrome"
+PRESS enter
+
+Example 2: Open a new Google Docs when the browser is already open
+PRESS {cmd_key} t
+TYPE "https://docs.new/"
+PRESS enter
+
+Example 3: {click_example}
+
+A few important notes:
+
+- Default to Google Chrome as the browser
+- Go to websites by opening a new tab with PRESS and then TYPE the URL
+- Reflect on previous actions and the screenshot to ensure they align and that your previous actions worked.
+- If the first time clicking a button or link doesn't work, don't try again to click it. Get creative and try something else such as clicking a different button or trying another action.
+- Don't respond saying you're unable to assist with requests. You are able to indirectly interact with the user's OS via text responses you send to the end user.
+
+Objective: {objective}
+"""
+
+# How each prompt family points at the element to click
+COMPACT_CLICK_SYNTAX = {
+    "coordinates": (
+        "x y  (screen position as fractions of the width and height, e.g. CLICK 0.10 0.13)",
+        "Click a field at a position on the screen\nCLICK 0.42 0.08\nTYPE \"John Doe\"",
+    ),
+    "label": (
+        "~label  (the label drawn on the element, e.g. CLICK ~34)",
+        "Send a message through a labeled field\nCLICK ~34\nTYPE \"Hello World\"",
+    ),
+    "text": (
+        "\"text of the button or link\"  (CLICK \"nothing to click\" if nothing fits)",
+        "Search for someone on Linkedin when already on linkedin.com\nCLICK \"search\"\nTYPE \"John Doe\"\nPRESS enter",
+    ),
+}
+
 OPERATE_FIRST_MESSAGE_PROMPT = """
 Please take the next best action. The `pyautogui` library will be used to execute your decision. Your output will be used in a `json.loads` loads statement. Remember you only have the following 4 operations available: click, write, press, done
 
@@ -206,6 +265,43 @@ OPERATE_PROMPT = """
 Please take the next best action. The `pyautogui` library will be used to execute your decision. Your output will be used in a `json.loads` loads statement. Remember you only have the following 4 operations available: click, write, press, done
 Action:"""
 
+OPERATE_COMPACT_PROMPT = """
+Please take the next best action, one action per line. Remember you only have the following 4 actions available: CLICK, TYPE, PRESS, DONE
+Action:"""
+
+OPERATE_COMPACT_FIRST_MESSAGE_PROMPT = """
+Please take the next best action, one action per line. Remember you only have the following 4 actions available: CLICK, TYPE, PRESS, DONE
+
+You just started so you are in the terminal app and your code is running in this terminal tab. To leave the terminal, search for a new program on the OS.
+
+Action:"""
+
+OPERATE_COMPACT_NO_CHANGE_PROMPT = """
+The screen did not visibly change after your last actions, so no new screenshot is attached. The previous screenshot still shows the current screen. If an action did not have the effect you expected, try something different.
+
+Please take the next best action, one action per line. Remember you only have the following 4 actions available: CLICK, TYPE, PRESS, DONE
+Action:"""
+
+OPERATE_NO_CHANGE_PROMPT = """
+The screen did not visibly change after your last actions, so no new screenshot is attached. The previous screenshot still shows the current screen. If an action did not have the effect you expected, try something different.
+
+Please take the next best action. The `pyautogui` library will be used to execute your decision. Your output will be used in a `json.loads` loads statement. Remember you only have the following 4 operations available: click, write, press, done
+Action:"""
+
+
+def compact_actions_enabled():
+    """Whether the prompts ask for the compact action protocol (OPERATE_COMPACT_ACTIONS)"""
+    return os.getenv("OPERATE_COMPACT_ACTIONS", "0") == "1"
+
+
+def click_target(model):
+    """How the model's prompt asks it to point at the element to click"""
+    if model == "gpt-4-with-som":
+        return "label"
+    if model in ("gpt-4-with-ocr", "gpt-4.1-with-ocr", "o1-with-ocr", "claude-3", "qwen-vl"):
+        return "text"
+    return "coordinates"
+
 
 def get_system_prompt(model, objective):
     """
@@ -225,7 +321,17 @@ def get_system_prompt(model, objective):
         os_search_str = "[\"win\"]"
         operating_system = "Linux"
 
-    if model == "gpt-4-with-som":
+    if compact_actions_enabled():
+        click_syntax, click_example = COMPACT_CLICK_SYNTAX[click_target(model)]
+        prompt = SYSTEM_PROMPT_COMPACT.format(
+            objective=objective,
+            operating_system=operating_system,
+            click_syntax=click_syntax,
+            click_example=click_example,
+            cmd_key=cmd_string.strip('"'),
+            os_search_keys=" ".join(json.loads(os_search_str)),
+        )
+    elif model == "gpt-4-with-som":
         prompt = SYSTEM_PROMPT_LABELED.format(
             objective=objective,
             cmd_string=cmd_string,
@@ -258,10 +364,26 @@ def get_system_prompt(model, objective):
 
 
 def get_user_prompt():
-    prompt = OPERATE_PROMPT
+    prompt = OPERATE_COMPACT_PROMPT if compact_actions_enabled() else OPERATE_PROMPT
     return prompt
 
 
 def get_user_first_message_prompt():
+    if compact_actions_enabled():
+        return OPERATE_COMPACT_FIRST_MESSAGE_PROMPT
     prompt = OPERATE_FIRST_MESSAGE_PROMPT
     return prompt
+
+
+def get_output_reminder():
+    """Reminder appended to the user prompt of models that tend to add prose around the answer"""
+    if compact_actions_enabled():
+        return "**REMEMBER** Only output action lines, do not append any other text."
+    return "**REMEMBER** Only output json format, do not append any other text."
+
+
+def get_user_no_change_prompt():
+    if compact_actions_enabled():
+        return OPERATE_COMPACT_NO_CHANGE_PROMPT
+    prompt = OPERATE_NO_CHANGE_PROMPT
+    return prompt
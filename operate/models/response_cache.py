@@ -0,0 +1,306 @@
+"""
+Content-addressed model response store
+
+Sits between the call paths and the provider requests. A response is
+addressed by the model, a normalized copy of the message history (text
+stripped, screenshots reduced to content hashes) and the hash of the frame
+the step captured.
+
+Modes (OPERATE_RESPONSE_CACHE):
+- off: requests go to the provider (default)
+- record: requests go to the provider and every response is stored, together
+  with the frame it was made for
+- replay: responses are served from the store and nothing is sent; a request
+  that was not recorded raises `ResponseNotRecordedException`
+
+Everything after the response (OCR, labeling, click resolution, executing
+operations) still runs, so a recorded corpus can be replayed to measure
+those stages offline. With OPERATE_CAPTURE_BACKEND=replay the screen itself
+is replayed too: the backend returns the recorded frame of the step being
+replayed, so whole sessions can be rerun without a screen or network.
+
+Configuration:
+- OPERATE_RESPONSE_CACHE: off, record or replay
+- OPERATE_RESPONSE_CACHE_PATH: SQLite file (default cache/responses.sqlite)
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from PIL import Image
+
+from operate.config import Config
+from operate.exceptions import ResponseNotRecordedException
+from operate.utils.capture_backends import CaptureBackend, register_capture_backend
+from operate.utils.frame import Frame
+
+# Load configuration
+config = Config()
+
+CACHE_MODES = ("off", "record", "replay")
+DEFAULT_CACHE_MODE = os.getenv("OPERATE_RESPONSE_CACHE", "off")
+DEFAULT_CACHE_PATH = os.getenv("OPERATE_RESPONSE_CACHE_PATH", os.path.join("cache", "responses.sqlite"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    frame_hash TEXT,
+    response TEXT NOT NULL,
+    latency REAL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frames (
+    hash TEXT PRIMARY KEY,
+    png BLOB NOT NULL
+);
+"""
+
+
+def _digest(data) -> str:
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _normalize_part(part):
+    if not isinstance(part, dict):
+        return str(part).strip()
+    if part.get("type") == "image_url":
+        return {"image": _digest(part["image_url"]["url"])}
+    if part.get("type") == "image":
+        return {"image": _digest(part["source"]["data"])}
+    if part.get("type") == "text":
+        return {"text": part.get("text", "").strip()}
+    return part
+
+
+def normalize_messages(messages: List[Dict]) -> List[Dict]:
+    """Provider and formatting independent copy of a history, images replaced by their hashes"""
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = [_normalize_part(part) for part in content]
+        elif isinstance(content, str):
+            content = content.strip()
+            if message.get("role") == "assistant":
+                # streamed and complete responses format the same operations differently
+                try:
+                    content = json.dumps(json.loads(content), sort_keys=True)
+                except ValueError:
+                    pass
+        entry = {"role": message.get("role"), "content": content}
+        if message.get("images"):
+            entry["images"] = [_digest(image) for image in message["images"]]
+        normalized.append(entry)
+    return normalized
+
+
+def response_key(model: str, messages: List[Dict], frame=None) -> str:
+    """Content address of a request"""
+    payload = json.dumps(
+        {"model": model, "messages": normalize_messages(messages), "frame": frame.hash if frame is not None else None},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite backed record / replay store for model responses
+
+    Args:
+        mode: "off", "record" or "replay"
+        path: SQLite database file
+    """
+
+    def __init__(self, mode: str = DEFAULT_CACHE_MODE, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.mode = "off"
+        self._connection = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "recorded": 0, "frames_recorded": 0}
+        # replay position for the replay capture backend
+        self._replay_frames: Optional[List[str]] = None
+        self._replay_index = 0
+        self._replay_frame: Optional[Frame] = None
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown response cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.mode = mode
+        if mode != "off" and config.verbose:
+            print(f"[ResponseCache] {mode} mode, store {self.path}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the store on first use (caller holds `_lock`)"""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db().execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            self._stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def store(self, key: str, model: str, frame, response: str, latency: float = None):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, frame_hash, response, latency, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, frame.hash if frame is not None else None, response, latency, time.time()),
+            )
+            if frame is not None:
+                inserted = db.execute(
+                    "INSERT OR IGNORE INTO frames (hash, png) VALUES (?, ?)", (frame.hash, frame.png_bytes)
+                ).rowcount
+                self._stats["frames_recorded"] += inserted
+            db.commit()
+            self._stats["recorded"] += 1
+
+    def _served(self, frame):
+        """Advance the replayed screen past the step that was just answered"""
+        if frame is None or self._replay_frames is None:
+            return
+        with self._lock:
+            if self._replay_index < len(self._replay_frames) and self._replay_frames[self._replay_index] == frame.hash:
+                self._replay_index += 1
+
+    def _not_recorded(self, model: str):
+        raise ResponseNotRecordedException(model, f"No recorded response in {self.path}")
+
+    async def fetch(self, model: str, messages: List[Dict], frame, request: Callable[[], Awaitable[str]]) -> str:
+        """
+        Response text for a request, from the store or from `request`
+
+        Args:
+            model: Model name the request is sent to
+            messages: Messages of the request
+            frame: Frame the step captured (None if it has none)
+            request: Coroutine factory sending the request and returning the response text
+
+        Returns:
+            str: Response text
+
+        Raises:
+            ResponseNotRecordedException: In replay mode, if the request was not recorded
+        """
+        if not self.enabled:
+            return await request()
+        key = response_key(model, messages, frame)
+        if self.mode == "replay":
+            response = self.lookup(key)
+            if response is None:
+                self._not_recorded(model)
+            self._served(frame)
+            return response
+
+        start_time = time.time()
+        response = await request()
+        self.store(key, model, frame, response, time.time() - start_time)
+        return response
+
+    async def stream(
+        self, model: str, messages: List[Dict], frame, open_stream: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """Streaming variant of `fetch`: replays a recorded response as one delta, records a stream once it is complete"""
+        if not self.enabled:
+            async for delta in open_stream():
+                yield delta
+            return
+        key = response_key(model, messages, frame)
+        if self.mode == "replay":
+            response = self.lookup(key)
+            if response is None:
+                self._not_recorded(model)
+            self._served(frame)
+            yield response
+            return
+
+        start_time = time.time()
+        deltas = []
+        async for delta in open_stream():
+            deltas.append(delta)
+            yield delta
+        self.store(key, model, frame, "".join(deltas), time.time() - start_time)
+
+    def recorded_frames(self) -> List[str]:
+        """Hashes of the recorded frames in recording order"""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT frame_hash FROM responses WHERE frame_hash IS NOT NULL ORDER BY recorded_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def replay_frame(self) -> Optional[Frame]:
+        """Recorded frame of the step being replayed (the last one once the recording is exhausted)"""
+        if self._replay_frames is None:
+            self._replay_frames = self.recorded_frames()
+        if not self._replay_frames:
+            return None
+        frame_hash = self._replay_frames[min(self._replay_index, len(self._replay_frames) - 1)]
+        # settle sampling grabs the same step many times, decode it once
+        if self._replay_frame is not None and self._replay_frame.hash == frame_hash:
+            return self._replay_frame
+        with self._lock:
+            row = self._db().execute("SELECT png FROM frames WHERE hash = ?", (frame_hash,)).fetchone()
+        with Image.open(io.BytesIO(row[0])) as image:
+            image.load()
+            self._replay_frame = Frame(image)
+        return self._replay_frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["mode"] = self.mode
+        stats["path"] = self.path
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """Capture backend returning the recorded screen of the step being replayed"""
+
+    def grab(self) -> Frame:
+        frame = response_cache.replay_frame()
+        if frame is None:
+            raise RuntimeError(f"No recorded frames in {response_cache.path}")
+        return frame
+
+
+# Global instance
+response_cache = ResponseCache()
+register_capture_backend("replay", ReplayCaptureBackend)
+
+
+def set_response_cache_mode(mode: str):
+    """Switch the response cache between off, record and replay"""
+    response_cache.set_mode(mode)
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Get response cache statistics"""
+    return response_cache.get_stats()
@@ -0,0 +1,341 @@
+"""
+Retry policy for model requests
+
+Every provider request goes through `call_with_retry`:
+
+- transient failures (timeouts, connection errors, 408/409/429/5xx) are
+  retried with exponential backoff and full jitter, at most `max_attempts`
+  times
+- a `Retry-After` (or `retry-after-ms`) header from the provider is honoured,
+  capped at `max_delay`
+- every attempt has an explicit timeout
+- each provider has a circuit breaker: after `failure_threshold` consecutive
+  transient failures the provider is skipped for `reset_timeout` seconds, then
+  a single trial request decides whether it closes again
+
+When a model still fails (or its response can't be used), `get_next_action`
+moves on along a bounded fallback chain of other models instead of recursing.
+
+Configuration:
+- OPERATE_RETRY_ATTEMPTS: attempts per request (default 3)
+- OPERATE_RETRY_BASE_DELAY / OPERATE_RETRY_MAX_DELAY: backoff in seconds (default 0.5 / 20)
+- OPERATE_REQUEST_TIMEOUT: seconds per attempt (default 120, 0 disables)
+- OPERATE_CIRCUIT_FAILURES: consecutive failures that open a breaker (default 5)
+- OPERATE_CIRCUIT_RESET: seconds a breaker stays open (default 30)
+- OPERATE_FALLBACK_CHAIN: comma separated models tried after the requested one (default gpt-4)
+- OPERATE_MAX_FALLBACKS: fallback models tried per step (default 2)
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from operate.config import Config
+from operate.exceptions import ModelRequestFailedException
+
+# Load configuration
+config = Config()
+
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("OPERATE_RETRY_ATTEMPTS", "3"))
+DEFAULT_BASE_DELAY = float(os.getenv("OPERATE_RETRY_BASE_DELAY", "0.5"))
+DEFAULT_MAX_DELAY = float(os.getenv("OPERATE_RETRY_MAX_DELAY", "20"))
+DEFAULT_REQUEST_TIMEOUT = float(os.getenv("OPERATE_REQUEST_TIMEOUT", "120"))
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv("OPERATE_CIRCUIT_FAILURES", "5"))
+DEFAULT_RESET_TIMEOUT = float(os.getenv("OPERATE_CIRCUIT_RESET", "30"))
+DEFAULT_FALLBACK_CHAIN = os.getenv("OPERATE_FALLBACK_CHAIN", "gpt-4")
+DEFAULT_MAX_FALLBACKS = int(os.getenv("OPERATE_MAX_FALLBACKS", "2"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Attributes:
+        max_attempts: Attempts per request, including the first one
+        base_delay: Backoff before the first retry (doubled for every retry)
+        max_delay: Upper bound for a single wait, Retry-After included
+        request_timeout: Seconds per attempt (0 disables)
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth sending again"""
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    # SDK wrappers such as APIConnectionError / APITimeoutError
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay requested by the provider's `Retry-After` / `retry-after-ms` header"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed: requests pass; open: requests fail fast until `reset_timeout` has
+    passed; half_open: one trial request is let through, its outcome closes
+    or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.time() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._trial_running = False
+        if self.state == "half_open":
+            if self._trial_running:
+                return False
+            self._trial_running = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """Count a transient failure, returning True if it opened the breaker"""
+        self.failures += 1
+        self._trial_running = False
+        if self.state == "half_open" or (self.failure_threshold and self.failures >= self.failure_threshold):
+            opened = self.state != "open"
+            self.state = "open"
+            self.opened_at = time.time()
+            if opened:
+                self.open_count += 1
+            return opened
+        return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.time() - self.opened_at)) if self.state == "open" else 0.0
+
+
+class RetryEngine:
+    """
+    Runs provider requests under a `RetryPolicy` with one circuit breaker per provider
+
+    Args:
+        policy: Retry policy, defaults to the configured one
+        failure_threshold: Consecutive failures that open a provider's breaker
+        reset_timeout: Seconds a breaker stays open before a trial request
+    """
+
+    def __init__(self, policy: RetryPolicy = None, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._fallbacks = {"steps": 0, "fallbacks": 0, "exhausted": 0, "by_model": {}}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self.breakers:
+                self.breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[provider]
+
+    def _count(self, provider: str, key: str, amount: float = 1):
+        with self._lock:
+            stats = self._stats.setdefault(provider, {
+                "requests": 0, "attempts": 0, "successes": 0, "failures": 0, "retries": 0,
+                "timeouts": 0, "retry_after_waits": 0, "backoff_seconds": 0.0, "short_circuited": 0,
+            })
+            stats[key] += amount
+
+    async def call(self, provider: str, request: Callable[[], Awaitable[Any]], policy: RetryPolicy = None) -> Any:
+        """
+        Run `request` with retries
+
+        Args:
+            provider: Provider name (one circuit breaker and set of metrics each)
+            request: Callable returning a new awaitable for every attempt
+            policy: Optional policy overriding the engine's
+
+        Returns:
+            The request's result
+
+        Raises:
+            ModelRequestFailedException: If the provider's breaker is open
+            Exception: The last error once retries are exhausted, or a non-retryable error
+        """
+        policy = policy or self.policy
+        breaker = self.breaker(provider)
+        self._count(provider, "requests")
+
+        for attempt in range(1, max(1, policy.max_attempts) + 1):
+            with self._lock:
+                allowed = breaker.allow()
+            if not allowed:
+                self._count(provider, "short_circuited")
+                raise ModelRequestFailedException(
+                    provider, f"Circuit open, retrying in {breaker.retry_in():.0f}s"
+                )
+
+            self._count(provider, "attempts")
+            try:
+                if policy.request_timeout > 0:
+                    result = await asyncio.wait_for(request(), policy.request_timeout)
+                else:
+                    result = await request()
+            except Exception as e:
+                retryable = is_retryable(e)
+                if isinstance(e, asyncio.TimeoutError):
+                    self._count(provider, "timeouts")
+                opened = False
+                with self._lock:
+                    # a non-transient error (bad request, auth) still means the provider answered
+                    if retryable:
+                        opened = breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if opened:
+                    print(f"[RetryEngine] {provider} circuit opened for {breaker.reset_timeout:.0f}s")
+                if not retryable or attempt >= policy.max_attempts or breaker.state == "open":
+                    self._count(provider, "failures")
+                    raise
+
+                delay = policy.backoff(attempt)
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    self._count(provider, "retry_after_waits")
+                    delay = max(delay, retry_after)
+                delay = min(delay, policy.max_delay)
+                self._count(provider, "retries")
+                self._count(provider, "backoff_seconds", delay)
+                if config.verbose:
+                    print(f"[RetryEngine] {provider} attempt {attempt} failed ({type(e).__name__}: {e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            with self._lock:
+                breaker.record_success()
+            self._count(provider, "successes")
+            return result
+
+    def fallback_chain(self, model: str, chain: str = None, max_fallbacks: int = None) -> List[str]:
+        """
+        Models to try for one step: `model` first, then the configured fallbacks
+
+        Args:
+            model: Requested model
+            chain: Comma separated fallback models (default OPERATE_FALLBACK_CHAIN)
+            max_fallbacks: Fallback models tried at most (default OPERATE_MAX_FALLBACKS)
+        """
+        chain = DEFAULT_FALLBACK_CHAIN if chain is None else chain
+        max_fallbacks = DEFAULT_MAX_FALLBACKS if max_fallbacks is None else max_fallbacks
+        fallbacks = []
+        for name in chain.split(","):
+            name = name.strip()
+            if name and name != model and name not in fallbacks:
+                fallbacks.append(name)
+        return [model] + fallbacks[:max(0, max_fallbacks)]
+
+    def record_step(self, model: str, used: Optional[str]):
+        """Record which model of the chain answered a step (None if all failed)"""
+        with self._lock:
+            self._fallbacks["steps"] += 1
+            if used is None:
+                self._fallbacks["exhausted"] += 1
+            elif used != model:
+                self._fallbacks["fallbacks"] += 1
+                key = f"{model}->{used}"
+                self._fallbacks["by_model"][key] = self._fallbacks["by_model"].get(key, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "providers": {provider: dict(stats) for provider, stats in self._stats.items()},
+                "breakers": {
+                    provider: {"state": breaker.state, "failures": breaker.failures, "opened": breaker.open_count}
+                    for provider, breaker in self.breakers.items()
+                },
+                "fallbacks": {**self._fallbacks, "by_model": dict(self._fallbacks["by_model"])},
+            }
+
+    def reset(self):
+        """Close all breakers and clear the metrics (useful for testing)"""
+        with self._lock:
+            self.breakers.clear()
+            self._stats.clear()
+            self._fallbacks = {"steps": 0, "fallbacks": 0, "exhausted": 0, "by_model": {}}
+
+
+# Global instance
+retry_engine = RetryEngine()
+
+
+async def call_with_retry(provider: str, request: Callable[[], Awaitable[Any]]) -> Any:
+    """Convenience function to run a provider request through the global retry engine"""
+    return await retry_engine.call(provider, request)
+
+
+def get_retry_stats() -> Dict[str, Any]:
+    """Get retry, circuit breaker and fallback statistics"""
+    return retry_engine.get_stats()
+
+
+def reset_retry_engine():
+    """Reset breakers and metrics (useful for testing)"""
+    retry_engine.reset()
@@ -0,0 +1,278 @@
+"""
+Operation schema
+
+The fields `operate()` needs for every operation type. Responses are
+checked against it before they are executed, e.g. to decide whether a hedged
+request produced a usable answer.
+
+The same operations are described as a JSON schema so providers can enforce
+the response format themselves: OpenAI through `response_format` (strict
+structured output) and Anthropic through a forced tool call. Both wrap the
+array in an object, `{"operations": [...]}`, since a schema root has to be an
+object.
+
+Responses that are not schema-enforced (or come from a model ignoring it) go
+through `parse_operations_response`, a tolerant parser that repairs the usual
+defects locally (fences and prose around the JSON, trailing commas, single
+quotes, Python literals, a truncated end) instead of asking the model again.
+
+Configuration:
+- OPERATE_STRUCTURED_OUTPUT: set to 0 to send requests without a response schema
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+# Fields each operation needs once the call path has resolved it
+REQUIRED_FIELDS = {
+    "click": ("x", "y"),
+    "write": ("content",),
+    "press": ("keys",),
+    "hotkey": ("keys",),
+    "done": (),
+}
+
+# How each prompt asks the model to point at the element to click
+CLICK_TARGETS = {
+    "coordinates": ("x", "y"),
+    "text": ("text",),
+    "label": ("label",),
+}
+
+OPERATIONS_TOOL_NAME = "emit_operations"
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def structured_output_enabled() -> bool:
+    """Whether requests carry the operation schema (OPERATE_STRUCTURED_OUTPUT)"""
+    return os.getenv("OPERATE_STRUCTURED_OUTPUT", "1") != "0"
+
+
+def _operation_schema(operation: str, fields: Dict[str, Dict]) -> Dict:
+    properties = {"thought": {"type": "string"}, "operation": {"type": "string", "enum": [operation]}}
+    properties.update(fields)
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def operations_schema(click: str = "text") -> Dict:
+    """
+    JSON schema of a response
+
+    Args:
+        click: Click target the prompt asks for, a key of `CLICK_TARGETS`
+
+    Returns:
+        dict: Schema of `{"operations": [...]}`, valid for strict structured output
+    """
+    string = {"type": "string"}
+    variants = [
+        _operation_schema("click", {field: string for field in CLICK_TARGETS[click]}),
+        _operation_schema("write", {"content": string}),
+        _operation_schema("press", {"keys": {"type": "array", "items": string}}),
+        _operation_schema("done", {"summary": string}),
+    ]
+    return {
+        "type": "object",
+        "properties": {"operations": {"type": "array", "items": {"anyOf": variants}}},
+        "required": ["operations"],
+        "additionalProperties": False,
+    }
+
+
+def openai_response_format(click: str = "text") -> Dict:
+    """`response_format` of an OpenAI chat completion enforcing the operation schema"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "operations", "strict": True, "schema": operations_schema(click)},
+    }
+
+
+def anthropic_operations_tool(click: str = "text") -> Dict:
+    """Anthropic tool definition and forced `tool_choice` enforcing the operation schema"""
+    return {
+        "tools": [
+            {
+                "name": OPERATIONS_TOOL_NAME,
+                "description": "Perform the next operations on the computer",
+                "input_schema": operations_schema(click),
+            }
+        ],
+        "tool_choice": {"type": "tool", "name": OPERATIONS_TOOL_NAME},
+    }
+
+
+def operation_error(operation: Any) -> Optional[str]:
+    """Why `operation` can't be executed, or None if it can"""
+    if not isinstance(operation, dict):
+        return f"operation is not an object: {operation!r}"
+    name = operation.get("operation")
+    if not isinstance(name, str) or name.lower() not in REQUIRED_FIELDS:
+        return f"unknown operation {name!r}"
+    missing = [field for field in REQUIRED_FIELDS[name.lower()] if operation.get(field) is None]
+    if missing:
+        return f"{name} is missing {', '.join(missing)}"
+    if name.lower() in ("press", "hotkey") and not isinstance(operation["keys"], list):
+        return f"{name} keys must be a list"
+    return None
+
+
+def validate_operations(operations: Any) -> List[Dict]:
+    """
+    Check a processed response before it is executed
+
+    Args:
+        operations: Operations returned by a call path
+
+    Returns:
+        list: The operations
+
+    Raises:
+        ValueError: If the response is empty or an operation can't be executed
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError(f"Expected a non-empty list of operations, got {operations!r}"[:300])
+    for operation in operations:
+        error = operation_error(operation)
+        if error:
+            raise ValueError(error)
+    return operations
+
+
+def repair_json(text: str) -> str:
+    """
+    Best effort repair of a model's JSON
+
+    Keeps the first JSON value of `text` and drops what surrounds it, turns
+    single quoted strings and Python literals into JSON, removes trailing
+    commas and closes whatever a truncated response left open. If the end is
+    beyond repair, the value is cut after the last complete object.
+
+    Args:
+        text: Response text
+
+    Returns:
+        str: Repaired JSON text (may still be invalid for badly broken input)
+    """
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [index for index in (text.find("["), text.find("{")) if index >= 0]
+    if not starts:
+        return text.strip()
+    text = text[min(starts):]
+
+    out = []
+    stack = []
+    quote = None
+    escape = False
+    # (length of `out`, open brackets) after the most recent complete object
+    last_complete = None
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if escape:
+                escape = False
+                if char == "'":
+                    # \' is not a JSON escape
+                    out.pop()
+                out.append(char)
+            elif char == "\\":
+                escape = True
+                out.append(char)
+            elif char == quote:
+                quote = None
+                out.append('"')
+            elif char == '"':
+                # double quote inside a single quoted string
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            index += 1
+            continue
+
+        if char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in "[{":
+            stack.append("]" if char == "[" else "}")
+            out.append(char)
+        elif char in "]}":
+            # drop a trailing comma
+            while out and out[-1] in " \t\r\n,":
+                out.pop()
+            if stack:
+                out.append(stack.pop())
+            if char == "}":
+                last_complete = (len(out), list(stack))
+            if not stack:
+                break
+        elif char.isalpha():
+            word = re.match(r"[A-Za-z_]+", text[index:]).group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            index += len(word)
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    if quote:
+        out.append('"')
+    candidate = "".join(out).rstrip(" \t\r\n,") + "".join(reversed(stack))
+    try:
+        json.loads(candidate)
+        return candidate
+    except ValueError:
+        if last_complete is None:
+            return candidate
+    length, open_brackets = last_complete
+    return "".join(out[:length]).rstrip(" \t\r\n,") + "".join(reversed(open_brackets))
+
+
+def unwrap_operations(value: Any) -> List[Dict]:
+    """The operations of a parsed response: a bare array, a `{"operations": [...]}` wrapper or a single operation"""
+    if isinstance(value, dict) and isinstance(value.get("operations"), list):
+        return value["operations"]
+    if isinstance(value, dict) and "operation" in value:
+        return [value]
+    if isinstance(value, list):
+        return value
+    raise ValueError(f"Expected a list of operations, got {value!r}"[:300])
+
+
+def parse_operations_response(text: str) -> List[Dict]:
+    """
+    Operations of a response, repairing malformed JSON locally
+
+    Args:
+        text: Response text
+
+    Returns:
+        list: Operations as the model wrote them
+
+    Raises:
+        ValueError: If no operations can be recovered from `text`
+    """
+    if text is None:
+        raise ValueError("Empty response")
+    try:
+        return unwrap_operations(json.loads(text))
+    except ValueError:
+        pass
+    repaired = repair_json(text)
+    try:
+        value = json.loads(repaired)
+    except ValueError as e:
+        raise ValueError(f"Response is not valid JSON and could not be repaired ({e}): {text[:200]!r}") from e
+    return unwrap_operations(value)
@@ -0,0 +1,291 @@
+"""
+Streaming model responses
+
+The models answer with a JSON array of operations. With streaming, each
+operation is handed over as soon as its object is complete in the response,
+so `operate()` can already press a key or resolve and perform a click while
+the model is still generating the rest of the array.
+
+`JSONArrayStream` is the incremental parser: it is fed text deltas and
+returns the top-level objects completed by each delta. Text before the
+array (a ```json fence, a sentence) is skipped; a bare object instead of an
+array is returned as a single operation once it is complete. Schema-enforced
+responses wrap the array in `{"operations": [...]}` (see
+`operate.models.schema`); with `wrapped=True` the parser streams the
+elements of that inner array. An element that is not valid JSON is repaired
+with `repair_json` rather than failing the step.
+
+With the compact action protocol (OPERATE_COMPACT_ACTIONS=1) the response is
+one action per line and `CompactActionStream` hands over each action as soon
+as its line ends.
+
+Configuration:
+- OPERATE_STREAMING: set to 0 to wait for the full response instead
+"""
+
+import json
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from operate.config import Config
+from operate.models.response_cache import response_cache
+from operate.models.retry import call_with_retry
+from operate.models.schema import repair_json, unwrap_operations
+from operate.utils.misc import format_compact_operations, parse_compact_line
+
+# Load configuration
+config = Config()
+
+OperationCallback = Callable[[Dict], Awaitable[None]]
+
+
+def streaming_enabled() -> bool:
+    """Whether responses are streamed and executed incrementally (OPERATE_STREAMING)"""
+    return os.getenv("OPERATE_STREAMING", "1") != "0"
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a JSON array of objects
+
+    Only the nesting depth and string state are tracked while scanning; a
+    top-level element is decoded with `json.loads` once its closing brace
+    arrives, so each object is parsed exactly once.
+
+    Args:
+        wrapped: The array is the value of an enclosing object, as in
+            `{"operations": [...]}`; everything before it is skipped
+    """
+
+    def __init__(self, wrapped: bool = False):
+        self.wrapped = wrapped
+        self.text = ""
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.finished = False
+        # depth at which a top-level element ends: 1 inside an array, 0 for a bare object
+        self.element_depth = 1
+        self.element_start: Optional[int] = None
+
+    def feed(self, delta: str) -> List[Dict]:
+        """
+        Add a text delta
+
+        Args:
+            delta: Next chunk of the response
+
+        Returns:
+            list: Objects completed by this delta, in order
+
+        Raises:
+            ValueError: If a completed element is not an operation, even once repaired
+        """
+        completed = []
+        offset = len(self.text)
+        self.text += delta
+        for index in range(offset, len(self.text)):
+            if self.finished:
+                break
+            char = self.text[index]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                    self.depth = 1
+                elif char == "{" and not self.wrapped:
+                    self.started = True
+                    self.element_depth = 0
+                    self.element_start = index
+                    self.depth = 1
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in "[{":
+                if self.depth == self.element_depth:
+                    self.element_start = index
+                self.depth += 1
+            elif char in "]}":
+                self.depth -= 1
+                if self.depth == self.element_depth and self.element_start is not None:
+                    completed.extend(self._decode(self.text[self.element_start:index + 1]))
+                    self.element_start = None
+                if self.depth <= 0:
+                    self.finished = True
+        return completed
+
+    def finish(self) -> List[Dict]:
+        """Objects completed at the end of the response (none, elements end with their brace)"""
+        return []
+
+    def _decode(self, element: str) -> List[Dict]:
+        try:
+            value = json.loads(element)
+        except json.JSONDecodeError:
+            try:
+                value = json.loads(repair_json(element))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid operation in streamed response: {e}") from e
+        if self.element_depth == 0:
+            # a bare object, possibly the wrapper of a response recorded with a schema
+            return unwrap_operations(value)
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected an operation object, got {element[:100]!r}")
+        return [value]
+
+
+class CompactActionStream:
+    """
+    Incremental parser for the compact action protocol
+
+    Every line is parsed once it is complete; the optional rationale line is
+    attached to the first action as its `thought`.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.line_start = 0
+        self.rationale: Optional[str] = None
+        self.count = 0
+
+    def feed(self, delta: str) -> List[Dict]:
+        """
+        Add a text delta
+
+        Args:
+            delta: Next chunk of the response
+
+        Returns:
+            list: Actions whose line was completed by this delta, in order
+        """
+        self.text += delta
+        completed = []
+        end = self.text.find("\n", self.line_start)
+        while end >= 0:
+            completed.extend(self._parse(self.text[self.line_start:end]))
+            self.line_start = end + 1
+            end = self.text.find("\n", self.line_start)
+        return completed
+
+    def finish(self) -> List[Dict]:
+        """The action on the last line, which has no line break after it"""
+        line, self.line_start = self.text[self.line_start:], len(self.text)
+        return self._parse(line)
+
+    def _parse(self, line: str) -> List[Dict]:
+        parsed = parse_compact_line(line)
+        if parsed is None:
+            return []
+        if "operation" not in parsed:
+            self.rationale = self.rationale or parsed["thought"]
+            return []
+        if self.rationale and not self.count:
+            parsed["thought"] = self.rationale
+        self.count += 1
+        return [parsed]
+
+
+async def _openai_deltas(client, **request) -> AsyncIterator[str]:
+    # only opening the stream is retried, operations may already run once it delivers
+    stream = await call_with_retry(
+        "openai", lambda: client.chat.completions.create(stream=True, **request)
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def _anthropic_deltas(client, **request) -> AsyncIterator[str]:
+    stream = await call_with_retry(
+        "anthropic", lambda: client.messages.create(stream=True, **request)
+    )
+    async for event in stream:
+        if event.type != "content_block_delta":
+            continue
+        # text, or the input of the forced operations tool call
+        delta = getattr(event.delta, "text", None) or getattr(event.delta, "partial_json", None)
+        if delta:
+            yield delta
+
+
+def openai_text_stream(client, frame=None, **request) -> AsyncIterator[str]:
+    """Text deltas of a streamed chat completion (recorded / replayed by the response cache)"""
+    return response_cache.stream(
+        request["model"], request["messages"], frame, lambda: _openai_deltas(client, **request)
+    )
+
+
+def anthropic_text_stream(client, frame=None, **request) -> AsyncIterator[str]:
+    """Text deltas of a streamed Anthropic message (recorded / replayed by the response cache)"""
+    key_messages = [{"role": "system", "content": request.get("system")}] + list(request["messages"])
+    return response_cache.stream(
+        request["model"], key_messages, frame, lambda: _anthropic_deltas(client, **request)
+    )
+
+
+async def stream_operations(
+    text_stream: AsyncIterator[str],
+    on_operation: OperationCallback,
+    resolve: Callable[[Dict], Awaitable[Dict]] = None,
+    label: str = "stream_operations",
+    wrapped: bool = False,
+    compact: bool = False,
+) -> Tuple[str, List[Dict]]:
+    """
+    Hand over operations while the response is still streaming
+
+    Args:
+        text_stream: Text deltas of the response
+        on_operation: Awaited with each operation, in order, as soon as it is ready
+        resolve: Optional coroutine completing an operation before it is handed
+            over (e.g. OCR click resolution)
+        label: Prefix for verbose output
+        wrapped: The response follows the operation schema, `{"operations": [...]}`
+        compact: The response uses the compact action protocol, one action per line
+
+    Returns:
+        tuple: (response text as it should go in the history, operations)
+
+    Raises:
+        ValueError: If the response contains no operation
+    """
+    parser = CompactActionStream() if compact else JSONArrayStream(wrapped=wrapped)
+    raw_operations = []
+    operations = []
+    start_time = time.time()
+
+    async def hand_over(operation):
+        if not operations and config.verbose:
+            print(f"[{label}] first operation after {time.time() - start_time:.2f}s")
+        # the history keeps the model's own operation, without resolved coordinates
+        raw_operations.append(dict(operation))
+        if resolve is not None:
+            operation = await resolve(operation)
+        operations.append(operation)
+        await on_operation(operation)
+
+    async for delta in text_stream:
+        for operation in parser.feed(delta):
+            await hand_over(operation)
+    for operation in parser.finish():
+        await hand_over(operation)
+
+    if not operations:
+        raise ValueError(f"No operation found in streamed response: {parser.text[:200]!r}")
+    if config.verbose:
+        print(f"[{label}] response complete after {time.time() - start_time:.2f}s, {len(operations)} operations")
+    if compact:
+        return format_compact_operations(raw_operations), operations
+    return json.dumps(raw_operations), operations
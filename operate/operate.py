@@ -2,6 +2,7 @@ import sys
 import os
 import time
 import asyncio
+import threading
 from prompt_toolkit.shortcuts import message_dialog
 from prompt_toolkit import prompt
 from operate.exceptions import ModelNotRecognizedException
@@ -24,6 +25,8 @@ from operate.utils.style import (
     style,
 )
 from operate.utils.operating_system import OperatingSystem
+from operate.utils.screenshot import capture_frame, frame_change_detector
+from operate.utils.settle import notify_screen_action, wait_for_screen_settle
 from operate.models.apis import get_next_action
 
 # Browser Use integration imports
@@ -37,10 +40,27 @@ except ImportError as e:
 # Load configuration
 config = Config()
 operating_system = OperatingSystem()
+_event_loop = None
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine on the session's event loop
+
+    One loop is kept for the whole session instead of `asyncio.run` per step,
+    so the async API clients and their keep-alive connections survive between
+    steps.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop.run_until_complete(coroutine)
 
 
 def main(model, terminal_prompt, voice_mode=False, verbose_mode=False, 
-         browser_agent=False, no_browser_agent=False, browser_threshold=0.6, chrome_profile_dir=None):
+         browser_agent=False, no_browser_agent=False, browser_threshold=0.6, chrome_profile_dir=None,
+         timing_profile=None):
     """
     Main function for the Self-Operating Computer with Browser Use integration.
 
@@ -53,6 +73,7 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
     - no_browser_agent: Disable Browser Use, use OCR only.
     - browser_threshold: Confidence threshold for browser detection (0.0-1.0).
     - chrome_profile_dir: Path to existing Chrome profile directory (optional).
+    - timing_profile: Screen settle timing profile (legacy, balanced, fast).
 
     Returns:
     None
@@ -62,7 +83,15 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
     # Initialize `WhisperMic`, if `voice_mode` is True
 
     config.verbose = verbose_mode
+    if timing_profile:
+        config.timing_profile = timing_profile
     config.validation(model, voice_mode)
+
+    if model == "gpt-4-with-som":
+        # Load and warm up YOLO while the objective is being entered
+        from operate.utils.yolo_manager import get_yolo_model
+
+        threading.Thread(target=get_yolo_model, name="yolo-preload", daemon=True).start()
     
     # CHROME AUTHENTICATION MANAGEMENT
     # Handle Chrome profile authentication for browser tasks
@@ -179,7 +208,7 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
                 print(f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RESET} Routing subtask to Browser Use Agent")
                 try:
                     session_id = f"browser_subtask_{i}_{int(time.time())}"
-                    result = asyncio.run(smart_task_router(subtask.description, model, session_id, chrome_profile_dir))
+                    result = run_async(smart_task_router(subtask.description, model, session_id, chrome_profile_dir))
                     
                     if result and len(result) > 0:
                         final_action = result[-1]
@@ -210,11 +239,11 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
                 while not subtask_complete and loop_count < 20 and (time.time() - start_time) < max_time:
                     try:
                         print(f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RESET} Subtask {subtask.order} - Attempt {loop_count + 1}/20")
-                        operations, subtask_session_id = asyncio.run(
-                            get_next_action(model, messages, subtask.description, subtask_session_id)
+                        operations, subtask_session_id, subtask_complete = run_async(
+                            next_action_and_operate(model, messages, subtask.description, subtask_session_id)
                         )
-                        
-                        subtask_complete = operate(operations, model)
+                        if not subtask_complete:
+                            retry_unchanged_clicks(operations, model)
                         loop_count += 1
                         
                         if subtask_complete:
@@ -266,7 +295,7 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
                     session_id = f"browser_{int(time.time())}"
                     print(f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_RESET} Starting browser automation...")
                     
-                    result = asyncio.run(smart_task_router(objective, model, session_id, chrome_profile_dir))
+                    result = run_async(smart_task_router(objective, model, session_id, chrome_profile_dir))
                     
                     # Display results
                     if result and len(result) > 0:
@@ -317,14 +346,14 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
         if config.verbose:
             print("[Self Operating Computer] loop_count", loop_count)
         try:
-            operations, session_id = asyncio.run(
-                get_next_action(model, messages, objective, session_id)
+            operations, session_id, stop = run_async(
+                next_action_and_operate(model, messages, objective, session_id)
             )
-
-            stop = operate(operations, model)
             if stop:
                 break
 
+            retry_unchanged_clicks(operations, model)
+
             loop_count += 1
             if loop_count > 10:
                 break
@@ -340,14 +369,116 @@ def main(model, terminal_prompt, voice_mode=False, verbose_mode=False,
             break
 
 
+class StreamingOperator:
+    """
+    Executes operations in order while the model response is still streaming
+
+    `submit` is the `on_operation` callback of `get_next_action`: each
+    operation is queued behind the previous one and run in a worker thread, so
+    the event loop keeps reading the stream while a key is pressed or a
+    click is performed. After a `done` operation the rest is ignored.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.submitted = []
+        self.stopped = False
+        self._tail = None
+
+    async def submit(self, operation):
+        self.submitted.append(operation)
+        self._tail = asyncio.ensure_future(self._run(self._tail, operation))
+
+    async def _run(self, previous, operation):
+        if previous is not None:
+            await previous
+        if not self.stopped:
+            self.stopped = await asyncio.to_thread(operate, [operation], self.model)
+
+    async def finish(self):
+        """Wait for the queued operations, returning True if one ended the objective"""
+        if self._tail is not None:
+            await self._tail
+        return self.stopped
+
+    def pending(self, operations):
+        """The operations that were not handed over while streaming"""
+        return [
+            operation
+            for operation in operations
+            if not any(operation is submitted for submitted in self.submitted)
+        ]
+
+
+async def next_action_and_operate(model, messages, objective, session_id):
+    """
+    Get the next operations and execute them
+
+    Streamed operations are executed as soon as they are parsed; operations
+    from a non-streaming path (or a fallback after a failed stream) are
+    executed once the response is complete.
+
+    Returns:
+    (operations, session_id, stop) where stop is True if the objective is complete.
+    """
+    operator = StreamingOperator(model)
+    try:
+        operations, session_id = await get_next_action(
+            model, messages, objective, session_id, on_operation=operator.submit
+        )
+    finally:
+        stop = await operator.finish()
+
+    if not stop:
+        stop = await asyncio.to_thread(operate, operator.pending(operations), model)
+    return operations, session_id, stop
+
+
+def retry_unchanged_clicks(operations, model):
+    """
+    Re-run a step's clicks once if the step left the screen unchanged.
+
+    A click that did not register (slow window, lost focus) is a common reason
+    for a step without visible effect, but not the only one: a click can land
+    correctly and do nothing visible, and clicking it again may toggle it back.
+    The retry is therefore opt-in (OPERATE_RETRY_CLICKS=1). The model is still
+    asked for the next step afterwards, with the screen the retry left behind.
+
+    Returns:
+    True if the clicks were retried.
+    """
+    if os.getenv("OPERATE_RETRY_CLICKS") != "1" or not frame_change_detector.enabled:
+        return False
+
+    clicks = [
+        operation
+        for operation in operations
+        if operation.get("operation", "").lower() == "click"
+    ]
+    if not clicks:
+        return False
+
+    wait_for_screen_settle()
+    frame = capture_frame()
+    if frame_change_detector.has_changed(frame):
+        return False
+
+    print(
+        f"{ANSI_GREEN}[Self-Operating Computer]{ANSI_YELLOW} Screen did not change, retrying the click locally{ANSI_RESET}"
+    )
+    frame_change_detector.record_local_retry()
+    operate(clicks, model)
+    return True
+
+
 def operate(operations, model):
     if config.verbose:
         print("[Self Operating Computer][operate]")
     for operation in operations:
         if config.verbose:
             print("[Self Operating Computer][operate] operation", operation)
-        # wait one second
-        time.sleep(1)
+        # wait for the previous operation to finish rendering
+        wait_for_screen_settle()
         operate_type = operation.get("operation").lower()
         operate_thought = operation.get("thought")
         operate_detail = ""
@@ -387,10 +518,14 @@ def operate(operations, model):
             )
             return True
 
+        notify_screen_action()
+
         print(
             f"[{ANSI_GREEN}Self-Operating Computer {ANSI_RESET}|{ANSI_BRIGHT_MAGENTA} {model}{ANSI_RESET}]"
         )
-        print(f"{operate_thought}")
+        # compact responses carry one rationale, on their first operation
+        if operate_thought:
+            print(f"{operate_thought}")
         print(f"{ANSI_BLUE}Action: {ANSI_RESET}{operate_type} {operate_detail}\n")
 
     return False
@@ -0,0 +1,192 @@
+"""
+Asynchronous debug artifact writer
+
+Debug images (labeled screenshots, detection overlays, ...) are handed to a
+background thread instead of being encoded and written on the step's
+critical path. The queue is bounded: when the writer falls behind, new
+artifacts are dropped rather than slowing the agent down. After every write
+the oldest files are pruned so the directory stays within the retention
+limits.
+
+Configuration:
+- OPERATE_LABEL_ARTIFACTS: set to 0 to disable writing label artifacts
+- OPERATE_ARTIFACT_QUEUE_SIZE: pending artifacts before new ones are dropped (default 8)
+- OPERATE_ARTIFACT_MAX_FILES: files kept per directory (default 300)
+- OPERATE_ARTIFACT_MAX_MB: total size kept per directory (default 500)
+"""
+
+import atexit
+import io
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Union
+
+from PIL import Image
+
+from operate.config import Config
+
+# Load configuration
+config = Config()
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("OPERATE_ARTIFACT_QUEUE_SIZE", "8"))
+DEFAULT_MAX_FILES = int(os.getenv("OPERATE_ARTIFACT_MAX_FILES", "300"))
+DEFAULT_MAX_MB = int(os.getenv("OPERATE_ARTIFACT_MAX_MB", "500"))
+
+# An artifact is encoded bytes, an image, or a callable producing either
+# (so expensive drawing also happens on the writer thread)
+ArtifactData = Union[bytes, Image.Image, Callable[[], Union[bytes, Image.Image]]]
+
+
+class ArtifactWriter:
+    """
+    Background writer with a bounded queue and a per-directory retention policy
+
+    Args:
+        queue_size: Maximum number of pending artifacts
+        max_files: Files kept per directory (0 for no limit)
+        max_bytes: Total bytes kept per directory (0 for no limit)
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, max_files: int = DEFAULT_MAX_FILES,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "pruned": 0, "errors": 0, "bytes_written": 0, "write_time": 0.0}
+
+    def submit(self, path: str, data: ArtifactData) -> bool:
+        """
+        Queue an artifact for writing
+
+        Args:
+            path: Destination file; images are encoded from its extension
+            data: Encoded bytes, a PIL image, or a callable returning either
+
+        Returns:
+            bool: False if the queue was full and the artifact was dropped
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((path, data))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            if config.verbose:
+                print(f"[ArtifactWriter] queue full, dropped {path}")
+            return False
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                if config.verbose:
+                    print("[ArtifactWriter] error:", e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, data: ArtifactData):
+        start_time = time.time()
+        if callable(data):
+            data = data()
+        if isinstance(data, Image.Image):
+            buffer = io.BytesIO()
+            data.save(buffer, format=Image.registered_extensions().get(os.path.splitext(path)[1].lower(), "PNG"))
+            data = buffer.getvalue()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(data)
+
+        pruned = self._prune(directory or ".")
+        with self._lock:
+            self._stats["written"] += 1
+            self._stats["pruned"] += pruned
+            self._stats["bytes_written"] += len(data)
+            self._stats["write_time"] += time.time() - start_time
+
+    def _prune(self, directory: str) -> int:
+        """Delete the oldest files until the directory is within the retention limits"""
+        if not self.max_files and not self.max_bytes:
+            return 0
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        total_bytes = sum(size for _, size, _ in entries)
+        pruned = 0
+        while entries and (
+            (self.max_files and len(entries) > self.max_files)
+            or (self.max_bytes and total_bytes > self.max_bytes)
+        ):
+            _, size, oldest = entries.pop(0)
+            try:
+                os.remove(oldest)
+            except OSError:
+                continue
+            total_bytes -= size
+            pruned += 1
+        return pruned
+
+    def flush(self, timeout: float = None):
+        """Wait until every queued artifact has been written"""
+        if timeout is None:
+            self._queue.join()
+            return
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+
+    def close(self, timeout: float = 5.0):
+        """Write what is queued (up to `timeout`) and stop the thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self.flush(timeout)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            return
+        thread.join(timeout=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+
+def label_artifacts_enabled() -> bool:
+    """Whether `draw_label_image` should write its debug images (OPERATE_LABEL_ARTIFACTS)"""
+    return os.getenv("OPERATE_LABEL_ARTIFACTS", "1") != "0"
+
+
+# Global instance
+artifact_writer = ArtifactWriter()
+atexit.register(artifact_writer.close)
+
+
+def get_artifact_stats() -> Dict[str, Any]:
+    """Get artifact writer statistics"""
+    return artifact_writer.get_stats()
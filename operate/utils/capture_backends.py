@@ -0,0 +1,234 @@
+"""
+Screen capture backends
+
+Capture goes through a small registry of backends so the fast path can keep
+one long-lived connection to the display server instead of opening a new one
+for every screenshot.
+
+Backends:
+- mss: persistent `mss` session per thread, returns the raw BGRA buffer
+- xlib: Xlib + `ImageGrab` (previous Linux path) with a single shared display
+- pyautogui: `pyautogui.screenshot()` (previous Windows path)
+- screencapture: macOS `screencapture -C` (includes the cursor)
+
+Select a backend with the OPERATE_CAPTURE_BACKEND environment variable.
+"""
+
+import atexit
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+from typing import Callable, Dict, List
+
+from operate.config import Config
+from operate.utils.frame import Frame
+
+# Load configuration
+config = Config()
+
+
+class CaptureBackend:
+    """Base class for screen capture backends"""
+
+    name = "base"
+
+    def grab(self) -> Frame:
+        raise NotImplementedError
+
+    def close(self):
+        """Release any connection or buffer held by the backend"""
+
+
+class MssCaptureBackend(CaptureBackend):
+    """
+    Persistent mss backend
+
+    mss handles are not thread safe, so one session is kept per thread. Each
+    session holds its display connection (and, with XShm capable versions of
+    mss, its shared memory segment) open for the lifetime of the process.
+
+    Args:
+        monitor_index: mss monitor to grab. Defaults to what the previous
+            platform path captured, which is also the area pyautogui maps
+            clicks over: the whole X root window (0, every monitor) on Linux
+            and the primary monitor (1) elsewhere.
+    """
+
+    name = "mss"
+
+    def __init__(self, monitor_index: int = None):
+        import mss  # noqa: F401  (fail at registration time if missing)
+
+        if monitor_index is None:
+            monitor_index = 0 if platform.system() == "Linux" else 1
+        self.monitor_index = monitor_index
+        self._local = threading.local()
+        self._sessions: List[object] = []
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import mss
+
+            session = mss.mss()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+            if config.verbose:
+                print(f"[MssCaptureBackend] opened capture session on {threading.current_thread().name}")
+        return session
+
+    def grab(self) -> Frame:
+        session = self._session()
+        shot = session.grab(session.monitors[self.monitor_index])
+        # `shot.raw` is the BGRA buffer filled by mss, handed over without a copy
+        return Frame.from_bgra(shot.raw, shot.size)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                if config.verbose:
+                    print("[MssCaptureBackend][close] error:", e)
+        self._local = threading.local()
+
+
+class XlibCaptureBackend(CaptureBackend):
+    """Xlib screen size + `ImageGrab`, reusing one display connection"""
+
+    name = "xlib"
+
+    def __init__(self):
+        import Xlib.display
+
+        self._display = Xlib.display.Display()
+
+    def grab(self) -> Frame:
+        from PIL import ImageGrab
+
+        screen = self._display.screen()
+        size = screen.width_in_pixels, screen.height_in_pixels
+        return Frame(ImageGrab.grab(bbox=(0, 0, size[0], size[1])))
+
+    def close(self):
+        if self._display is not None:
+            self._display.close()
+            self._display = None
+
+
+class PyAutoGUICaptureBackend(CaptureBackend):
+    name = "pyautogui"
+
+    def grab(self) -> Frame:
+        import pyautogui
+
+        return Frame(pyautogui.screenshot())
+
+
+class ScreencaptureBackend(CaptureBackend):
+    """macOS `screencapture`, which can only write to a file"""
+
+    name = "screencapture"
+
+    def grab(self) -> Frame:
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".png")
+        os.close(file_descriptor)
+        try:
+            # Use the screencapture utility to capture the screen with the cursor
+            subprocess.run(["screencapture", "-C", temp_path])
+            return Frame.from_file(temp_path)
+        finally:
+            os.remove(temp_path)
+
+
+_backend_factories: Dict[str, Callable[[], CaptureBackend]] = {}
+_backends: Dict[str, CaptureBackend] = {}
+_lock = threading.Lock()
+
+# Preferred backends per platform, first one that can be created wins
+_DEFAULT_BACKENDS = {
+    "Linux": ["mss", "xlib"],
+    "Windows": ["mss", "pyautogui"],
+    "Darwin": ["screencapture", "mss"],
+}
+
+
+def register_capture_backend(name: str, factory: Callable[[], CaptureBackend]):
+    """
+    Register a capture backend factory
+
+    Args:
+        name: Name used to select the backend
+        factory: Callable returning a new backend instance
+    """
+    with _lock:
+        _backend_factories[name] = factory
+        stale = _backends.pop(name, None)
+    if stale is not None:
+        stale.close()
+
+
+def get_capture_backend(name: str = None) -> CaptureBackend:
+    """
+    Get (and lazily create) a capture backend
+
+    Args:
+        name: Backend name, defaults to OPERATE_CAPTURE_BACKEND or the platform default
+
+    Returns:
+        The shared backend instance
+    """
+    name = name or os.getenv("OPERATE_CAPTURE_BACKEND")
+    if name:
+        candidates = [name]
+    else:
+        user_platform = platform.system()
+        candidates = _DEFAULT_BACKENDS.get(user_platform)
+        if not candidates:
+            raise RuntimeError(
+                f"The platform you're using ({user_platform}) is not currently supported"
+            )
+
+    with _lock:
+        errors = []
+        for candidate in candidates:
+            if candidate in _backends:
+                return _backends[candidate]
+            factory = _backend_factories.get(candidate)
+            if factory is None:
+                errors.append(f"{candidate}: not registered")
+                continue
+            try:
+                backend = factory()
+            except Exception as e:
+                errors.append(f"{candidate}: {e}")
+                continue
+            _backends[candidate] = backend
+            if config.verbose:
+                print(f"[capture_backends] using capture backend: {candidate}")
+            return backend
+
+    raise RuntimeError(f"No capture backend available ({'; '.join(errors)})")
+
+
+def close_capture_backends():
+    """Close every backend that has been created"""
+    with _lock:
+        backends = list(_backends.values())
+        _backends.clear()
+    for backend in backends:
+        backend.close()
+
+
+register_capture_backend("mss", MssCaptureBackend)
+register_capture_backend("xlib", XlibCaptureBackend)
+register_capture_backend("pyautogui", PyAutoGUICaptureBackend)
+register_capture_backend("screencapture", ScreencaptureBackend)
+
+atexit.register(close_capture_backends)
@@ -0,0 +1,136 @@
+"""
+In-memory screen frames
+
+A `Frame` wraps one screen capture and is shared by every consumer of that
+capture (LLM payloads, OCR, YOLO labeling and coordinate math). Encodings are
+computed lazily and at most once, so a step never has to write the capture to
+disk and read it back.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import time
+from functools import cached_property
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+class Frame:
+    """
+    A single captured screen image
+
+    Attributes:
+        image: RGB PIL image holding the captured pixels
+        size: (width, height) of the capture in pixels
+        captured_at: Capture timestamp (time.time())
+        raw: BGRA buffer from the capture backend, when it provided one
+    """
+
+    def __init__(self, image: Image.Image, captured_at: float = None):
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        self.image = image
+        self.size: Tuple[int, int] = image.size
+        self.captured_at = captured_at if captured_at is not None else time.time()
+        self.raw = None
+        self._jpeg_cache: Dict[int, bytes] = {}
+        self._tile_hash_cache: Dict[Tuple[int, int], List[bytes]] = {}
+
+    @classmethod
+    def from_bgra(cls, raw, size: Tuple[int, int], captured_at: float = None) -> "Frame":
+        """Wrap a raw BGRA buffer (as returned by mss), keeping the buffer itself on `raw`"""
+        image = Image.frombuffer("RGB", size, raw, "raw", "BGRX", 0, 1)
+        frame = cls(image, captured_at)
+        frame.raw = raw
+        return frame
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "Frame":
+        """Load a frame from an image file (used by file based capture tools)"""
+        with Image.open(file_path) as img:
+            img.load()
+            return cls(img)
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @cached_property
+    def array(self) -> np.ndarray:
+        """Read-only HxWx3 uint8 RGB view of the pixels (EasyOCR / YOLO input)"""
+        array = np.asarray(self.image)
+        array.flags.writeable = False
+        return array
+
+    @cached_property
+    def hash(self) -> str:
+        """Content hash of the raw pixels, stable across encodings"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.size[0]}x{self.size[1]}".encode())
+        digest.update(self.image.tobytes())
+        return digest.hexdigest()
+
+    def tile_hashes(self, grid: Tuple[int, int] = (16, 9)) -> List[bytes]:
+        """
+        Hash the frame in a grid of tiles (row-major)
+
+        Args:
+            grid: Number of (columns, rows)
+
+        Returns:
+            list: One digest per tile, comparable between frames of the same size
+        """
+        if grid not in self._tile_hash_cache:
+            columns, rows = grid
+            array = self.array
+            x_edges = np.linspace(0, self.width, columns + 1, dtype=int)
+            y_edges = np.linspace(0, self.height, rows + 1, dtype=int)
+            hashes = []
+            for y1, y2 in zip(y_edges[:-1], y_edges[1:]):
+                for x1, x2 in zip(x_edges[:-1], x_edges[1:]):
+                    tile = np.ascontiguousarray(array[y1:y2, x1:x2])
+                    hashes.append(hashlib.blake2b(tile, digest_size=8).digest())
+            self._tile_hash_cache[grid] = hashes
+        return self._tile_hash_cache[grid]
+
+    @cached_property
+    def png_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        self.image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    @cached_property
+    def png_base64(self) -> str:
+        return base64.b64encode(self.png_bytes).decode("utf-8")
+
+    def jpeg_bytes(self, quality: int = 85) -> bytes:
+        if quality not in self._jpeg_cache:
+            buffer = io.BytesIO()
+            self.image.save(buffer, format="JPEG", quality=quality)
+            self._jpeg_cache[quality] = buffer.getvalue()
+        return self._jpeg_cache[quality]
+
+    def jpeg_base64(self, quality: int = 85) -> str:
+        return base64.b64encode(self.jpeg_bytes(quality)).decode("utf-8")
+
+    def save(self, file_path: str):
+        """Write the frame to disk (debugging / evaluation only)"""
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if file_path.lower().endswith(".png") and "png_bytes" in self.__dict__:
+            with open(file_path, "wb") as file:
+                file.write(self.png_bytes)
+        else:
+            self.image.save(file_path)
+
+    def __repr__(self):
+        return f"Frame(size={self.size}, captured_at={self.captured_at:.3f})"
@@ -1,10 +1,11 @@
-import io
-import base64
 import json
+import math
 import os
 import time
 import asyncio
-from PIL import Image, ImageDraw
+from PIL import ImageDraw
+
+from operate.utils.artifacts import artifact_writer, label_artifacts_enabled
 
 
 def validate_and_extract_image_data(data):
@@ -52,90 +53,156 @@ def is_overlapping(box1, box2):
     return True
 
 
-def add_labels(base64_data, yolo_model):
-    image_bytes = base64.b64decode(base64_data)
-    image_labeled = Image.open(io.BytesIO(image_bytes))  # Corrected this line
-    image_debug = image_labeled.copy()  # Create a copy for the debug image
-    image_original = (
-        image_labeled.copy()
-    )  # Copy of the original image for base64 return
+class BoxGrid:
+    """
+    Uniform grid index over drawn boxes for overlap queries
 
-    results = yolo_model(image_labeled)
+    Each box is registered in every cell it touches, so a query only tests the
+    boxes sharing a cell with it instead of every box drawn so far. Cells are
+    computed with inclusive bounds, which keeps the results identical to
+    testing `is_overlapping` against all boxes (touching boxes overlap).
+    """
 
-    draw = ImageDraw.Draw(image_labeled)
-    debug_draw = ImageDraw.Draw(
-        image_debug
-    )  # Create a separate draw object for the debug image
-    font_size = 45
+    def __init__(self, cell_size=128):
+        self.cell_size = max(1.0, float(cell_size))
+        self.cells = {}
+        self.boxes = []
+
+    @classmethod
+    def for_boxes(cls, boxes):
+        """Grid with cells about the size of a typical box in `boxes`"""
+        if not boxes:
+            return cls()
+        sizes = sorted(max(x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes)
+        return cls(min(512, max(32, sizes[len(sizes) // 2])))
+
+    def _cells(self, box):
+        x1, y1, x2, y2 = box
+        size = self.cell_size
+        for cx in range(math.floor(x1 / size), math.floor(x2 / size) + 1):
+            for cy in range(math.floor(y1 / size), math.floor(y2 / size) + 1):
+                yield cx, cy
+
+    def overlaps(self, box):
+        """Whether `box` overlaps any box added so far"""
+        seen = set()
+        for cell in self._cells(box):
+            for index in self.cells.get(cell, ()):
+                if index not in seen:
+                    seen.add(index)
+                    if is_overlapping(box, self.boxes[index]):
+                        return True
+        return False
 
-    labeled_images_dir = "labeled_images"
-    label_coordinates = {}  # Dictionary to store coordinates
+    def add(self, box):
+        index = len(self.boxes)
+        self.boxes.append(box)
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, []).append(index)
+
+
+def detection_boxes(results):
+    """Flatten YOLO results into a list of (x1, y1, x2, y2) boxes"""
+    return [
+        tuple(det.xyxy[0].tolist())
+        for result in results
+        if hasattr(result, "boxes")
+        for det in result.boxes
+    ]
 
-    if not os.path.exists(labeled_images_dir):
-        os.makedirs(labeled_images_dir)
+
+def select_labels(boxes):
+    """
+    Greedily pick the detections that get a label: a box is kept unless it
+    overlaps a box kept before it
+
+    Returns:
+        tuple: ({label: (x1, y1, x2, y2)} for kept boxes,
+                [(counter, box)] for every detection, for the debug image)
+    """
+    label_coordinates = {}  # Dictionary to store coordinates
+    detections = []  # Every detection, for the debug image
 
     counter = 0
-    drawn_boxes = []  # List to keep track of boxes already drawn
-    for result in results:
-        if hasattr(result, "boxes"):
-            for det in result.boxes:
-                bbox = det.xyxy[0]
-                x1, y1, x2, y2 = bbox.tolist()
-
-                debug_label = "D_" + str(counter)
-                debug_index_position = (x1, y1 - font_size)
-                debug_draw.rectangle([(x1, y1), (x2, y2)], outline="blue", width=1)
-                debug_draw.text(
-                    debug_index_position,
-                    debug_label,
-                    fill="blue",
-                    font_size=font_size,
-                )
-
-                overlap = any(
-                    is_overlapping((x1, y1, x2, y2), box) for box in drawn_boxes
-                )
-
-                if not overlap:
-                    draw.rectangle([(x1, y1), (x2, y2)], outline="red", width=1)
-                    label = "~" + str(counter)
-                    index_position = (x1, y1 - font_size)
-                    draw.text(
-                        index_position,
-                        label,
-                        fill="red",
-                        font_size=font_size,
-                    )
-
-                    # Add the non-overlapping box to the drawn_boxes list
-                    drawn_boxes.append((x1, y1, x2, y2))
-                    label_coordinates[label] = (x1, y1, x2, y2)
-
-                    counter += 1
-
-    # Save the image
-    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    drawn_boxes = BoxGrid.for_boxes(boxes)  # Index of boxes already drawn
+    for box in boxes:
+        detections.append((counter, box))
 
-    output_path = os.path.join(labeled_images_dir, f"img_{timestamp}_labeled.png")
-    output_path_debug = os.path.join(labeled_images_dir, f"img_{timestamp}_debug.png")
-    output_path_original = os.path.join(
-        labeled_images_dir, f"img_{timestamp}_original.png"
-    )
+        if not drawn_boxes.overlaps(box):
+            # Add the non-overlapping box to the drawn boxes
+            drawn_boxes.add(box)
+            label_coordinates["~" + str(counter)] = box
 
-    image_labeled.save(output_path)
-    image_debug.save(output_path_debug)
-    image_original.save(output_path_original)
+            counter += 1
 
-    buffered_original = io.BytesIO()
-    image_original.save(buffered_original, format="PNG")  # I guess this is needed
-    img_base64_original = base64.b64encode(buffered_original.getvalue()).decode("utf-8")
+    return label_coordinates, detections
 
-    # Convert image to base64 for return
-    buffered_labeled = io.BytesIO()
-    image_labeled.save(buffered_labeled, format="PNG")  # I guess this is needed
-    img_base64_labeled = base64.b64encode(buffered_labeled.getvalue()).decode("utf-8")
 
-    return img_base64_labeled, label_coordinates
+def _draw_label_boxes(frame, label_coordinates, font_size):
+    image_labeled = frame.image.copy()  # Draw on a copy so the frame stays clean
+    draw = ImageDraw.Draw(image_labeled)
+
+    for label, (x1, y1, x2, y2) in label_coordinates.items():
+        draw.rectangle([(x1, y1), (x2, y2)], outline="red", width=1)
+        index_position = (x1, y1 - font_size)
+        draw.text(
+            index_position,
+            label,
+            fill="red",
+            font_size=font_size,
+        )
+    return image_labeled
+
+
+def draw_label_image(frame, label_coordinates, detections=(), font_size=45):
+    """
+    Draw `label_coordinates` on a copy of the frame, leaving the encoding to the caller
+
+    The labeled, debug (all detections) and original images are handed to
+    the background artifact writer unless OPERATE_LABEL_ARTIFACTS=0.
+
+    Returns:
+        PIL.Image.Image: The labeled image
+    """
+    image_labeled = _draw_label_boxes(frame, label_coordinates, font_size)
+    if label_artifacts_enabled():
+        save_label_artifacts(frame, image_labeled, detections, font_size)
+    return image_labeled
+
+
+def save_label_artifacts(frame, labeled_png, detections, font_size=45):
+    """
+    Queue the labeled, debug and original images for `labeled_images/`
+
+    The debug image is drawn on the writer thread. `labeled_png` is the PNG
+    already encoded for the model, or the labeled image to encode there.
+    """
+    labeled_images_dir = "labeled_images"
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+
+    def draw_debug():
+        image_debug = frame.image.copy()
+        debug_draw = ImageDraw.Draw(image_debug)
+        for counter, (x1, y1, x2, y2) in detections:
+            debug_draw.rectangle([(x1, y1), (x2, y2)], outline="blue", width=1)
+            debug_draw.text(
+                (x1, y1 - font_size),
+                "D_" + str(counter),
+                fill="blue",
+                font_size=font_size,
+            )
+        return image_debug
+
+    artifact_writer.submit(
+        os.path.join(labeled_images_dir, f"img_{timestamp}_labeled.png"), labeled_png
+    )
+    artifact_writer.submit(
+        os.path.join(labeled_images_dir, f"img_{timestamp}_debug.png"), draw_debug
+    )
+    artifact_writer.submit(
+        os.path.join(labeled_images_dir, f"img_{timestamp}_original.png"),
+        lambda: frame.png_bytes,
+    )
 
 
 def get_click_position_in_percent(coordinates, image_size):
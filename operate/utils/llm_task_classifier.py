@@ -12,7 +12,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import openai
-from openai import OpenAI
+
+from operate.config import client_registry
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -53,7 +54,8 @@ class LLMTaskClassifier:
     
     def __init__(self, api_key: str = None):
         """Initialize with OpenAI API key"""
-        self.client = OpenAI(api_key=api_key or os.getenv('OPENAI_API_KEY'))
+        # Shared with the model paths, so classification reuses their connection
+        self.client = client_registry.openai(api_key or os.getenv('OPENAI_API_KEY'))
         self.model = "gpt-4o"
         
         # System prompt for task classification
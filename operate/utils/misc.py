@@ -1,6 +1,16 @@
 import json
 import re
 
+# Verbs of the compact action protocol (see `operate.models.prompts.SYSTEM_PROMPT_COMPACT`)
+COMPACT_VERBS = {
+    "CLICK": "click",
+    "TYPE": "write",
+    "WRITE": "write",
+    "PRESS": "press",
+    "HOTKEY": "press",
+    "DONE": "done",
+}
+COMPACT_RATIONALE = ("WHY", "#")
 
 def convert_percent_to_decimal(percent):
     try:
@@ -14,7 +24,114 @@ def convert_percent_to_decimal(percent):
         return None
 
 
-def parse_operations(response):
+def _compact_string(argument):
+    """Quoted (JSON string) or bare argument of a compact action"""
+    argument = argument.strip()
+    if len(argument) >= 2 and argument[0] == argument[-1] and argument[0] in "\"'":
+        try:
+            return json.loads(argument) if argument[0] == '"' else argument[1:-1]
+        except ValueError:
+            return argument[1:-1]
+    return argument
+
+
+def parse_compact_line(line):
+    """
+    Parse one line of a compact action response
+
+    Args:
+        line: e.g. `CLICK "Sign in"`, `CLICK ~12`, `CLICK 0.10 0.13`,
+            `TYPE "hello"`, `PRESS ctrl l` or `DONE "summary"`
+
+    Returns:
+        dict: The operation, `{"thought": ...}` for the rationale line, or
+        None for a line that is not an action (blank, prose, code fence)
+    """
+    line = line.strip()
+    if not line:
+        return None
+    for marker in COMPACT_RATIONALE:
+        if line.upper().startswith(marker):
+            return {"thought": line[len(marker):].strip(" :")}
+
+    verb, _, argument = line.partition(" ")
+    operation = COMPACT_VERBS.get(verb.rstrip(":").upper())
+    if operation is None:
+        return None
+
+    if operation == "click":
+        parts = argument.split()
+        if len(parts) == 2 and all(re.fullmatch(r"\d*\.?\d+", part) for part in parts):
+            return {"operation": "click", "x": parts[0], "y": parts[1]}
+        target = _compact_string(argument)
+        if target.startswith("~"):
+            return {"operation": "click", "label": target}
+        return {"operation": "click", "text": target}
+    if operation == "write":
+        return {"operation": "write", "content": _compact_string(argument)}
+    if operation == "press":
+        keys = [key for key in re.split(r"[\s+]+", argument.strip()) if key]
+        return {"operation": "press", "keys": [_compact_string(key) for key in keys]}
+    return {"operation": "done", "summary": _compact_string(argument)}
+
+
+def format_compact_operations(operations):
+    """Write operations in the compact action protocol (the inverse of `parse_operations(..., compact=True)`)"""
+    lines = []
+    thought = next((operation.get("thought") for operation in operations if operation.get("thought")), None)
+    if thought:
+        lines.append(f"WHY {' '.join(str(thought).split())}")
+    for operation in operations:
+        name = operation.get("operation")
+        if name == "click":
+            if operation.get("label") is not None:
+                lines.append(f"CLICK {operation['label']}")
+            elif operation.get("text") is not None:
+                lines.append(f"CLICK {json.dumps(operation['text'])}")
+            else:
+                lines.append(f"CLICK {operation.get('x')} {operation.get('y')}")
+        elif name == "write":
+            lines.append(f"TYPE {json.dumps(operation.get('content', ''))}")
+        elif name in ("press", "hotkey"):
+            lines.append(f"PRESS {' '.join(operation.get('keys', []))}")
+        elif name == "done":
+            lines.append(f"DONE {json.dumps(operation.get('summary') or '')}")
+    return "\n".join(lines)
+
+
+def parse_operations(response, compact=False):
+    """
+    Parse a model response
+
+    Args:
+        response: Response text
+        compact: Parse the compact action protocol, one action per line,
+            into the operations the JSON prompts produce
+
+    Returns:
+        dict | list: `{"type": ..., "data": ...}` for the single-action
+        format, or the list of operations with `compact`
+
+    Raises:
+        ValueError: With `compact`, if the response contains no action
+    """
+    if compact:
+        operations = []
+        rationale = None
+        for line in response.splitlines():
+            parsed = parse_compact_line(line)
+            if parsed is None:
+                continue
+            if "operation" not in parsed:
+                rationale = rationale or parsed["thought"]
+                continue
+            if rationale and not operations:
+                parsed["thought"] = rationale
+            operations.append(parsed)
+        if not operations:
+            raise ValueError(f"No action found in response: {response[:200]!r}")
+        return operations
+
     if response == "DONE":
         return {"type": "DONE", "data": None}
     elif response.startswith("CLICK"):
@@ -1,51 +1,200 @@
 from operate.config import Config
-from PIL import Image, ImageDraw
+from PIL import ImageDraw
 import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
 from datetime import datetime
+from difflib import SequenceMatcher
+from functools import cached_property
+
+import numpy as np
 
 # Load configuration
 config = Config()
 
+# Matches scoring below this are treated as "not found"
+MIN_MATCH_SCORE = 0.6
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """
+    Normalize text for matching: unicode compatibility form, case folded,
+    whitespace collapsed and trimmed.
+    """
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
 
-def get_text_element(result, search_text, image_path):
+class TextIndex:
+    """
+    Searchable index over the OCR results of one frame.
+
+    Boxes are stored in a single (N, 4, 2) float32 array so centers are computed
+    for every element at once, and texts are indexed by character trigrams so
+    fuzzy lookups only score plausible candidates.
+
+    Attributes:
+        boxes (np.ndarray): (N, 4, 2) corner points of each element.
+        texts (list): Normalized text of each element.
+        confidences (np.ndarray): (N,) OCR confidence of each element.
+    """
+
+    NGRAM = 3
+
+    def __init__(self, result):
+        self.boxes = np.array(
+            [element[0] for element in result], dtype=np.float32
+        ).reshape(-1, 4, 2)
+        self.texts = [normalize_text(element[1]) for element in result]
+        self.confidences = np.array(
+            [element[2] if len(element) > 2 else 1.0 for element in result],
+            dtype=np.float32,
+        )
+        self.ngram_index = {}
+        for index, text in enumerate(self.texts):
+            for gram in self._ngrams(text):
+                self.ngram_index.setdefault(gram, set()).add(index)
+
+    def __len__(self):
+        return len(self.texts)
+
+    @classmethod
+    def _ngrams(cls, text):
+        padded = f" {text} "
+        if len(padded) <= cls.NGRAM:
+            return {padded}
+        return {padded[i : i + cls.NGRAM] for i in range(len(padded) - cls.NGRAM + 1)}
+
+    @cached_property
+    def centers(self):
+        """(N, 2) centers of the axis aligned bounding boxes"""
+        return (self.boxes.min(axis=1) + self.boxes.max(axis=1)) / 2
+
+    def _score(self, query, text):
+        if not text:
+            return 0.0
+        if text == query:
+            return 1.0
+        if query in text:
+            # the closer the element is to exactly the query, the better
+            return 0.8 + 0.15 * len(query) / len(text)
+        if text in query:
+            # OCR split the query over several elements, e.g. "Sign" for "Sign in"
+            return 0.5 + 0.3 * len(text) / len(query)
+        return 0.75 * SequenceMatcher(None, query, text).ratio()
+
+    def search(self, search_text, limit=5, min_score=MIN_MATCH_SCORE):
+        """
+        Ranked lookup of `search_text`.
+
+        Args:
+            search_text (str): Text to look for, matched case and whitespace insensitively.
+            limit (int): Maximum number of matches to return.
+            min_score (float): Matches scoring lower are dropped.
+
+        Returns:
+            list: (index, score) tuples, best match first. Ties are broken by
+            OCR confidence, then by the later element.
+        """
+        query = normalize_text(search_text)
+        if not query or not self.texts:
+            return []
+
+        candidates = set()
+        for gram in self._ngrams(query):
+            candidates.update(self.ngram_index.get(gram, ()))
+        # substring matches of very short queries may not share a padded trigram
+        if len(query) < self.NGRAM:
+            candidates.update(i for i, text in enumerate(self.texts) if query in text)
+
+        scored = []
+        for index in candidates:
+            score = self._score(query, self.texts[index])
+            if score >= min_score:
+                scored.append((index, score))
+
+        scored.sort(
+            key=lambda match: (match[1], self.confidences[match[0]], match[0]),
+            reverse=True,
+        )
+        return scored[:limit]
+
+    def best_match(self, search_text, min_score=MIN_MATCH_SCORE):
+        """Index of the best match for `search_text`, or None"""
+        matches = self.search(search_text, limit=1, min_score=min_score)
+        return matches[0][0] if matches else None
+
+    def center_percent(self, index, size):
+        """Center of element `index` as a fraction of the frame `size` (width, height)"""
+        center_x, center_y = self.centers[index] / np.array(size, dtype=np.float32)
+        return {"x": round(float(center_x), 3), "y": round(float(center_y), 3)}
+
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+_INDEX_CACHE_SIZE = 8
+
+
+def get_text_index(result):
+    """
+    Get the `TextIndex` for an OCR result list, building it on first use.
+
+    OCR results are cached per frame by the OCR manager, so repeated lookups
+    on the same frame reuse one index.
+    """
+    key = id(result)
+    with _index_cache_lock:
+        cached = _index_cache.get(key)
+        # keep a reference to `result` so its id can't be reused while cached
+        if cached is not None and cached[0] is result:
+            _index_cache.move_to_end(key)
+            return cached[1]
+
+    index = TextIndex(result)
+    with _index_cache_lock:
+        _index_cache[key] = (result, index)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def get_text_element(result, search_text, frame):
     """
     Searches for a text element in the OCR results and returns its index. Also draws bounding boxes on the image.
     Args:
         result (list): The list of results returned by EasyOCR.
         search_text (str): The text to search for in the OCR results.
-        image_path (str): Path to the original image.
+        frame (Frame): The captured frame the OCR results belong to.
 
     Returns:
-        int: The index of the element containing the search text.
+        int: The index of the best matching text element.
 
     Raises:
         Exception: If the text element is not found in the results.
     """
+    text_index = get_text_index(result)
+    matches = text_index.search(search_text)
+    found_index = matches[0][0] if matches else None
+
     if config.verbose:
         print("[get_text_element]")
         print("[get_text_element] search_text", search_text)
+        print("[get_text_element] ranked matches", matches)
         # Create /ocr directory if it doesn't exist
         ocr_dir = "ocr"
         if not os.path.exists(ocr_dir):
             os.makedirs(ocr_dir)
 
-        # Open the original image
-        image = Image.open(image_path)
+        # Draw on a copy so the shared frame stays untouched
+        image = frame.image.copy()
         draw = ImageDraw.Draw(image)
-
-    found_index = None
-    for index, element in enumerate(result):
-        text = element[1]
-        box = element[0]
-
-        if config.verbose:
+        for element in result:
             # Draw bounding box in blue
-            draw.polygon([tuple(point) for point in box], outline="blue")
-
-        if search_text in text:
-            found_index = index
-            if config.verbose:
-                print("[get_text_element][loop] found search_text, index:", index)
+            draw.polygon([tuple(point) for point in element[0]], outline="blue")
 
     if found_index is not None:
         if config.verbose:
@@ -63,13 +212,13 @@ def get_text_element(result, search_text, image_path):
     raise Exception("The text element was not found in the image")
 
 
-def get_text_coordinates(result, index, image_path):
+def get_text_coordinates(result, index, frame):
     """
     Gets the coordinates of the text element at the specified index as a percentage of screen width and height.
     Args:
         result (list): The list of results returned by EasyOCR.
         index (int): The index of the text element in the results list.
-        image_path (str): Path to the screenshot image.
+        frame (Frame): The captured frame the OCR results belong to.
 
     Returns:
         dict: A dictionary containing the 'x' and 'y' coordinates as percentages of the screen width and height.
@@ -77,24 +226,4 @@ def get_text_coordinates(result, index, image_path):
     if index >= len(result):
         raise Exception("Index out of range in OCR results")
 
-    # Get the bounding box of the text element
-    bounding_box = result[index][0]
-
-    # Calculate the center of the bounding box
-    min_x = min([coord[0] for coord in bounding_box])
-    max_x = max([coord[0] for coord in bounding_box])
-    min_y = min([coord[1] for coord in bounding_box])
-    max_y = max([coord[1] for coord in bounding_box])
-
-    center_x = (min_x + max_x) / 2
-    center_y = (min_y + max_y) / 2
-
-    # Get image dimensions
-    with Image.open(image_path) as img:
-        width, height = img.size
-
-    # Convert to percentages
-    percent_x = round((center_x / width), 3)
-    percent_y = round((center_y / height), 3)
-
-    return {"x": percent_x, "y": percent_y}
+    return get_text_index(result).center_percent(index, frame.size)
@@ -3,21 +3,413 @@ OCR Manager with optimized EasyOCR initialization
 
 This module provides a singleton pattern for EasyOCR instances while maintaining
 flexibility for different models and languages.
+
+OCR modes (OPERATE_OCR_MODE):
+- full: one `readtext` pass over the whole frame (default)
+- tiled: the frame is split into tiles and only tiles whose pixels changed
+  since the previous frame are read again
+
+Speculative OCR (OPERATE_SPECULATIVE_OCR, on by default): `prefetch` starts
+reading a frame on a background worker as soon as it is captured, so the OCR
+pass overlaps the model request and click resolution only waits for what is
+left of it.
+
+Worker pool (OPERATE_OCR_WORKERS > 0): EasyOCR readers are hosted in a
+persistent pool of worker processes that load each reader once. Frames are
+handed over through shared memory, and `read_async` lets coroutines await OCR
+without blocking the event loop or holding the GIL.
+
+OCR profiles (OPERATE_OCR_PROFILE):
+- accurate: the frame is read as captured with EasyOCR's defaults (default)
+- fast: the frame is converted to grayscale and downscaled by the smallest
+  integer factor that brings it to at most 1440px wide (2x for 1920-2880px
+  screens, 3x for 3840px) before reading, with a larger recognition batch
+  and a smaller detection canvas. Boxes are mapped back to full-resolution
+  coordinates, so callers never see the reduced image. On a 2x HiDPI screen
+  up to 2880px wide text is read at its logical size; a 3840px screen is
+  read at two thirds of it, so small text there is better served by the
+  accurate profile.
+
+Memory: every reader is charged its measured size (RSS growth while it was
+built, or the size of its Torch weights if larger). Readers are built
+concurrently; when another build overlapped, the RSS growth can't be
+attributed and only the weights are charged. A pooled reader is charged an
+estimate: the size one worker reports, times the number of workers (each
+loads its own copy). Estimated charges are listed in the stats. Evicting a
+pooled reader restarts the pool so the workers' copies are freed. Readers
+are evicted LRU first when the total exceeds OPERATE_OCR_MEMORY_BUDGET_MB, and a background
+janitor evicts readers idle for longer than OPERATE_OCR_MAX_IDLE seconds.
 """
 
+import asyncio
+import atexit
+import gc
+import hashlib
+import multiprocessing
+import os
 import threading
 import time
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
 from operate.config import Config
 
 # Global imports (will be imported only when needed)
 _easyocr = None
 _ocr_instances = {}
 _lock = threading.Lock()
+_cache_lock = threading.Lock()
+
+# Number of OCR results kept per process (one entry per frame and language set)
+DEFAULT_RESULT_CACHE_SIZE = int(os.getenv("OPERATE_OCR_CACHE_SIZE", "16"))
+
+OCR_MODES = ("full", "tiled")
+DEFAULT_OCR_MODE = os.getenv("OPERATE_OCR_MODE", "full")
+SPECULATIVE_OCR = os.getenv("OPERATE_SPECULATIVE_OCR", "1") != "0"
+DEFAULT_OCR_WORKERS = int(os.getenv("OPERATE_OCR_WORKERS", "0"))
+
+DEFAULT_OCR_PROFILE = os.getenv("OPERATE_OCR_PROFILE", "accurate")
+
+# Reader memory budget in MB (0 disables the budget) and janitor settings
+DEFAULT_MEMORY_BUDGET_MB = int(os.getenv("OPERATE_OCR_MEMORY_BUDGET_MB", "2048"))
+DEFAULT_MAX_IDLE_SECONDS = int(os.getenv("OPERATE_OCR_MAX_IDLE", "900"))
+DEFAULT_JANITOR_INTERVAL = int(os.getenv("OPERATE_OCR_JANITOR_INTERVAL", "60"))
+
+# Full-width horizontal bands by default: UI text runs horizontally, so
+# vertical tile edges would cut through words and lines
+DEFAULT_TILE_GRID = (1, 8)  # (columns, rows)
+DEFAULT_TILE_OVERLAP = 48  # pixels, must be at least half the tallest text line
 
 # Load configuration
 config = Config()
 
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unknown"""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _estimate_reader_bytes(reader) -> int:
+    """Size of the Torch weights held by an EasyOCR reader"""
+    total = 0
+    for attribute in ("detector", "recognizer"):
+        module = getattr(reader, attribute, None)
+        parameters = getattr(module, "parameters", None)
+        if parameters is None:
+            continue
+        try:
+            total += sum(p.numel() * p.element_size() for p in parameters())
+        except Exception:
+            continue
+    return total
+
+
+@dataclass(frozen=True)
+class OCRProfile:
+    """
+    Preprocessing and EasyOCR settings used for a read
+
+    Attributes:
+        name: Profile name
+        max_width: Downscale images wider than this by an integer factor (None keeps full resolution)
+        grayscale: Convert to a single channel before reading
+        readtext_options: Extra keyword arguments for `readtext` (batch_size, canvas_size, mag_ratio, ...)
+    """
+
+    name: str
+    max_width: Optional[int] = None
+    grayscale: bool = False
+    readtext_options: Dict[str, Any] = field(default_factory=dict)
+
+    def prepare(self, image: np.ndarray) -> Tuple[np.ndarray, Tuple[float, float]]:
+        """
+        Apply the profile's preprocessing to an RGB image
+
+        Returns:
+            (image to read, (x scale, y scale) mapping its coordinates back to the input)
+        """
+        height, width = image.shape[:2]
+        factor = 1
+        if self.max_width and width > self.max_width:
+            factor = -(-width // self.max_width)
+        if factor == 1 and not self.grayscale:
+            return image, (1.0, 1.0)
+
+        prepared = Image.fromarray(image)
+        if self.grayscale:
+            prepared = prepared.convert("L")
+        if factor > 1:
+            # box filter, cheap and keeps thin glyph strokes legible
+            prepared = prepared.reduce(factor)
+        return np.asarray(prepared), (width / prepared.width, height / prepared.height)
+
+    @staticmethod
+    def reproject(results: list, scale: Tuple[float, float]) -> list:
+        """Map boxes read on a prepared image back to input coordinates"""
+        if scale == (1.0, 1.0):
+            return results
+        scale_x, scale_y = scale
+        return [
+            ([[float(x) * scale_x, float(y) * scale_y] for x, y in box], text, confidence)
+            for box, text, confidence in results
+        ]
+
+
+OCR_PROFILES: Dict[str, OCRProfile] = {
+    "accurate": OCRProfile(name="accurate"),
+    "fast": OCRProfile(
+        name="fast",
+        max_width=1440,
+        grayscale=True,
+        readtext_options={"batch_size": 8, "canvas_size": 1440, "mag_ratio": 1.0},
+    ),
+}
+
+
+def get_ocr_profile(name: str = None) -> OCRProfile:
+    """Resolve an OCR profile by name (defaults to OPERATE_OCR_PROFILE)"""
+    name = name or DEFAULT_OCR_PROFILE
+    if name not in OCR_PROFILES:
+        raise ValueError(
+            f"Unknown OCR profile '{name}', expected one of {sorted(OCR_PROFILES)}"
+        )
+    return OCR_PROFILES[name]
+
+
+class ProfiledReader:
+    """
+    Wraps a reader so every `readtext` goes through an `OCRProfile`
+
+    Results are always in the coordinates of the image that was passed in.
+    """
+
+    def __init__(self, reader, profile: OCRProfile):
+        self.reader = reader
+        self.profile = profile
+
+    def readtext(self, image: np.ndarray) -> list:
+        prepared, scale = self.profile.prepare(image)
+        results = self.reader.readtext(prepared, **self.profile.readtext_options)
+        return self.profile.reproject(results, scale)
+
+    def readtext_many(self, images: List[np.ndarray]) -> List[list]:
+        if not hasattr(self.reader, "readtext_many"):
+            return [self.readtext(image) for image in images]
+        prepared = [self.profile.prepare(image) for image in images]
+        outputs = self.reader.readtext_many(
+            [image for image, _ in prepared], **self.profile.readtext_options
+        )
+        return [
+            self.profile.reproject(output, scale)
+            for output, (_, scale) in zip(outputs, prepared)
+        ]
+
+
+# Readers loaded inside an OCR worker process, keyed by language key
+_worker_readers: Dict[str, Any] = {}
+
+
+def _init_ocr_worker(preload_languages: List[List[str]]):
+    """Worker process initializer: load the EasyOCR readers once"""
+    for languages in preload_languages:
+        _get_worker_reader(languages)
+
+
+def _get_worker_reader(languages: List[str]) -> Any:
+    lang_key = "_".join(sorted(languages))
+    if lang_key not in _worker_readers:
+        import easyocr
+
+        _worker_readers[lang_key] = easyocr.Reader(languages)
+    return _worker_readers[lang_key]
+
+
+def _worker_reader_bytes(languages: List[str]) -> int:
+    """Load a reader in a worker process and report its size (executed in a worker process)"""
+    rss_before = _current_rss()
+    reader = _get_worker_reader(languages)
+    rss_after = _current_rss()
+    rss_growth = rss_after - rss_before if rss_before is not None and rss_after is not None else 0
+    return max(rss_growth, _estimate_reader_bytes(reader))
+
+
+def _worker_readtext(shm_name: str, shape: Tuple[int, ...], dtype: str, languages: List[str], options: Dict[str, Any] = None) -> list:
+    """Run `readtext` on an image held in shared memory (executed in a worker process)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        results = _get_worker_reader(languages).readtext(image, **(options or {}))
+        # the view must be released before the block can be closed
+        del image
+    finally:
+        shm.close()
+    # plain python types so the results pickle cheaply
+    return [
+        ([[float(x), float(y)] for x, y in box], text, float(confidence))
+        for box, text, confidence in results
+    ]
+
+
+class PooledReader:
+    """
+    Stand-in for an EasyOCR reader whose `readtext` runs in the worker pool
+
+    Images are copied once into a shared memory block that the worker maps
+    directly, instead of being pickled through the pool's pipe.
+
+    Args:
+        get_pool: Returns the current worker pool (the pool is restarted when
+            a pooled reader is evicted)
+        languages: Language codes of the reader
+    """
+
+    def __init__(self, get_pool: Callable[[], ProcessPoolExecutor], languages: List[str]):
+        self.get_pool = get_pool
+        self.languages = list(languages)
+
+    def memory_bytes(self) -> int:
+        """Size of the reader as loaded by a worker process"""
+        return self.get_pool().submit(_worker_reader_bytes, self.languages).result()
+
+    def submit(self, image: np.ndarray, **options) -> Future:
+        image = np.ascontiguousarray(image)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+
+        def release(_=None):
+            shm.close()
+            shm.unlink()
+
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+            future = self.get_pool().submit(
+                _worker_readtext, shm.name, image.shape, image.dtype.str, self.languages, options
+            )
+        except BaseException:
+            release()
+            raise
+
+        future.add_done_callback(release)
+        return future
+
+    def readtext(self, image: np.ndarray, **options) -> list:
+        return self.submit(image, **options).result()
+
+    def readtext_many(self, images: List[np.ndarray], **options) -> List[list]:
+        """Read several images concurrently across the worker processes"""
+        futures = [self.submit(image, **options) for image in images]
+        return [future.result() for future in futures]
+
+
+class TiledOCRState:
+    """
+    Per-tile OCR results kept between frames for incremental OCR
+
+    Each tile has a core region (the grid cell) and a read region (the core
+    grown by `overlap` pixels). Tiles are OCR'd over their read region, and a
+    detection is kept only by the tile whose core contains the detection's
+    center, so text crossing a tile edge is read whole exactly once.
+    """
+
+    def __init__(self, grid: Tuple[int, int] = DEFAULT_TILE_GRID, overlap: int = DEFAULT_TILE_OVERLAP):
+        self.grid = grid
+        self.overlap = overlap
+        self.size: Optional[Tuple[int, int]] = None
+        self.tile_hashes: Dict[int, bytes] = {}
+        self.tile_results: Dict[int, list] = {}
+        self.lock = threading.Lock()
+
+    def tile_regions(self, size: Tuple[int, int]) -> List[Tuple[Tuple[int, int, int, int], Tuple[int, int, int, int]]]:
+        """Return (core, read) regions as (x1, y1, x2, y2) for every tile, row-major"""
+        width, height = size
+        columns, rows = self.grid
+        x_edges = np.linspace(0, width, columns + 1, dtype=int)
+        y_edges = np.linspace(0, height, rows + 1, dtype=int)
+        regions = []
+        for y1, y2 in zip(y_edges[:-1], y_edges[1:]):
+            for x1, x2 in zip(x_edges[:-1], x_edges[1:]):
+                core = (int(x1), int(y1), int(x2), int(y2))
+                read = (
+                    max(0, core[0] - self.overlap),
+                    max(0, core[1] - self.overlap),
+                    min(width, core[2] + self.overlap),
+                    min(height, core[3] + self.overlap),
+                )
+                regions.append((core, read))
+        return regions
+
+    def read(self, frame, reader) -> Tuple[list, int, int]:
+        """
+        OCR the frame, re-reading only tiles that changed
+
+        Returns:
+            (results in full-frame coordinates, tiles read, tiles reused)
+        """
+        with self.lock:
+            if self.size != frame.size:
+                self.size = frame.size
+                self.tile_hashes.clear()
+                self.tile_results.clear()
+
+            array = frame.array
+            regions = self.tile_regions(frame.size)
+            dirty = []
+            for index, (core, read) in enumerate(regions):
+                x1, y1, x2, y2 = read
+                region = np.ascontiguousarray(array[y1:y2, x1:x2])
+                tile_hash = hashlib.blake2b(region, digest_size=16).digest()
+                if self.tile_hashes.get(index) != tile_hash:
+                    dirty.append((index, region, tile_hash))
+
+            # pooled readers can read all changed tiles in parallel
+            if hasattr(reader, "readtext_many"):
+                tile_outputs = reader.readtext_many([region for _, region, _ in dirty])
+            else:
+                tile_outputs = [reader.readtext(region) for _, region, _ in dirty]
+
+            for (index, _, tile_hash), output in zip(dirty, tile_outputs):
+                core, read = regions[index]
+                self.tile_results[index] = self._keep_core(output, core, read)
+                self.tile_hashes[index] = tile_hash
+
+            tiles_read = len(dirty)
+            tiles_reused = len(regions) - tiles_read
+            merged = []
+            for index in range(len(regions)):
+                merged.extend(self.tile_results[index])
+
+        # EasyOCR reports results roughly top-to-bottom, left-to-right
+        merged.sort(key=lambda element: (element[0][0][1], element[0][0][0]))
+        return merged, tiles_read, tiles_reused
+
+    @staticmethod
+    def _keep_core(output: list, core, read) -> list:
+        offset_x, offset_y = read[0], read[1]
+        results = []
+        for box, text, confidence in output:
+            box = [[float(x) + offset_x, float(y) + offset_y] for x, y in box]
+            center_x = sum(point[0] for point in box) / len(box)
+            center_y = sum(point[1] for point in box) / len(box)
+            if core[0] <= center_x < core[2] and core[1] <= center_y < core[3]:
+                results.append((box, text, confidence))
+        return results
+
+
 class OCRManager:
     """
     Singleton manager for EasyOCR instances
@@ -25,8 +417,13 @@ class OCRManager:
     Features:
     - Maintains separate instances for different language combinations
     - Thread-safe initialization
-    - Automatic cleanup and memory management
+    - Per-language locking, so building one reader doesn't block the others
+    - Memory budget with LRU eviction and a background janitor
     - Performance tracking
+    - LRU cache of OCR results keyed by frame content hash
+    - Optional tiled mode that only re-reads changed screen regions
+    - Speculative OCR of freshly captured frames on a background worker
+    - Optional out-of-process worker pool with an async interface
     """
     
     _instance = None
@@ -47,6 +444,36 @@ class OCRManager:
                     self.initialization_times: Dict[str, float] = {}
                     self.usage_counts: Dict[str, int] = {}
                     self.last_used: Dict[str, float] = {}
+                    self.result_cache: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+                    self.result_cache_size = DEFAULT_RESULT_CACHE_SIZE
+                    self.cache_hits = 0
+                    self.cache_misses = 0
+                    self.ocr_mode = DEFAULT_OCR_MODE
+                    self.ocr_profile = get_ocr_profile()
+                    self.tiled_states: Dict[str, TiledOCRState] = {}
+                    self.tile_grid = DEFAULT_TILE_GRID
+                    self.tile_overlap = DEFAULT_TILE_OVERLAP
+                    self.tiles_read = 0
+                    self.tiles_reused = 0
+                    self.speculative_enabled = SPECULATIVE_OCR
+                    self.speculative_started = 0
+                    self.speculative_hits = 0
+                    self._inflight: Dict[Tuple[str, str], Future] = {}
+                    self._executor: Optional[ThreadPoolExecutor] = None
+                    self.worker_count = DEFAULT_OCR_WORKERS
+                    self._pool: Optional[ProcessPoolExecutor] = None
+                    self._key_locks: Dict[str, threading.Lock] = {}
+                    self.reader_memory: Dict[str, int] = {}
+                    # readers whose charge is an estimate rather than a measurement
+                    self.estimated_memory: Set[str] = set()
+                    self._active_builds: List[Dict[str, bool]] = []
+                    self.memory_budget_bytes = DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+                    self.max_idle_seconds = DEFAULT_MAX_IDLE_SECONDS
+                    self.janitor_interval = DEFAULT_JANITOR_INTERVAL
+                    self.eviction_counts: Dict[str, int] = {}
+                    self.eviction_events = deque(maxlen=50)
+                    self._janitor: Optional[threading.Thread] = None
+                    self._janitor_stop = threading.Event()
                     OCRManager._initialized = True
     
     def get_reader(self, languages: List[str] = None, model_name: str = None) -> Any:
@@ -65,50 +492,430 @@ class OCRManager:
         
         # Create a unique key for this language combination
         lang_key = "_".join(sorted(languages))
-        
+
+        reader = self._lookup_reader(lang_key)
+        if reader is not None:
+            return reader
+
+        # Only callers asking for this language set wait while it is built
         with _lock:
-            # Check if we already have a reader for this language combination
-            if lang_key in self.readers:
-                # Update usage tracking
-                self.usage_counts[lang_key] = self.usage_counts.get(lang_key, 0) + 1
-                self.last_used[lang_key] = time.time()
-                
-                if config.verbose:
-                    print(f"[OCRManager] Reusing existing EasyOCR reader for {lang_key} (used {self.usage_counts[lang_key]} times)")
-                
-                return self.readers[lang_key]
-            
+            key_lock = self._key_locks.setdefault(lang_key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have built it while we were waiting
+            reader = self._lookup_reader(lang_key)
+            if reader is not None:
+                return reader
+
             # Initialize EasyOCR for the first time
             if config.verbose:
                 print(f"[OCRManager] Initializing new EasyOCR reader for languages: {languages}")
-            
+
             start_time = time.time()
-            
-            # Import EasyOCR only when needed
-            global _easyocr
-            if _easyocr is None:
-                import easyocr
-                _easyocr = easyocr
-            
-            # Create new reader instance
-            reader = _easyocr.Reader(languages)
-            
+
+            if self.worker_count > 0:
+                # EasyOCR lives in the worker processes, keep a proxy here;
+                # every worker ends up holding its own copy of the reader
+                reader = PooledReader(self._get_pool, languages)
+                memory = reader.memory_bytes() * self.worker_count
+                estimated = True
+            else:
+                # RSS growth only belongs to this reader if no other build overlapped
+                build = {"overlapped": False}
+                with _lock:
+                    for other in self._active_builds:
+                        other["overlapped"] = True
+                    build["overlapped"] = bool(self._active_builds)
+                    self._active_builds.append(build)
+                try:
+                    rss_before = _current_rss()
+
+                    # Import EasyOCR only when needed
+                    global _easyocr
+                    if _easyocr is None:
+                        import easyocr
+                        _easyocr = easyocr
+
+                    # Create new reader instance
+                    reader = _easyocr.Reader(languages)
+
+                    rss_after = _current_rss()
+                finally:
+                    with _lock:
+                        self._active_builds.remove(build)
+                estimated = build["overlapped"] or rss_before is None or rss_after is None
+                rss_growth = 0 if estimated else rss_after - rss_before
+                memory = max(rss_growth, _estimate_reader_bytes(reader))
+
             # Track initialization time
             init_time = time.time() - start_time
-            self.initialization_times[lang_key] = init_time
-            self.usage_counts[lang_key] = 1
+
+            with _lock:
+                self.initialization_times[lang_key] = init_time
+                self.usage_counts[lang_key] = 1
+                self.last_used[lang_key] = time.time()
+                self.reader_memory[lang_key] = memory
+                if estimated:
+                    self.estimated_memory.add(lang_key)
+                else:
+                    self.estimated_memory.discard(lang_key)
+
+                # Store the reader
+                self.readers[lang_key] = reader
+
+            if config.verbose:
+                print(f"[OCRManager] EasyOCR reader initialized in {init_time:.2f}s for {lang_key} ({'~' if estimated else ''}{memory / 1024 / 1024:.0f} MB)")
+
+        self._enforce_memory_budget(keep=lang_key)
+        self._start_janitor()
+        return reader
+
+    def _lookup_reader(self, lang_key: str) -> Any:
+        with _lock:
+            # Check if we already have a reader for this language combination
+            if lang_key not in self.readers:
+                return None
+
+            # Update usage tracking
+            self.usage_counts[lang_key] = self.usage_counts.get(lang_key, 0) + 1
             self.last_used[lang_key] = time.time()
-            
-            # Store the reader
-            self.readers[lang_key] = reader
-            
+
             if config.verbose:
-                print(f"[OCRManager] EasyOCR reader initialized in {init_time:.2f}s for {lang_key}")
-            
-            return reader
-    
+                print(f"[OCRManager] Reusing existing EasyOCR reader for {lang_key} (used {self.usage_counts[lang_key]} times)")
+
+            return self.readers[lang_key]
+
+    def _evict(self, lang_key: str, reason: str):
+        """Drop a reader and record why (caller holds `_lock`)"""
+        if lang_key not in self.readers:
+            return
+        idle_seconds = time.time() - self.last_used.get(lang_key, time.time())
+        memory = self.reader_memory.get(lang_key, 0)
+
+        if config.verbose:
+            print(f"[OCRManager] Evicting reader {lang_key} ({reason}, idle {idle_seconds:.0f}s, {memory / 1024 / 1024:.0f} MB)")
+
+        reader = self.readers.pop(lang_key)
+        if isinstance(reader, PooledReader) and self._pool is not None:
+            # the workers hold the reader: restart the pool (lazily, on the
+            # next read) to free it; queued reads still finish on the old one
+            pool, self._pool = self._pool, None
+            pool.shutdown(wait=False)
+        self.initialization_times.pop(lang_key, None)
+        self.usage_counts.pop(lang_key, None)
+        self.last_used.pop(lang_key, None)
+        self.reader_memory.pop(lang_key, None)
+        self.estimated_memory.discard(lang_key)
+
+        self.eviction_counts[reason] = self.eviction_counts.get(reason, 0) + 1
+        self.eviction_events.append({
+            'language': lang_key,
+            'reason': reason,
+            'memory_bytes': memory,
+            'idle_seconds': idle_seconds,
+            'time': time.time(),
+        })
+
+    def _enforce_memory_budget(self, keep: str = None) -> int:
+        """
+        Evict least recently used readers until the budget is met
+
+        Args:
+            keep: Language key that must not be evicted (the reader just built)
+
+        Returns:
+            Number of readers evicted
+        """
+        if self.memory_budget_bytes <= 0:
+            return 0
+        evicted = 0
+        with _lock:
+            while sum(self.reader_memory.values()) > self.memory_budget_bytes:
+                candidates = [key for key in self.readers if key != keep]
+                if not candidates:
+                    break
+                oldest = min(candidates, key=lambda key: self.last_used.get(key, 0))
+                self._evict(oldest, "memory_budget")
+                evicted += 1
+        if evicted:
+            gc.collect()
+        return evicted
+
+    def _start_janitor(self):
+        if self.janitor_interval <= 0:
+            return
+        with _lock:
+            if self._janitor is not None and self._janitor.is_alive():
+                return
+            self._janitor_stop.clear()
+            self._janitor = threading.Thread(
+                target=self._janitor_loop, name="ocr-janitor", daemon=True
+            )
+            self._janitor.start()
+
+    def _janitor_loop(self):
+        while not self._janitor_stop.wait(self.janitor_interval):
+            try:
+                if self.max_idle_seconds > 0:
+                    self.cleanup_unused_readers(self.max_idle_seconds, reason="idle")
+                self._enforce_memory_budget()
+            except Exception as e:
+                if config.verbose:
+                    print("[OCRManager][janitor] error:", e)
+
+    def stop_janitor(self):
+        """Stop the background eviction thread"""
+        self._janitor_stop.set()
+        janitor, self._janitor = self._janitor, None
+        if janitor is not None and janitor is not threading.current_thread():
+            janitor.join(timeout=1)
+
+    def set_memory_budget(self, budget_mb: int = None, max_idle_seconds: int = None):
+        """
+        Configure reader memory limits
+
+        Args:
+            budget_mb: Total reader memory budget in MB (0 disables it)
+            max_idle_seconds: Evict readers unused for this long (0 disables it)
+        """
+        if budget_mb is not None:
+            self.memory_budget_bytes = budget_mb * 1024 * 1024
+        if max_idle_seconds is not None:
+            self.max_idle_seconds = max_idle_seconds
+        self._enforce_memory_budget()
+
+    def read_frame(self, frame, languages: List[str] = None, model_name: str = None) -> list:
+        """
+        Run OCR on a frame, reusing the result if this frame was already read
+
+        Args:
+            frame: Frame to read
+            languages: List of language codes (default: ["en"])
+            model_name: Optional model name for tracking
+
+        Returns:
+            EasyOCR results as returned by `readtext`
+        """
+        if languages is None:
+            languages = ["en"]
+        key = (frame.hash, "_".join(sorted(languages)))
+
+        with _cache_lock:
+            if key in self.result_cache:
+                self.result_cache.move_to_end(key)
+                self.cache_hits += 1
+                if config.verbose:
+                    print(f"[OCRManager] OCR cache hit for frame {key[0][:12]}")
+                return self.result_cache[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.speculative_hits += 1
+            else:
+                self.cache_misses += 1
+
+        if future is not None:
+            if config.verbose:
+                print(f"[OCRManager] waiting for speculative OCR of frame {key[0][:12]}")
+            return future.result()
+
+        return self._read_uncached(frame, languages, model_name, key)
+
+    async def read_async(self, frame, languages: List[str] = None, model_name: str = None) -> list:
+        """
+        Awaitable `read_frame`
+
+        Cached results return immediately, an in-flight speculative pass is
+        awaited without blocking the loop, and anything else runs off the
+        event loop (in the worker pool when one is configured).
+        """
+        if languages is None:
+            languages = ["en"]
+        key = (frame.hash, "_".join(sorted(languages)))
+
+        with _cache_lock:
+            future = None if key in self.result_cache else self._inflight.get(key)
+            if future is not None:
+                self.speculative_hits += 1
+        if future is not None:
+            return await asyncio.wrap_future(future)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.read_frame, frame, languages, model_name)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with _lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.worker_count,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=([["en"]],),
+                )
+                if config.verbose:
+                    print(f"[OCRManager] started OCR worker pool with {self.worker_count} processes")
+            return self._pool
+
+    def set_workers(self, worker_count: int):
+        """
+        Set the number of OCR worker processes (0 runs EasyOCR in-process)
+
+        Existing readers are dropped so the next read uses the new setting.
+        """
+        self.shutdown_pool()
+        with _lock:
+            self.worker_count = worker_count
+            for lang_key in list(self.readers):
+                self._evict(lang_key, "reconfigured")
+
+    def shutdown_pool(self):
+        """Stop the worker pool, if one was started"""
+        with _lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def prefetch(self, frame, languages: List[str] = None, model_name: str = None) -> Optional[Future]:
+        """
+        Start OCR of a frame in the background (speculative OCR)
+
+        A later `read_frame` of the same frame waits for this pass instead of
+        starting its own.
+
+        Args:
+            frame: Frame to read
+            languages: List of language codes (default: ["en"])
+            model_name: Optional model name for tracking
+
+        Returns:
+            Future of the OCR results, or None if speculative OCR is disabled
+            or the frame is already read / being read
+        """
+        if not self.speculative_enabled or frame is None:
+            return None
+        if languages is None:
+            languages = ["en"]
+        key = (frame.hash, "_".join(sorted(languages)))
+
+        with _cache_lock:
+            if key in self.result_cache or key in self._inflight:
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="ocr-prefetch"
+                )
+            future = self._executor.submit(
+                self._read_uncached, frame, languages, model_name, key
+            )
+            self._inflight[key] = future
+            self.speculative_started += 1
+
+        if config.verbose:
+            print(f"[OCRManager] started speculative OCR of frame {key[0][:12]}")
+        return future
+
+    def _read_uncached(self, frame, languages: List[str], model_name: str, key: Tuple[str, str]) -> list:
+        try:
+            reader = self.get_reader(languages, model_name)
+            profile = self.ocr_profile
+            if profile.max_width or profile.grayscale or profile.readtext_options:
+                reader = ProfiledReader(reader, profile)
+            start_time = time.time()
+            if self.ocr_mode == "tiled":
+                result = self._read_tiled(frame, key[1], reader)
+            else:
+                result = reader.readtext(frame.array)
+            if config.verbose:
+                print(f"[OCRManager] {self.ocr_mode}/{profile.name} OCR pass took {time.time() - start_time:.2f}s ({len(result)} elements)")
+
+            self._store_result(key, result)
+            return result
+        finally:
+            with _cache_lock:
+                self._inflight.pop(key, None)
+
+    def _read_tiled(self, frame, lang_key: str, reader) -> list:
+        with _cache_lock:
+            state = self.tiled_states.get(lang_key)
+            if state is None:
+                state = self.tiled_states[lang_key] = TiledOCRState(
+                    self.tile_grid, self.tile_overlap
+                )
+
+        result, tiles_read, tiles_reused = state.read(frame, reader)
+
+        with _cache_lock:
+            self.tiles_read += tiles_read
+            self.tiles_reused += tiles_reused
+        if config.verbose:
+            print(f"[OCRManager] tiled OCR read {tiles_read} tiles, reused {tiles_reused}")
+        return result
+
+    def set_mode(self, mode: str, grid: Tuple[int, int] = None, overlap: int = None):
+        """
+        Select the OCR mode
+
+        Args:
+            mode: "full" or "tiled"
+            grid: Optional (columns, rows) for tiled mode
+            overlap: Optional tile overlap in pixels for tiled mode
+        """
+        if mode not in OCR_MODES:
+            raise ValueError(f"Unknown OCR mode '{mode}', expected one of {OCR_MODES}")
+        with _cache_lock:
+            self.ocr_mode = mode
+            if grid is not None:
+                self.tile_grid = grid
+            if overlap is not None:
+                self.tile_overlap = overlap
+            self.tiled_states.clear()
+            self.result_cache.clear()
+
+    def set_profile(self, profile):
+        """
+        Select the OCR profile
+
+        Args:
+            profile: Profile name ("accurate", "fast") or an `OCRProfile`
+        """
+        if not isinstance(profile, OCRProfile):
+            profile = get_ocr_profile(profile)
+        with _cache_lock:
+            self.ocr_profile = profile
+            # results read with another profile have different boxes
+            self.tiled_states.clear()
+            self.result_cache.clear()
+
+    def _store_result(self, key: Tuple[str, str], result: list):
+        with _cache_lock:
+            self.result_cache[key] = result
+            self.result_cache.move_to_end(key)
+            while len(self.result_cache) > self.result_cache_size:
+                self.result_cache.popitem(last=False)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
+        with _cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            result_cache_stats = {
+                'size': len(self.result_cache),
+                'capacity': self.result_cache_size,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+            }
+            speculative_stats = {
+                'enabled': self.speculative_enabled,
+                'started': self.speculative_started,
+                'awaited': self.speculative_hits,
+                'in_flight': len(self._inflight),
+            }
+            tile_stats = {
+                'mode': self.ocr_mode,
+                'profile': self.ocr_profile.name,
+                'tiles_read': self.tiles_read,
+                'tiles_reused': self.tiles_reused,
+            }
+
         with _lock:
             total_readers = len(self.readers)
             total_init_time = sum(self.initialization_times.values())
@@ -121,15 +928,36 @@ class OCRManager:
                 'average_init_time': total_init_time / max(1, total_readers),
                 'readers_by_language': list(self.readers.keys()),
                 'usage_counts': self.usage_counts.copy(),
-                'initialization_times': self.initialization_times.copy()
+                'initialization_times': self.initialization_times.copy(),
+                'result_cache': result_cache_stats,
+                'tiles': tile_stats,
+                'speculative': speculative_stats,
+                'workers': {
+                    'processes': self.worker_count,
+                    'pool_running': self._pool is not None,
+                },
+                'memory': {
+                    'budget_bytes': self.memory_budget_bytes,
+                    'used_bytes': sum(self.reader_memory.values()),
+                    'reader_bytes': self.reader_memory.copy(),
+                    'estimated_readers': sorted(self.estimated_memory),
+                    'max_idle_seconds': self.max_idle_seconds,
+                    'janitor_running': self._janitor is not None and self._janitor.is_alive(),
+                },
+                'evictions': {
+                    'total': sum(self.eviction_counts.values()),
+                    'by_reason': self.eviction_counts.copy(),
+                    'recent': list(self.eviction_events),
+                },
             }
     
-    def cleanup_unused_readers(self, max_age_seconds: int = 300):
+    def cleanup_unused_readers(self, max_age_seconds: int = 300, reason: str = "cleanup"):
         """
         Clean up readers that haven't been used recently
         
         Args:
             max_age_seconds: Maximum age in seconds before cleanup
+            reason: Eviction reason reported in the statistics
         """
         current_time = time.time()
         with _lock:
@@ -139,13 +967,10 @@ class OCRManager:
                     to_remove.append(lang_key)
             
             for lang_key in to_remove:
-                if config.verbose:
-                    print(f"[OCRManager] Cleaning up unused reader: {lang_key}")
-                
-                del self.readers[lang_key]
-                del self.initialization_times[lang_key]
-                del self.usage_counts[lang_key]
-                del self.last_used[lang_key]
+                self._evict(lang_key, reason)
+
+        if to_remove:
+            gc.collect()
     
     def reset(self):
         """Reset all readers (useful for testing)"""
@@ -154,30 +979,85 @@ class OCRManager:
             self.initialization_times.clear()
             self.usage_counts.clear()
             self.last_used.clear()
-            
-            if config.verbose:
-                print("[OCRManager] All readers reset")
+            self.reader_memory.clear()
+            self.estimated_memory.clear()
+            self.eviction_counts.clear()
+            self.eviction_events.clear()
+
+        with _cache_lock:
+            self.result_cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.tiled_states.clear()
+            self.tiles_read = 0
+            self.tiles_reused = 0
+            self.speculative_started = 0
+            self.speculative_hits = 0
+
+        if config.verbose:
+            print("[OCRManager] All readers reset")
 
 # Global instance
 ocr_manager = OCRManager()
+atexit.register(ocr_manager.shutdown_pool)
+atexit.register(ocr_manager.stop_janitor)
 
-def get_ocr_reader(languages: List[str] = None, model_name: str = None) -> Any:
+def get_ocr_reader(languages: List[str] = None, model_name: str = None, profile: str = None) -> Any:
     """
     Convenience function to get an OCR reader
     
     Args:
         languages: List of language codes (default: ["en"])
         model_name: Optional model name for tracking
+        profile: Optional OCR profile name; the reader is then wrapped so
+            `readtext` applies the profile and returns full-resolution boxes
         
     Returns:
         EasyOCR Reader instance
     """
-    return ocr_manager.get_reader(languages, model_name)
+    reader = ocr_manager.get_reader(languages, model_name)
+    if profile is not None:
+        return ProfiledReader(reader, get_ocr_profile(profile))
+    return reader
+
+def read_text(frame, languages: List[str] = None, model_name: str = None) -> list:
+    """
+    Convenience function to OCR a frame through the result cache
+
+    Args:
+        frame: Frame to read
+        languages: List of language codes (default: ["en"])
+        model_name: Optional model name for tracking
+
+    Returns:
+        EasyOCR results
+    """
+    return ocr_manager.read_frame(frame, languages, model_name)
+
+async def read_text_async(frame, languages: List[str] = None, model_name: str = None) -> list:
+    """Awaitable OCR of a frame (see `OCRManager.read_async`)"""
+    return await ocr_manager.read_async(frame, languages, model_name)
+
+def prefetch_text(frame, languages: List[str] = None, model_name: str = None) -> Optional[Future]:
+    """Start speculative OCR of a frame while the model request is in flight"""
+    return ocr_manager.prefetch(frame, languages, model_name)
+
+def set_ocr_mode(mode: str, grid: Tuple[int, int] = None, overlap: int = None):
+    """Select the OCR mode ("full" or "tiled")"""
+    ocr_manager.set_mode(mode, grid, overlap)
+
+def set_ocr_profile(profile):
+    """Select the OCR profile ("accurate" or "fast")"""
+    ocr_manager.set_profile(profile)
 
 def get_ocr_stats() -> Dict[str, Any]:
     """Get OCR performance statistics"""
     return ocr_manager.get_stats()
 
+def set_ocr_memory_budget(budget_mb: int = None, max_idle_seconds: int = None):
+    """Configure the OCR reader memory budget and idle eviction"""
+    ocr_manager.set_memory_budget(budget_mb, max_idle_seconds)
+
 def cleanup_ocr_readers(max_age_seconds: int = 300):
     """Clean up unused OCR readers"""
     ocr_manager.cleanup_unused_readers(max_age_seconds)
@@ -0,0 +1,276 @@
+"""
+Per-frame screen parse shared by every model path
+
+A `ScreenParse` holds everything detected on one frame in a single element
+map: OCR text from the OCR manager and YOLO detections from the YOLO manager.
+Parses are cached by frame hash, so the OCR, set-of-mark, Claude and Qwen
+paths all resolve clicks from the same structure and a frame is never read
+or detected twice.
+
+Stages are computed on demand: a path that only clicks on text never pays for
+YOLO, and a later request for detections on the same frame adds them to the
+cached parse. When both stages are present they are fused: a text element
+whose center lies inside a detection is attached to it (`parent`), and the
+detection takes the element's text.
+
+Element types:
+- text: OCR text
+- icon: a detection without text inside
+- control: a detection containing text (e.g. a button with a caption)
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from operate.config import Config
+from operate.utils.label import detection_boxes, select_labels
+from operate.utils.ocr import get_text_element
+from operate.utils.ocr_manager import read_text, read_text_async
+
+# Load configuration
+config = Config()
+
+DEFAULT_PARSE_CACHE_SIZE = 8
+
+
+@dataclass
+class ScreenElement:
+    """
+    One element on screen
+
+    Attributes:
+        id: "t<n>" for text, the set-of-mark label ("~<n>") for labeled
+            detections and "d<n>" for detections hidden by an overlapping one
+        box: (x1, y1, x2, y2) in frame pixels
+        text: Recognized text ("" for icons)
+        type: "text", "icon" or "control"
+        confidence: OCR confidence, or 1.0 for detections
+        parent: Id of the detection containing this text element
+        children: Ids of the text elements inside this detection
+    """
+
+    id: str
+    box: Tuple[float, float, float, float]
+    text: str = ""
+    type: str = "text"
+    confidence: float = 1.0
+    parent: Optional[str] = None
+    children: List[str] = field(default_factory=list)
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.box[0] + self.box[2]) / 2, (self.box[1] + self.box[3]) / 2
+
+
+class ScreenParse:
+    """
+    Fused element map of one frame
+
+    Attributes:
+        frame: The parsed frame
+        elements: Elements by id, text elements first
+        ocr_result: Raw EasyOCR results, once the text stage ran
+        label_coordinates: {label: box} of the labeled detections, once the object stage ran
+        detections: [(counter, box)] of every detection (debug overlay)
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.elements: "OrderedDict[str, ScreenElement]" = OrderedDict()
+        self.ocr_result: Optional[list] = None
+        self.label_coordinates: Optional[Dict[str, tuple]] = None
+        self.detections: List[Tuple[int, tuple]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def has_text(self) -> bool:
+        return self.ocr_result is not None
+
+    @property
+    def has_objects(self) -> bool:
+        return self.label_coordinates is not None
+
+    def add_text(self, ocr_result: list):
+        """Add the text stage from EasyOCR results"""
+        with self.lock:
+            if self.has_text:
+                return
+            self.ocr_result = ocr_result
+            for index, (points, text, *rest) in enumerate(ocr_result):
+                xs = [float(point[0]) for point in points]
+                ys = [float(point[1]) for point in points]
+                element_id = f"t{index}"
+                self.elements[element_id] = ScreenElement(
+                    id=element_id,
+                    box=(min(xs), min(ys), max(xs), max(ys)),
+                    text=text,
+                    type="text",
+                    confidence=float(rest[0]) if rest else 1.0,
+                )
+            self._fuse()
+
+    def add_objects(self, boxes: List[tuple]):
+        """Add the object stage from detection boxes, labeling them as set-of-mark does"""
+        with self.lock:
+            if self.has_objects:
+                return
+            self.label_coordinates, self.detections = select_labels(boxes)
+            labeled = {box: label for label, box in self.label_coordinates.items()}
+            for index, box in enumerate(boxes):
+                element_id = labeled.pop(box, None) or f"d{index}"
+                self.elements[element_id] = ScreenElement(id=element_id, box=box, type="icon")
+            self._fuse()
+
+    def _fuse(self):
+        """Attach text elements to the smallest detection containing their center"""
+        if not (self.has_text and self.has_objects):
+            return
+        objects = [element for element in self.elements.values() if element.type != "text"]
+        for element in self.elements.values():
+            if element.type != "text" or element.parent is not None:
+                continue
+            center_x, center_y = element.center
+            containing = [
+                obj for obj in objects
+                if obj.box[0] <= center_x <= obj.box[2] and obj.box[1] <= center_y <= obj.box[3]
+            ]
+            if not containing:
+                continue
+            parent = min(containing, key=lambda obj: (obj.box[2] - obj.box[0]) * (obj.box[3] - obj.box[1]))
+            element.parent = parent.id
+            parent.children.append(element.id)
+            parent.type = "control"
+            parent.text = " ".join(self.elements[child].text for child in parent.children)
+
+    def get(self, element_id: str) -> Optional[ScreenElement]:
+        return self.elements.get(element_id)
+
+    def find_text(self, search_text: str) -> ScreenElement:
+        """
+        Best matching text element for `search_text` (ranked fuzzy lookup)
+
+        Raises:
+            Exception: If the text element is not found
+        """
+        index = get_text_element(self.ocr_result or [], search_text, self.frame)
+        return self.elements[f"t{index}"]
+
+    def click_position(self, element: ScreenElement) -> Dict[str, float]:
+        """Center of `element` as a fraction of the frame size"""
+        center_x, center_y = element.center
+        return {
+            "x": round(center_x / self.frame.size[0], 3),
+            "y": round(center_y / self.frame.size[1], 3),
+        }
+
+    def text_click_position(self, search_text: str) -> Dict[str, float]:
+        """Click position of the text element best matching `search_text`"""
+        return self.click_position(self.find_text(search_text))
+
+    def elements_of_type(self, element_type: str) -> List[ScreenElement]:
+        return [element for element in self.elements.values() if element.type == element_type]
+
+    def __len__(self):
+        return len(self.elements)
+
+
+class ScreenParser:
+    """
+    Builds and caches `ScreenParse`s by frame hash
+
+    Args:
+        cache_size: Number of frames kept
+        languages: OCR languages for the text stage
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_PARSE_CACHE_SIZE, languages: List[str] = None):
+        self.cache_size = cache_size
+        self.languages = languages or ["en"]
+        self.cache: "OrderedDict[str, ScreenParse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "text_stages": 0, "object_stages": 0}
+
+    def _entry(self, frame) -> ScreenParse:
+        with self._lock:
+            parse = self.cache.get(frame.hash)
+            if parse is not None:
+                self.cache.move_to_end(frame.hash)
+                self._stats["hits"] += 1
+                return parse
+            self._stats["misses"] += 1
+            parse = self.cache[frame.hash] = ScreenParse(frame)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return parse
+
+    def _add_objects(self, parse: ScreenParse):
+        from operate.utils.yolo_manager import detect_objects
+
+        parse.add_objects(detection_boxes(detect_objects(parse.frame.image)))
+        with self._lock:
+            self._stats["object_stages"] += 1
+
+    def parse(self, frame, text: bool = True, objects: bool = False, model_name: str = None) -> ScreenParse:
+        """
+        Parse a frame, running only the stages not cached yet
+
+        Args:
+            frame: Frame to parse
+            text: Include OCR text
+            objects: Include YOLO detections
+            model_name: Optional model name for OCR tracking
+
+        Returns:
+            ScreenParse
+        """
+        parse = self._entry(frame)
+        if text and not parse.has_text:
+            parse.add_text(read_text(frame, self.languages, model_name))
+            with self._lock:
+                self._stats["text_stages"] += 1
+        if objects and not parse.has_objects:
+            self._add_objects(parse)
+        return parse
+
+    async def parse_async(self, frame, text: bool = True, objects: bool = False, model_name: str = None) -> ScreenParse:
+        """Awaitable `parse`: OCR goes through `read_text_async`, detection runs off the event loop"""
+        parse = self._entry(frame)
+        if text and not parse.has_text:
+            parse.add_text(await read_text_async(frame, self.languages, model_name))
+            with self._lock:
+                self._stats["text_stages"] += 1
+        if objects and not parse.has_objects:
+            await asyncio.get_running_loop().run_in_executor(None, self._add_objects, parse)
+        return parse
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_frames"] = len(self.cache)
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self.cache.clear()
+
+
+# Global instance
+screen_parser = ScreenParser()
+
+
+def parse_screen(frame, text: bool = True, objects: bool = False, model_name: str = None) -> ScreenParse:
+    """Convenience function to get the (cached) parse of a frame"""
+    return screen_parser.parse(frame, text, objects, model_name)
+
+
+async def parse_screen_async(frame, text: bool = True, objects: bool = False, model_name: str = None) -> ScreenParse:
+    """Awaitable `parse_screen`"""
+    return await screen_parser.parse_async(frame, text, objects, model_name)
+
+
+def get_screen_parse_stats() -> Dict[str, Any]:
+    """Get screen parse cache statistics"""
+    return screen_parser.get_stats()
@@ -1,30 +1,169 @@
+import asyncio
+import contextvars
 import os
-import platform
-import subprocess
-import pyautogui
-from PIL import Image, ImageDraw, ImageGrab
-import Xlib.display
-import Xlib.X
-import Xlib.Xutil  # not sure if Xutil is necessary
+import threading
+from contextlib import contextmanager
+from PIL import Image
+
+from operate.utils.capture_backends import get_capture_backend
+
+# Set OPERATE_SAVE_SCREENSHOTS=1 to also write every captured frame to
+# `screenshots/screenshot.png` (used by evaluate.py and for debugging).
+SCREENSHOT_PATH = os.path.join("screenshots", "screenshot.png")
+
+
+def capture_frame(backend=None):
+    """
+    Capture the screen into an in-memory `Frame`
+
+    Args:
+        backend: Optional capture backend name (see `capture_backends`)
+
+    Returns:
+        Frame: the captured screen, or None if no capture backend is available
+    """
+    try:
+        capture_backend = get_capture_backend(backend)
+    except RuntimeError as e:
+        print(e)
+        return None
+
+    frame = capture_backend.grab()
+
+    if os.getenv("OPERATE_SAVE_SCREENSHOTS") == "1":
+        frame.save(SCREENSHOT_PATH)
+
+    return frame
+
+
+async def capture_frame_async(backend=None):
+    """Awaitable `capture_frame`, the grab runs off the event loop"""
+    return await asyncio.to_thread(capture_frame, backend)
+
+
+# Set while a model attempt runs (see `FrameChangeDetector.attempt`)
+_attempt_record = contextvars.ContextVar("frame_change_attempt", default=None)
+
+
+class FrameChangeDetector:
+    """
+    Detects steps that left the screen unchanged
+
+    Frames are compared by tile hashes (see `Frame.tile_hashes`). The detector
+    remembers the last frame that was shown to the model so the next step can
+    skip re-uploading an identical screenshot, and counts how often that
+    happened.
+
+    Only the upload is avoided: the step still sends a request (with a short
+    "screen unchanged" message instead of the image) and waits for the
+    model's answer, so `image_uploads_avoided` counts saved image payloads,
+    not saved model calls.
+    """
+
+    def __init__(self, grid=(16, 9), min_changed_tiles=1):
+        self.grid = grid
+        self.min_changed_tiles = min_changed_tiles
+        self.enabled = os.getenv("OPERATE_CHANGE_DETECTION", "1") != "0"
+        self.last_frame = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "frames_compared": 0,
+            "unchanged_frames": 0,
+            "image_uploads_avoided": 0,
+            "local_retries": 0,
+        }
+
+    def changed_tiles(self, previous, current):
+        """Number of tiles that differ between two frames (all tiles if sizes differ)"""
+        previous_hashes = previous.tile_hashes(self.grid)
+        if previous.size != current.size:
+            return len(previous_hashes)
+        current_hashes = current.tile_hashes(self.grid)
+        return sum(a != b for a, b in zip(previous_hashes, current_hashes))
+
+    def has_changed(self, frame, reference=None):
+        """
+        Check whether `frame` differs from `reference` (default: the last frame shown to the model)
+        """
+        reference = reference or self.last_frame
+        if reference is None or frame is None:
+            return True
+        changed = self.changed_tiles(reference, frame) >= self.min_changed_tiles
+        with self._lock:
+            self._stats["frames_compared"] += 1
+            if not changed:
+                self._stats["unchanged_frames"] += 1
+        return changed
+
+    def is_repeat(self, frame):
+        """
+        Record `frame` as the one shown to the model and report whether the
+        model has already seen an identical screen on the previous step
+        """
+        if not self.enabled:
+            return False
+        record = _attempt_record.get()
+        previous = record["baseline"] if record is not None else self.last_frame
+        repeat = previous is not None and not self.has_changed(frame, previous)
+        if record is not None:
+            record["frame"] = frame
+        else:
+            self.last_frame = frame
+        if repeat:
+            with self._lock:
+                self._stats["image_uploads_avoided"] += 1
+        return repeat
+
+    @contextmanager
+    def attempt(self):
+        """
+        Scope `is_repeat` to one model attempt
+
+        Within the block (and tasks started from it) frames are compared with
+        the screen of the previous step and recorded in the yielded record
+        instead of `last_frame`. `commit` the record of the attempt whose
+        response is used, so a failed or cancelled attempt (fallback, hedged
+        request) doesn't make the next one believe the screen is unchanged.
+        """
+        record = {"baseline": self.last_frame, "frame": None}
+        token = _attempt_record.set(record)
+        try:
+            yield record
+        finally:
+            _attempt_record.reset(token)
+
+    def commit(self, record):
+        """Make the frame recorded by an attempt the one shown to the model"""
+        if record["frame"] is not None:
+            self.last_frame = record["frame"]
+
+    def record_local_retry(self):
+        with self._lock:
+            self._stats["local_retries"] += 1
+
+    def reset(self):
+        self.last_frame = None
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+# Global instance
+frame_change_detector = FrameChangeDetector()
+
+
+def get_change_stats():
+    """Get frame change detection statistics"""
+    return frame_change_detector.get_stats()
 
 
 def capture_screen_with_cursor(file_path):
-    user_platform = platform.system()
-
-    if user_platform == "Windows":
-        screenshot = pyautogui.screenshot()
-        screenshot.save(file_path)
-    elif user_platform == "Linux":
-        # Use xlib to prevent scrot dependency for Linux
-        screen = Xlib.display.Display().screen()
-        size = screen.width_in_pixels, screen.height_in_pixels
-        screenshot = ImageGrab.grab(bbox=(0, 0, size[0], size[1]))
-        screenshot.save(file_path)
-    elif user_platform == "Darwin":  # (Mac OS)
-        # Use the screencapture utility to capture the screen with the cursor
-        subprocess.run(["screencapture", "-C", file_path])
-    else:
-        print(f"The platform you're using ({user_platform}) is not currently supported")
+    """Capture the screen and write it to `file_path` (kept for compatibility)"""
+    frame = capture_frame()
+    if frame is not None:
+        frame.save(file_path)
+    return frame
 
 
 def compress_screenshot(raw_screenshot_filename, screenshot_filename):
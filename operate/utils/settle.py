@@ -0,0 +1,259 @@
+"""
+Screen settle detection
+
+Replaces the fixed `time.sleep(1)` calls between actions and captures. After
+an action the screen is sampled at low resolution and the wait ends as soon as
+consecutive samples have stayed identical for the profile's stable window, or
+when the profile's timeout is reached.
+
+Timing profiles:
+- legacy: the previous behaviour, a fixed 1s sleep every time
+- balanced: 250ms stable window, 3s timeout (default)
+- fast: 120ms stable window, 1.5s timeout
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from operate.config import Config
+from operate.utils.capture_backends import get_capture_backend
+
+# Load configuration
+config = Config()
+
+
+@dataclass(frozen=True)
+class TimingProfile:
+    """
+    Timing used when waiting for the screen to settle
+
+    Attributes:
+        name: Profile name
+        fixed_delay_ms: If set, sleep this long instead of sampling the screen
+        min_wait_ms: Always wait at least this long so the action can start rendering
+        stable_ms: How long consecutive samples must stay identical
+        timeout_ms: Upper bound for the whole wait
+        sample_interval_ms: Delay between samples
+        sample_width: Width in pixels of the grayscale sample
+        tolerance: Mean absolute pixel difference still treated as "unchanged"
+    """
+
+    name: str
+    fixed_delay_ms: Optional[int] = None
+    min_wait_ms: int = 100
+    stable_ms: int = 250
+    timeout_ms: int = 3000
+    sample_interval_ms: int = 50
+    sample_width: int = 160
+    tolerance: float = 0.5
+
+
+TIMING_PROFILES: Dict[str, TimingProfile] = {
+    "legacy": TimingProfile(name="legacy", fixed_delay_ms=1000),
+    "balanced": TimingProfile(name="balanced"),
+    "fast": TimingProfile(
+        name="fast",
+        min_wait_ms=50,
+        stable_ms=120,
+        timeout_ms=1500,
+        sample_interval_ms=30,
+        sample_width=120,
+        tolerance=1.0,
+    ),
+}
+
+DEFAULT_TIMING_PROFILE = "balanced"
+
+_state_lock = threading.Lock()
+_screen_dirty = False
+_stats = {"waits": 0, "settled": 0, "timeouts": 0, "skipped": 0, "total_wait_time": 0.0}
+
+
+def get_timing_profile(name: str = None) -> TimingProfile:
+    """
+    Resolve a timing profile by name
+
+    Args:
+        name: Profile name, defaults to `config.timing_profile`
+
+    Returns:
+        TimingProfile
+    """
+    name = name or config.timing_profile or DEFAULT_TIMING_PROFILE
+    if name not in TIMING_PROFILES:
+        raise ValueError(
+            f"Unknown timing profile '{name}', expected one of {sorted(TIMING_PROFILES)}"
+        )
+    return TIMING_PROFILES[name]
+
+
+def register_timing_profile(profile: TimingProfile):
+    """Add or replace a timing profile"""
+    TIMING_PROFILES[profile.name] = profile
+
+
+def notify_screen_action():
+    """Record that an action was sent to the OS and the screen may be changing"""
+    global _screen_dirty
+    with _state_lock:
+        _screen_dirty = True
+
+
+def _sample_screen(width: int) -> np.ndarray:
+    frame = get_capture_backend().grab()
+    factor = max(1, frame.width // width)
+    sample = frame.image.convert("L")
+    if factor > 1:
+        sample = sample.reduce(factor)
+    return np.asarray(sample, dtype=np.int16)
+
+
+def _begin_wait(profile: TimingProfile, force: bool) -> bool:
+    """Consume the dirty flag, returning False if the wait can be skipped"""
+    global _screen_dirty
+    with _state_lock:
+        dirty = _screen_dirty
+        _screen_dirty = False
+        if profile.fixed_delay_ms is None and not dirty and not force:
+            _stats["skipped"] += 1
+            return False
+    return True
+
+
+def _settle_steps(profile: TimingProfile, start_time: float):
+    """
+    The settle wait as a sequence of steps, shared by the sync and async waits
+
+    Yields ("sleep", seconds) or ("sample", width); the sample is sent back in
+    (or its exception thrown in). Returns whether the screen settled.
+    """
+    if profile.fixed_delay_ms is not None:
+        yield "sleep", profile.fixed_delay_ms / 1000
+        return True
+
+    yield "sleep", profile.min_wait_ms / 1000
+
+    deadline = start_time + profile.timeout_ms / 1000
+    try:
+        previous = yield "sample", profile.sample_width
+    except Exception as e:
+        # No usable capture backend, fall back to the stable window as a plain delay
+        if config.verbose:
+            print("[wait_for_screen_settle] sampling failed, sleeping instead:", e)
+        yield "sleep", profile.stable_ms / 1000
+        return False
+
+    stable_since = time.time()
+    while True:
+        now = time.time()
+        if now - stable_since >= profile.stable_ms / 1000:
+            return True
+        if now >= deadline:
+            return False
+
+        yield "sleep", profile.sample_interval_ms / 1000
+        try:
+            current = yield "sample", profile.sample_width
+        except Exception as e:
+            # a failed capture says nothing about the screen: sleep out the
+            # rest of the stable window as a plain delay, like a failed first sample
+            if config.verbose:
+                print("[wait_for_screen_settle] sampling failed, sleeping instead:", e)
+            remaining = profile.stable_ms / 1000 - (time.time() - stable_since)
+            if remaining > 0:
+                yield "sleep", remaining
+            return False
+        if (
+            current.shape != previous.shape
+            or np.abs(current - previous).mean() > profile.tolerance
+        ):
+            stable_since = time.time()
+        previous = current
+
+
+def wait_for_screen_settle(profile: TimingProfile = None, force: bool = False) -> float:
+    """
+    Block until the screen stops changing
+
+    Returns immediately if no action was sent since the last wait, unless
+    `force` is set. The legacy profile always sleeps its fixed delay.
+
+    Args:
+        profile: Timing profile, defaults to the configured one
+        force: Wait even if no action was recorded
+
+    Returns:
+        float: Seconds spent waiting
+    """
+    profile = profile or get_timing_profile()
+    start_time = time.time()
+    if not _begin_wait(profile, force):
+        return 0.0
+
+    steps = _settle_steps(profile, start_time)
+    try:
+        kind, value = next(steps)
+        while True:
+            if kind == "sleep":
+                time.sleep(value)
+                kind, value = steps.send(None)
+                continue
+            try:
+                sample = _sample_screen(value)
+            except Exception as e:
+                kind, value = steps.throw(e)
+                continue
+            kind, value = steps.send(sample)
+    except StopIteration as stop:
+        return _record_wait(start_time, settled=stop.value)
+
+
+async def wait_for_screen_settle_async(profile: TimingProfile = None, force: bool = False) -> float:
+    """
+    Awaitable `wait_for_screen_settle`: sleeps with `asyncio.sleep` and
+    samples the screen off the event loop, so other sessions keep running
+    """
+    profile = profile or get_timing_profile()
+    start_time = time.time()
+    if not _begin_wait(profile, force):
+        return 0.0
+
+    steps = _settle_steps(profile, start_time)
+    try:
+        kind, value = next(steps)
+        while True:
+            if kind == "sleep":
+                await asyncio.sleep(value)
+                kind, value = steps.send(None)
+                continue
+            try:
+                sample = await asyncio.to_thread(_sample_screen, value)
+            except Exception as e:
+                kind, value = steps.throw(e)
+                continue
+            kind, value = steps.send(sample)
+    except StopIteration as stop:
+        return _record_wait(start_time, settled=stop.value)
+
+
+def _record_wait(start_time: float, settled: bool) -> float:
+    waited = time.time() - start_time
+    with _state_lock:
+        _stats["waits"] += 1
+        _stats["settled" if settled else "timeouts"] += 1
+        _stats["total_wait_time"] += waited
+    if config.verbose:
+        state = "settled" if settled else "timed out"
+        print(f"[wait_for_screen_settle] screen {state} after {waited:.3f}s")
+    return waited
+
+
+def get_settle_stats() -> Dict[str, float]:
+    """Get settle wait statistics"""
+    with _state_lock:
+        return dict(_stats)
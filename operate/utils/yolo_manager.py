@@ -0,0 +1,256 @@
+"""
+YOLO Manager for the set-of-mark (gpt-4-with-som) path
+
+Loads the YOLO model once per process instead of on every step, runs one
+warm-up inference so the first real frame doesn't pay for lazy
+initialization, and keeps load and inference timings.
+
+Model formats (OPERATE_YOLO_FORMAT):
+- pt: the bundled PyTorch weights (default)
+- onnx / torchscript: the weights are exported once into
+  OPERATE_YOLO_EXPORT_DIR (default cache/yolo, the package directory may be
+  read-only) and the exported model is used afterwards, which is usually
+  faster on CPU. If the export fails the PyTorch weights are used instead.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pkg_resources
+
+from operate.config import Config
+
+# Global imports (will be imported only when needed)
+_YOLO = None
+_lock = threading.Lock()
+
+YOLO_FORMATS = ("pt", "onnx", "torchscript")
+DEFAULT_YOLO_FORMAT = os.getenv("OPERATE_YOLO_FORMAT", "pt")
+DEFAULT_EXPORT_DIR = os.getenv("OPERATE_YOLO_EXPORT_DIR", os.path.join("cache", "yolo"))
+
+# Extension ultralytics gives each export format
+_EXPORT_SUFFIXES = {"onnx": ".onnx", "torchscript": ".torchscript"}
+
+WARMUP_SIZE = (640, 640)  # (width, height) of the warm-up frame
+
+# Load configuration
+config = Config()
+
+
+def _default_weights() -> str:
+    return pkg_resources.resource_filename("operate.models.weights", "best.pt")
+
+
+class YOLOManager:
+    """
+    Singleton manager for YOLO models
+
+    Features:
+    - Loads each (weights, format) combination once per process, under a
+      per-model lock so a load doesn't block inference or stats
+    - Warm-up inference right after loading
+    - Optional ONNX / TorchScript export, reused across runs
+    - Load, warm-up and inference timings
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            with _lock:
+                if cls._instance is None:
+                    cls._instance = super(YOLOManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            with _lock:
+                if not self._initialized:
+                    self.models: Dict[Tuple[str, str], Any] = {}
+                    self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+                    self.load_times: Dict[str, float] = {}
+                    self.warmup_times: Dict[str, float] = {}
+                    self.export_times: Dict[str, float] = {}
+                    self.inference_count = 0
+                    self.total_inference_time = 0.0
+                    self.last_inference_time = 0.0
+                    self.model_format = DEFAULT_YOLO_FORMAT
+                    YOLOManager._initialized = True
+
+    def get_model(self, weights: str = None, model_format: str = None) -> Any:
+        """
+        Get a loaded, warmed-up YOLO model
+
+        Args:
+            weights: Path to the .pt weights (default: the bundled best.pt)
+            model_format: "pt", "onnx" or "torchscript" (default: OPERATE_YOLO_FORMAT)
+
+        Returns:
+            ultralytics YOLO model
+        """
+        weights = weights or _default_weights()
+        model_format = model_format or self.model_format
+        if model_format not in YOLO_FORMATS:
+            raise ValueError(f"Unknown YOLO format '{model_format}', expected one of {YOLO_FORMATS}")
+        key = (weights, model_format)
+
+        with _lock:
+            if key in self.models:
+                return self.models[key]
+            # only callers asking for this model wait while it is built
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # another thread may have built it while we were waiting
+            with _lock:
+                if key in self.models:
+                    return self.models[key]
+
+            global _YOLO
+            if _YOLO is None:
+                from ultralytics import YOLO
+                _YOLO = YOLO
+
+            model_key = f"{os.path.basename(weights)}:{model_format}"
+            if config.verbose:
+                print(f"[YOLOManager] Loading YOLO model {model_key}")
+
+            start_time = time.time()
+            model_path = weights
+            if model_format != "pt":
+                model_path = self._export(weights, model_format, model_key)
+            model = _YOLO(model_path, task="detect") if model_path != weights else _YOLO(weights)
+            load_time = time.time() - start_time
+
+            start_time = time.time()
+            model(np.zeros((WARMUP_SIZE[1], WARMUP_SIZE[0], 3), dtype=np.uint8), verbose=False)
+            warmup_time = time.time() - start_time
+
+            if config.verbose:
+                print(f"[YOLOManager] YOLO model {model_key} loaded in {load_time:.2f}s, warm-up took {warmup_time:.2f}s")
+
+            with _lock:
+                self.load_times[model_key] = load_time
+                self.warmup_times[model_key] = warmup_time
+                self.models[key] = model
+            return model
+
+    def _export(self, weights: str, model_format: str, model_key: str) -> str:
+        """Export `weights` unless an up-to-date export exists, returning the model path"""
+        # ultralytics exports next to the weights it loads, so export from a
+        # copy in the export directory (named after the weights' path)
+        digest = hashlib.blake2b(os.path.abspath(weights).encode(), digest_size=4).hexdigest()
+        base = os.path.join(DEFAULT_EXPORT_DIR, f"{os.path.splitext(os.path.basename(weights))[0]}-{digest}")
+        exported = base + _EXPORT_SUFFIXES[model_format]
+        if os.path.exists(exported) and os.path.getmtime(exported) >= os.path.getmtime(weights):
+            return exported
+
+        start_time = time.time()
+        try:
+            os.makedirs(DEFAULT_EXPORT_DIR, exist_ok=True)
+            copied = shutil.copyfile(weights, base + ".pt")
+            exported = _YOLO(copied).export(format=model_format)
+        except Exception as e:
+            print(f"[YOLOManager] {model_format} export failed, using the PyTorch weights: {e}")
+            return weights
+        export_time = time.time() - start_time
+        with _lock:
+            self.export_times[model_key] = export_time
+        if config.verbose:
+            print(f"[YOLOManager] Exported {model_key} to {exported} in {export_time:.2f}s")
+        return exported
+
+    def predict(self, image, weights: str = None, model_format: str = None) -> List[Any]:
+        """
+        Run detection on an image and record the inference time
+
+        Args:
+            image: PIL image or HxWx3 array
+            weights: Optional weights path (see `get_model`)
+            model_format: Optional model format (see `get_model`)
+
+        Returns:
+            ultralytics results list
+        """
+        model = self.get_model(weights, model_format)
+        start_time = time.time()
+        results = model(image, verbose=config.verbose)
+        inference_time = time.time() - start_time
+
+        with _lock:
+            self.inference_count += 1
+            self.total_inference_time += inference_time
+            self.last_inference_time = inference_time
+
+        if config.verbose:
+            print(f"[YOLOManager] inference took {inference_time:.3f}s")
+        return results
+
+    def set_format(self, model_format: str):
+        """Select the model format used when none is given"""
+        if model_format not in YOLO_FORMATS:
+            raise ValueError(f"Unknown YOLO format '{model_format}', expected one of {YOLO_FORMATS}")
+        self.model_format = model_format
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get performance statistics"""
+        with _lock:
+            return {
+                'loaded_models': [f"{os.path.basename(w)}:{f}" for w, f in self.models],
+                'format': self.model_format,
+                'load_times': self.load_times.copy(),
+                'warmup_times': self.warmup_times.copy(),
+                'export_times': self.export_times.copy(),
+                'inference_count': self.inference_count,
+                'total_inference_time': self.total_inference_time,
+                'average_inference_time': self.total_inference_time / max(1, self.inference_count),
+                'last_inference_time': self.last_inference_time,
+            }
+
+    def reset(self):
+        """Drop all loaded models (useful for testing)"""
+        with _lock:
+            self.models.clear()
+            self.load_times.clear()
+            self.warmup_times.clear()
+            self.export_times.clear()
+            self.inference_count = 0
+            self.total_inference_time = 0.0
+            self.last_inference_time = 0.0
+
+        if config.verbose:
+            print("[YOLOManager] All models reset")
+
+# Global instance
+yolo_manager = YOLOManager()
+
+def get_yolo_model(weights: str = None, model_format: str = None) -> Any:
+    """
+    Convenience function to get the loaded YOLO model
+
+    Args:
+        weights: Path to the .pt weights (default: the bundled best.pt)
+        model_format: "pt", "onnx" or "torchscript"
+
+    Returns:
+        ultralytics YOLO model
+    """
+    return yolo_manager.get_model(weights, model_format)
+
+def detect_objects(image) -> List[Any]:
+    """Run the default YOLO model on an image (timed, see `get_yolo_stats`)"""
+    return yolo_manager.predict(image)
+
+def get_yolo_stats() -> Dict[str, Any]:
+    """Get YOLO performance statistics"""
+    return yolo_manager.get_stats()
+
+def reset_yolo_manager():
+    """Reset YOLO manager (useful for testing)"""
+    yolo_manager.reset()
@@ -3,15 +3,18 @@ import os
 import json
 import asyncio
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 import threading
 
+from PIL import Image
+
 # Add the operate module to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
 
 from operate.models.apis import get_next_action, call_gpt_4o_with_ocr
 from operate.config import Config
+from operate.utils.frame import Frame
 from operate.utils.ocr_manager import get_ocr_reader, get_ocr_stats, reset_ocr_manager
 
 class OptimizedPerformanceTracker:
@@ -110,17 +113,15 @@ def tracked_get_ocr_reader(*args, **kwargs):
     
     return result
 
-def mock_screenshot_capture(*args, **kwargs):
-    """Mock screenshot capture to avoid actual screen capture"""
-    # Create a dummy screenshot file
-    screenshot_path = args[0] if args else "screenshots/screenshot.png"
-    os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-    
-    # Create a minimal valid PNG file (1x1 pixel)
-    png_data = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\nIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xdb\x00\x00\x00\x00IEND\xaeB`\x82'
-    
-    with open(screenshot_path, 'wb') as f:
-        f.write(png_data)
+# Fixed screen used instead of a real capture
+MOCK_FRAME = Frame(Image.new("RGB", (1280, 800), "white"))
+
+def mock_capture_frame(*args, **kwargs):
+    """Mock screen capture: every step sees the same fixed frame instead of the real screen"""
+    return MOCK_FRAME
+
+async def mock_capture_frame_async(*args, **kwargs):
+    return MOCK_FRAME
 
 def mock_easyocr_reader(*args, **kwargs):
     """Mock EasyOCR Reader with realistic initialization time"""
@@ -189,12 +190,13 @@ async def run_optimized_performance_test():
     # Patch dependencies with optimized tracking
     with patch('operate.utils.ocr_manager.get_ocr_reader', side_effect=tracked_get_ocr_reader), \
          patch('easyocr.Reader', side_effect=mock_easyocr_reader), \
-         patch('operate.utils.screenshot.capture_screen_with_cursor', side_effect=mock_screenshot_capture), \
-         patch('operate.config.Config.initialize_openai') as mock_openai_init:
+         patch('operate.models.apis.capture_frame_async', new=mock_capture_frame_async), \
+         patch('operate.utils.screenshot.capture_frame', new=mock_capture_frame), \
+         patch('operate.config.Config.initialize_openai_async') as mock_openai_init:
         
         # Mock OpenAI client
         mock_client = MagicMock()
-        mock_client.chat.completions.create = mock_openai_response
+        mock_client.chat.completions.create = AsyncMock(side_effect=mock_openai_response)
         mock_openai_init.return_value = mock_client
         
         # Simulate the main loop (similar to operate.py)
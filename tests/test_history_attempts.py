@@ -0,0 +1,55 @@
+import copy
+import json
+
+from operate.models.history import SUMMARY_PREFIX, HistoryPolicy, compact_history, copy_history
+
+
+def screenshot_turn(step):
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": f"step {step}"},
+            {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{step}"}},
+        ],
+    }
+
+
+def reply(step):
+    return {"role": "assistant", "content": json.dumps([{"operation": "press", "keys": [f"k{step}"]}])}
+
+
+def build_history(steps):
+    messages = [{"role": "system", "content": "system"}]
+    for step in range(steps):
+        messages += [screenshot_turn(step), reply(step)]
+    return messages
+
+
+def summary_of(messages):
+    for message in messages:
+        content = message["content"]
+        text = content if isinstance(content, str) else content[0].get("text", "")
+        if text.startswith(SUMMARY_PREFIX):
+            return text
+    return ""
+
+
+def test_two_attempts_compact_their_own_copies():
+    history = build_history(6)
+    original = copy.deepcopy(history)
+    policy = HistoryPolicy(max_images=1, token_budget=1000)
+
+    # a hedged (or fallback) attempt and the attempt that wins, on one history
+    attempts = []
+    for _ in range(2):
+        attempt = copy_history(history)
+        attempt.append(screenshot_turn(6))
+        compact_history(attempt, policy)
+        attempts.append(attempt)
+
+    assert history == original
+    summary = summary_of(attempts[1])
+    assert summary
+    for step in range(4):
+        assert summary.count(f"press k{step}") <= 1
+    assert summary_of(attempts[0]) == summary
@@ -0,0 +1,53 @@
+from PIL import Image
+
+from operate.utils.frame import Frame
+from operate.utils.screen_parse import ScreenParse
+
+
+def ocr_result(text, box):
+    x1, y1, x2, y2 = box
+    return ([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], text, 0.9)
+
+
+def test_detections_take_the_text_inside_them():
+    parse = ScreenParse(Frame(Image.new("RGB", (400, 300))))
+    parse.add_text([
+        ocr_result("Save", (20, 20, 60, 40)),
+        ocr_result("as", (62, 20, 80, 40)),
+        ocr_result("Title", (200, 200, 260, 220)),
+    ])
+    # a button around the first two words and an icon without text
+    parse.add_objects([(10, 10, 100, 50), (300, 10, 340, 50)])
+
+    button = parse.get("~0")
+    assert button.type == "control"
+    assert button.children == ["t0", "t1"]
+    assert button.text == "Save as"
+    assert parse.get("t0").parent == "~0"
+
+    icon = parse.get("~1")
+    assert icon.type == "icon"
+    assert icon.children == []
+    assert parse.get("t2").parent is None
+
+
+def test_fusion_runs_whichever_stage_comes_last():
+    parse = ScreenParse(Frame(Image.new("RGB", (400, 300))))
+    parse.add_objects([(10, 10, 100, 50)])
+    assert parse.get("~0").type == "icon"
+
+    parse.add_text([ocr_result("OK", (40, 20, 60, 40))])
+    assert parse.get("~0").type == "control"
+    assert parse.get("~0").text == "OK"
+    assert parse.get("t0").parent == "~0"
+
+
+def test_text_goes_to_the_smallest_containing_detection():
+    parse = ScreenParse(Frame(Image.new("RGB", (400, 300))))
+    parse.add_text([ocr_result("Name", (30, 30, 70, 40))])
+    # a panel detected before (and enclosing) a text field
+    parse.add_objects([(0, 0, 300, 200), (20, 20, 120, 50)])
+
+    field = [element for element in parse.elements.values() if element.box == (20, 20, 120, 50)][0]
+    assert parse.get("t0").parent == field.id
+    assert field.type == "control"